@@ -1,19 +1,43 @@
 import { createContext, useContext, useEffect, useState } from "react";
-import { fetchRecipes, fetchRecipeByVideoId } from "../lib/api";
+import { fetchRecipeChanges, fetchRecipeByVideoId } from "../lib/api";
+import { getCachedCatalog, saveCachedCatalog } from "../lib/storage";
 
 const RecipesContext = createContext(null);
 
+// Apply one page of the change feed to a list of recipes, newest first
+function applyChanges(recipes, { recipes: changed, deleted }) {
+  const gone = new Set([...deleted, ...changed.map((r) => r.id)]);
+  return [...changed, ...recipes.filter((r) => !gone.has(r.id))].sort(
+    (a, b) => b.id - a.id
+  );
+}
+
 export function RecipesProvider({ children }) {
-  const [recipes, setRecipes] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const [recipes, setRecipes] = useState(() => getCachedCatalog().recipes);
+  // Cached recipes are shown right away; only an empty cache waits on the sync
+  const [loading, setLoading] = useState(recipes.length === 0);
   const [error, setError] = useState(null);
 
+  // Start from the cached catalog and fetch only what changed since it was
+  // saved; a first visit (since = 0) pages through the whole catalog once.
   const loadRecipes = async () => {
-    setLoading(true);
+    setLoading(recipes.length === 0);
     setError(null);
     try {
-      const data = await fetchRecipes();
-      setRecipes(data);
+      let { since, recipes: current } = getCachedCatalog();
+      for (;;) {
+        const page = await fetchRecipeChanges(since);
+        if (page.reset) {
+          since = 0;
+          current = [];
+          continue;
+        }
+        current = applyChanges(current, page);
+        since = page.next_since;
+        if (!page.has_more) break;
+      }
+      saveCachedCatalog(since, current);
+      setRecipes(current);
     } catch (err) {
       console.error(err);
       setError("Failed to load recipes from server");
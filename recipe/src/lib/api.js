@@ -9,6 +9,16 @@ export async function fetchRecipes() {
   return res.json();
 }
 
+// One page of the change feed: recipes changed and ids deleted since `since`
+// (see /recipes/changes). Pass back next_since while has_more is set.
+export async function fetchRecipeChanges(since = 0) {
+  const res = await fetch(`${API_BASE_URL}/recipes/changes?since=${since}`);
+  if (!res.ok) {
+    throw new Error(`Failed to fetch recipe changes: ${res.statusText}`);
+  }
+  return res.json();
+}
+
 export async function fetchRecipeByVideoId(videoId) {
   const res = await fetch(`${API_BASE_URL}/recipes/video/${videoId}`);
   if (!res.ok) {
@@ -35,6 +45,57 @@ export async function generateRecipeFromVideo(videoId, language = "en") {
   return res.json();
 }
 
+// Streams generation progress as NDJSON events (see /scrape_video_id/stream).
+// onEvent is called with each event as soon as it arrives; resolves with the
+// final stored recipe.
+export async function streamRecipeFromVideo(videoId, language = "en", onEvent = () => {}) {
+  const res = await fetch(`${API_BASE_URL}/scrape_video_id/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ id: videoId, language }),
+  });
+
+  if (!res.ok) {
+    const errorBody = await res.json().catch(() => null);
+    const detail = errorBody?.detail || res.statusText;
+    throw new Error(`Failed to generate recipe: ${detail}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  let recipe = null;
+
+  const handleLine = (line) => {
+    if (!line.trim()) return;
+    const event = JSON.parse(line);
+    if (event.event === "error") {
+      throw new Error(`Failed to generate recipe: ${event.detail}`);
+    }
+    if (event.event === "recipe") {
+      recipe = event.value;
+    }
+    onEvent(event);
+  };
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split("\n");
+    buffered = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffered + decoder.decode());
+
+  if (!recipe) {
+    throw new Error("Failed to generate recipe: stream ended early");
+  }
+  return recipe;
+}
+
 export { API_BASE_URL };
 
 
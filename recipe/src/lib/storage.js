@@ -1,4 +1,5 @@
 const STORAGE_KEY = "saved_recipes";
+const CATALOG_KEY = "recipe_catalog";
 
 // Get all saved recipes from localStorage
 export function getSavedRecipes() {
@@ -52,3 +53,23 @@ export function getRecipeById(videoId, allRecipes = []) {
   return allRecipes.find((r) => r.video_id === videoId) || null;
 }
 
+// Get the locally cached recipe catalog and the change seq it is current to
+export function getCachedCatalog() {
+  try {
+    const cached = localStorage.getItem(CATALOG_KEY);
+    return cached ? JSON.parse(cached) : { since: 0, recipes: [] };
+  } catch (error) {
+    console.error("Error reading cached recipes:", error);
+    return { since: 0, recipes: [] };
+  }
+}
+
+// Cache the recipe catalog; a full localStorage just means a bigger next sync
+export function saveCachedCatalog(since, recipes) {
+  try {
+    localStorage.setItem(CATALOG_KEY, JSON.stringify({ since, recipes }));
+  } catch (error) {
+    console.error("Error caching recipes:", error);
+    localStorage.removeItem(CATALOG_KEY);
+  }
+}
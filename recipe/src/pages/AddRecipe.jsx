@@ -3,7 +3,7 @@ import { useNavigate } from "react-router-dom";
 import Container from "../components/ui/Container";
 import Button from "../components/ui/Button";
 import Header from "../components/layout/Header";
-import { generateRecipeFromVideo } from "../lib/api";
+import { streamRecipeFromVideo } from "../lib/api";
 import { useRecipes } from "../context/RecipesContext";
 
 export default function AddRecipe() {
@@ -12,6 +12,24 @@ export default function AddRecipe() {
   const [videoId, setVideoId] = useState("");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Parts of the recipe received so far while it is being generated
+  const [preview, setPreview] = useState(null);
+
+  const applyEvent = (event) => {
+    setPreview((current) => {
+      const next = current || { title: "", ingredients: [], steps: [] };
+      if (event.event === "field") {
+        return { ...next, [event.name]: event.value };
+      }
+      if (event.event === "ingredient") {
+        return { ...next, ingredients: [...next.ingredients, event.value] };
+      }
+      if (event.event === "step") {
+        return { ...next, steps: [...next.steps, event.value] };
+      }
+      return next;
+    });
+  };
 
   const handleSubmit = (e) => {
     e.preventDefault();
@@ -20,8 +38,9 @@ export default function AddRecipe() {
     const run = async () => {
       setLoading(true);
       setError(null);
+      setPreview(null);
       try {
-        await generateRecipeFromVideo(videoId, "en");
+        await streamRecipeFromVideo(videoId, "en", applyEvent);
         // Reload recipes so the new one appears on Home
         await reload();
         // After generation, navigate to the detail page for this video
@@ -68,6 +87,30 @@ export default function AddRecipe() {
                 />
               </div>
 
+              {preview && (
+                <div className="mb-6 rounded-lg border border-gray-200 bg-gray-50 p-4 text-sm">
+                  {preview.title && (
+                    <h3 className="text-lg font-semibold text-gray-900 mb-3">{preview.title}</h3>
+                  )}
+                  {preview.ingredients.length > 0 && (
+                    <ul className="mb-3 list-disc pl-5 text-gray-700">
+                      {preview.ingredients.map((ingredient, i) => (
+                        <li key={i}>
+                          {ingredient.quantity} {ingredient.name}
+                        </li>
+                      ))}
+                    </ul>
+                  )}
+                  {preview.steps.length > 0 && (
+                    <ol className="list-decimal pl-5 text-gray-700 space-y-1">
+                      {preview.steps.map((step) => (
+                        <li key={step.step_number}>{step.description}</li>
+                      ))}
+                    </ol>
+                  )}
+                </div>
+              )}
+
               {error && (
                 <p className="text-sm text-red-500 mb-4">
                   {error}
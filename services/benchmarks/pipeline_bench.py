@@ -0,0 +1,395 @@
+"""
+Offline benchmark for the scrape -> transcript -> generate -> store pipeline.
+
+YouTube, the transcript endpoint and OpenAI are replaced by replay clients
+that serve recorded fixtures with configurable injected latency, so the run
+is deterministic and costs no quota. The real YouTubeScraper,
+RecipeGenerator and SQLite storage code run unchanged.
+
+Usage:
+    python -m benchmarks.pipeline_bench --source search --latency transcript=120
+    python -m benchmarks.pipeline_bench --save baseline.json
+    python -m benchmarks.pipeline_bench --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import functools
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from youtube_parser import main
+from youtube_parser.recipe_gen import RecipeGenerator
+from youtube_parser.type import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_parser.yt_scrape import YouTubeScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+YOUTUBE_FIXTURE = Path(main.__file__).parent / "youtube_results_20250510_180120.json"
+LLM_FIXTURE = FIXTURES_DIR / "llm_responses.json"
+
+STAGES = ("search", "transcript", "generate", "store", "video")
+
+
+class Latency:
+    """Injected latency per upstream, in seconds, with optional jitter."""
+
+    def __init__(self, delays: Optional[Dict[str, float]] = None, jitter: float = 0.0, seed: int = 0):
+        self.delays = delays or {}
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def wait(self, upstream: str) -> None:
+        delay = self.delays.get(upstream, 0.0)
+        if delay <= 0:
+            return
+        if self.jitter:
+            delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(delay)
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload: Dict[str, Any]):
+        self._payload = payload
+        self.status_code = 200
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+
+class ReplayYouTubeSession:
+    """
+    Serves YouTube Data API calls from the recorded search/channel fixture.
+
+    Search queries return the recorded search results; channel handles from
+    the fixture resolve to synthetic channel IDs whose uploads are the
+    recorded channel results.
+    """
+
+    def __init__(self, fixture: Dict[str, Any], latency: Latency):
+        self.latency = latency
+        self.search_results: List[Dict[str, Any]] = fixture.get("search_results", [])
+        self.channels: Dict[str, List[Dict[str, Any]]] = {
+            f"UC{handle.lstrip('@')}": videos
+            for handle, videos in fixture.get("channel_results", {}).items()
+        }
+        self.videos: Dict[str, Dict[str, Any]] = {
+            video["video_id"]: video for video in self.all_videos()
+        }
+
+    def all_videos(self) -> List[Dict[str, Any]]:
+        videos = list(self.search_results)
+        for channel_videos in self.channels.values():
+            videos.extend(channel_videos)
+        return videos
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> ReplayResponse:
+        params = params or {}
+        self.latency.wait("youtube")
+        limit = int(params.get("maxResults", 50))
+
+        if url.endswith("/channels"):
+            channel_id = f"UC{params.get('forHandle', '')}"
+            for known in self.channels:
+                if known.lower() == channel_id.lower():
+                    return ReplayResponse({"items": [{"id": known}]})
+            return ReplayResponse({"items": []})
+
+        if url.endswith("/videos"):
+            ids = str(params.get("id", "")).split(",")
+            return ReplayResponse({
+                "items": [
+                    {"id": vid, "snippet": {"title": self.videos[vid]["title"]}}
+                    for vid in ids if vid in self.videos
+                ]
+            })
+
+        if "channelId" in params:
+            videos = self.channels.get(params["channelId"], [])
+        else:
+            videos = self.search_results
+        return ReplayResponse({
+            "items": [
+                {"id": {"videoId": v["video_id"]}, "snippet": {"title": v["title"]}}
+                for v in videos[:limit]
+            ]
+        })
+
+
+class ReplayTrack:
+    """
+    A single recorded transcript track, as listed by ReplayTranscriptApi.list.
+
+    Like most YouTube tracks it is translatable into English and Korean;
+    "translating" replays the recorded text unchanged.
+    """
+
+    is_translatable = True
+    translation_languages = [SimpleNamespace(language_code="en"), SimpleNamespace(language_code="ko")]
+
+    def __init__(self, api: "ReplayTranscriptApi", video_id: str, video: Dict[str, Any]):
+        self.api = api
+        self.video_id = video_id
+        self.language_code = video.get("language_code", "en")
+        self.is_generated = str(video.get("is_generated")).lower() == "true"
+
+    def translate(self, language_code: str) -> "ReplayTrack":
+        return self
+
+    def fetch(self) -> FetchedTranscript:
+        return self.api.fetch(self.video_id, languages=[self.language_code])
+
+
+class ReplayTranscriptApi:
+    """Serves transcripts from the recorded fixture, split back into snippets."""
+
+    def __init__(self, videos: Dict[str, Dict[str, Any]], latency: Latency):
+        self.videos = videos
+        self.latency = latency
+
+    def list(self, video_id: str) -> List[ReplayTrack]:
+        """List the recorded track; listing costs a transcript round trip too."""
+        self.latency.wait("transcript")
+        video = self.videos.get(video_id)
+        if video is None or not video.get("snippets"):
+            return []
+        return [ReplayTrack(self, video_id, video)]
+
+    def fetch(self, video_id: str, languages: Any = ("en",)) -> FetchedTranscript:
+        self.latency.wait("transcript")
+        video = self.videos.get(video_id)
+        if video is None or not video.get("snippets"):
+            raise RuntimeError(f"No recorded transcript for video {video_id}")
+        texts = [t for t in video["snippets"].split(". ") if t.strip()]
+        return FetchedTranscript(
+            snippets=[
+                FetchedTranscriptSnippet(text=text, start=float(i), duration=1.0)
+                for i, text in enumerate(texts)
+            ],
+            video_id=video_id,
+            language_code=video.get("language_code", "en"),
+            is_generated=str(video.get("is_generated")).lower() == "true",
+        )
+
+
+class ReplayOpenAI:
+    """Serves recorded chat completions, chosen deterministically per video."""
+
+    def __init__(self, fixture: Dict[str, Any], latency: Latency):
+        self.responses = fixture["responses"]
+        self.model = fixture.get("model", "gpt-5-nano")
+        self.latency = latency
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], **kwargs: Any) -> SimpleNamespace:
+        self.latency.wait("openai")
+        prompt = messages[-1]["content"]
+        recorded = self.responses[zlib.crc32(prompt.encode("utf-8")) % len(self.responses)]
+        return SimpleNamespace(
+            model=self.model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(recorded["content"])))],
+            usage=SimpleNamespace(**recorded.get("usage", {})),
+        )
+
+
+class StageTimer:
+    """Collects wall-clock samples per pipeline stage."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    def wrap(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.samples[stage].append(time.perf_counter() - started)
+        return timed
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def run_benchmark(
+    source: str = "search",
+    arg: Optional[str] = None,
+    max_results: int = 50,
+    latency: Optional[Latency] = None,
+    db_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the pipeline end to end against the replay fixtures.
+
+    Args:
+        source: "search" (recorded query results) or "channel" (recorded channel)
+        arg: Query string, or channel handle when source is "channel"
+        max_results: Number of videos requested from the listing call
+        latency: Injected upstream latency
+        db_path: SQLite file to store into (a temporary file when omitted)
+
+    Returns:
+        Report with counts, throughput and per-stage latency percentiles
+    """
+    # Warm the lazily imported openai package so its one-off import cost is
+    # not charged to the first generate sample
+    import openai  # type: ignore # noqa: F401
+
+    latency = latency or Latency()
+    youtube_fixture = json.loads(YOUTUBE_FIXTURE.read_text())
+    llm_fixture = json.loads(LLM_FIXTURE.read_text())
+
+    session = ReplayYouTubeSession(youtube_fixture, latency)
+    scraper = YouTubeScraper(
+        "bench-key",
+        max_results=max_results,
+        session=session,  # type: ignore[arg-type]
+        transcript_api=ReplayTranscriptApi(session.videos, latency),  # type: ignore[arg-type]
+    )
+    generator = RecipeGenerator("bench-key", client=ReplayOpenAI(llm_fixture, latency))
+
+    timer = StageTimer()
+    # Listing is paged lazily, so time the YouTube Data API requests themselves
+    scraper._get = timer.wrap("search", scraper._get)  # type: ignore[method-assign]
+    scraper.get_transcript = timer.wrap("transcript", scraper.get_transcript)  # type: ignore[method-assign]
+    generate = timer.wrap("generate", generator.generate_recipe)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous_conn = main.sqlite_conn
+        main.sqlite_conn = main._init_sqlite(db_path or str(Path(tmp_dir) / "bench.db"))
+        store = timer.wrap("store", main._store_recipe_sqlite)
+        recipes = failures = listed = 0
+        started = time.perf_counter()
+        try:
+            if source == "channel":
+                handle = arg or next(iter(youtube_fixture["channel_results"]))
+                videos = scraper.iter_videos(type="channel_id", arg=scraper.get_channel_id_by_handle(handle))
+            elif source == "search":
+                videos = scraper.iter_videos(type="query", arg=arg or "easy recipes")
+            else:
+                raise ValueError(f"Invalid source: {source}")
+
+            for video in videos:
+                listed += 1
+                video_started = time.perf_counter()
+                if video.get("error"):
+                    failures += 1
+                    continue
+                try:
+                    recipe = generate(str(video))
+                    store("benchmark", recipe.model_dump())
+                    recipes += 1
+                except Exception:
+                    failures += 1
+                timer.samples["video"].append(time.perf_counter() - video_started)
+            wall = time.perf_counter() - started
+        finally:
+            main.sqlite_conn.close()
+            main.sqlite_conn = previous_conn
+
+    return {
+        "source": source,
+        "videos": listed,
+        "recipes": recipes,
+        "failures": failures,
+        "wall_seconds": round(wall, 4),
+        "throughput_videos_per_s": round(listed / wall, 3) if wall > 0 else 0.0,
+        "latency": latency.delays,
+        "stages": {stage: summarize(timer.samples[stage]) for stage in STAGES},
+    }
+
+
+def check_regression(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """
+    Compare a report against a saved baseline.
+
+    Returns a list of human-readable regressions; empty when within tolerance.
+    """
+    problems = []
+    for stage, stats in baseline.get("stages", {}).items():
+        current = report["stages"].get(stage)
+        if not current or not stats.get("count"):
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            limit = stats[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - stats[key] > 1.0:
+                problems.append(f"{stage} {key} {current[key]:.1f} > {limit:.1f} (baseline {stats[key]:.1f})")
+    base_throughput = baseline.get("throughput_videos_per_s", 0.0)
+    if base_throughput and report["throughput_videos_per_s"] < base_throughput * (1 - tolerance):
+        problems.append(
+            f"throughput {report['throughput_videos_per_s']:.2f}/s < "
+            f"{base_throughput * (1 - tolerance):.2f}/s (baseline {base_throughput:.2f}/s)"
+        )
+    return problems
+
+
+def _parse_latency(values: List[str]) -> Dict[str, float]:
+    delays = {}
+    for value in values:
+        upstream, _, ms = value.partition("=")
+        if upstream not in ("youtube", "transcript", "openai") or not ms:
+            raise argparse.ArgumentTypeError(f"Invalid latency '{value}', expected youtube|transcript|openai=<ms>")
+        delays[upstream] = float(ms) / 1000.0
+    return delays
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay-based pipeline benchmark")
+    parser.add_argument("--source", choices=("search", "channel"), default="search")
+    parser.add_argument("--arg", help="Query string or channel handle (e.g. @1mincook)")
+    parser.add_argument("--max-results", type=int, default=50)
+    parser.add_argument("--latency", action="append", default=[], help="Injected latency, e.g. openai=800")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative latency jitter, e.g. 0.2")
+    parser.add_argument("--save", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Fail when the run regresses against this report")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    latency = Latency(_parse_latency(args.latency), jitter=args.jitter)
+    report = run_benchmark(args.source, args.arg, args.max_results, latency)
+
+    print(f"{report['videos']} videos, {report['recipes']} recipes, {report['failures']} failures "
+          f"in {report['wall_seconds']:.2f}s ({report['throughput_videos_per_s']:.2f} videos/s)")
+    print(f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<12}{stats['count']:>7}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        problems = check_regression(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,3 @@
+"""
+Load-testing tools: fake upstream servers and a concurrent load driver.
+"""
@@ -0,0 +1,187 @@
+"""
+Open-loop load driver for the ChefPanda service.
+
+Requests are started at a fixed target rate regardless of how fast earlier
+ones finish, so queueing inside the service shows up as latency instead of
+being hidden by the driver slowing down.
+
+Usage:
+    python -m loadtest.driver --base-url http://127.0.0.1:8000 --rps 20 --duration 60
+    python -m loadtest.driver --mix scrape_video_id=1,recipes=5,recipe_by_video=4 --json report.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx  # type: ignore
+
+from benchmarks.pipeline_bench import percentile
+from .fake_servers import load_catalog
+
+ENDPOINTS = ("scrape_video_id", "recipes", "recipe_by_video")
+
+
+class EndpointStats:
+    """Latency samples and outcomes for one endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.status_counts: Dict[str, int] = {}
+        self.errors = 0
+
+    def record(self, status: str, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+        }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse `endpoint=weight,...` into weights, rejecting unknown endpoints."""
+    weights: Dict[str, float] = {}
+    for pair in value.split(","):
+        name, _, weight = pair.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def _issue(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    video_ids: List[str],
+    stats: Dict[str, EndpointStats],
+    rng: random.Random,
+) -> None:
+    video_id = rng.choice(video_ids)
+    started = time.perf_counter()
+    try:
+        if endpoint == "scrape_video_id":
+            response = await client.post("/scrape_video_id", json={"id": video_id, "language": "en"})
+        elif endpoint == "recipes":
+            response = await client.get("/recipes")
+        else:
+            response = await client.get(f"/recipes/video/{video_id}")
+        status = str(response.status_code)
+        # A missing recipe is an expected answer, not a failure of the service
+        ok = response.status_code < 400 or (endpoint == "recipe_by_video" and response.status_code == 404)
+    except httpx.HTTPError as e:
+        status, ok = type(e).__name__, False
+    stats[endpoint].record(status, time.perf_counter() - started, ok)
+
+
+async def run_load(
+    base_url: str,
+    rps: float,
+    duration: float,
+    mix: Dict[str, float],
+    video_ids: List[str],
+    max_in_flight: int = 256,
+    timeout: float = 120.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Drive traffic at `rps` for `duration` seconds and return the report.
+
+    Requests beyond `max_in_flight` concurrent ones are counted as dropped
+    rather than queued, so the driver never becomes the bottleneck silently.
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats = {name: EndpointStats() for name in names}
+    slots = asyncio.Semaphore(max_in_flight)
+    tasks: List[asyncio.Task] = []
+    dropped = 0
+
+    async def guarded(endpoint: str) -> None:
+        try:
+            await _issue(client, endpoint, video_ids, stats, rng)
+        finally:
+            slots.release()
+
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        interval = 1.0 / rps
+        sent = 0
+        while True:
+            next_at = started + sent * interval
+            if next_at - started >= duration:
+                break
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            sent += 1
+            if slots.locked():
+                dropped += 1
+                continue
+            await slots.acquire()
+            tasks.append(asyncio.create_task(guarded(rng.choices(names, weights)[0])))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    completed = sum(len(s.latencies) for s in stats.values())
+    errors = sum(s.errors for s in stats.values())
+    return {
+        "target_rps": rps,
+        "achieved_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "duration_seconds": round(elapsed, 2),
+        "requests": completed,
+        "dropped": dropped,
+        "error_rate": round(errors / completed, 4) if completed else 0.0,
+        "endpoints": {name: s.summary() for name, s in stats.items()},
+    }
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load driver for the ChefPanda service")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", default="scrape_video_id=1,recipes=5,recipe_by_video=4")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    video_ids = [video["video_id"] for video in load_catalog()["search"]]
+    report = asyncio.run(run_load(
+        args.base_url, args.rps, args.duration, parse_mix(args.mix), video_ids,
+        max_in_flight=args.max_in_flight, timeout=args.timeout,
+    ))
+
+    print(f"{report['requests']} requests in {report['duration_seconds']}s "
+          f"({report['achieved_rps']}/s of {report['target_rps']}/s target, {report['dropped']} dropped), "
+          f"error rate {report['error_rate']:.2%}")
+    print(f"{'endpoint':<18}{'count':>7}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    for name, summary in report["endpoints"].items():
+        print(f"{name:<18}{summary['count']:>7}{summary['error_rate'] * 100:>8.2f}"
+              f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}  "
+              f"{summary['status_counts']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,451 @@
+"""
+Local stand-ins for the YouTube Data API, the YouTube transcript endpoints
+and the OpenAI chat completions API.
+
+Each server replays the recorded fixtures and can inject latency, server
+errors and 429 responses (random or from a requests-per-second quota), so the
+real service can be load-tested without spending API quota.
+
+Usage:
+    python -m loadtest.fake_servers --latency-ms 50 --openai-latency-ms 800 --throttle-rate 0.02
+    python -m loadtest.fake_servers --app --app-port 8000
+
+The command prints the environment needed to point the service at the fakes
+(UPSTREAM_OVERRIDES and OPENAI_BASE_URL); with --app it also starts the
+service under uvicorn with that environment and a scratch SQLite database.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+SERVICES_DIR = Path(__file__).resolve().parent.parent
+YOUTUBE_FIXTURE = SERVICES_DIR / "youtube_parser" / "youtube_results_20250510_180120.json"
+LLM_FIXTURE = SERVICES_DIR / "benchmarks" / "fixtures" / "llm_responses.json"
+
+INNERTUBE_API_KEY = "fake-innertube-key"
+
+# (status, headers, body)
+Reply = Tuple[int, Dict[str, str], bytes]
+Route = Callable[[str, str, Dict[str, List[str]], bytes], Reply]
+
+
+def _json_reply(payload: Any, status: int = 200) -> Reply:
+    return status, {"Content-Type": "application/json"}, json.dumps(payload).encode("utf-8")
+
+
+class FaultProfile:
+    """
+    Latency and failure behaviour for one fake server.
+
+    Args:
+        latency_ms: Mean added latency per request
+        jitter: Relative latency jitter (0.2 = +/-20%)
+        error_rate: Probability of answering 500
+        throttle_rate: Probability of answering 429
+        rate_limit_rps: Token-bucket quota; requests above it get 429
+        retry_after: Retry-After seconds sent with 429 responses
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit_rps: Optional[float] = None,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit_rps = rate_limit_rps
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit_rps or 0.0
+        self._refilled = time.monotonic()
+
+    def _take_token(self) -> bool:
+        if not self.rate_limit_rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit_rps, self._tokens + (now - self._refilled) * self.rate_limit_rps)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def apply(self) -> Optional[Reply]:
+        """Sleep for the injected latency; return a fault reply or None."""
+        with self._lock:
+            delay = self.latency_ms / 1000.0
+            if self.jitter:
+                delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+            roll = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+
+        if not self._take_token() or roll < self.throttle_rate:
+            status, headers, body = _json_reply(
+                {"error": {"code": 429, "message": "Rate limit exceeded (fake)"}}, 429
+            )
+            headers["Retry-After"] = f"{self.retry_after:g}"
+            return status, headers, body
+        if roll < self.throttle_rate + self.error_rate:
+            return _json_reply({"error": {"code": 500, "message": "Internal error (fake)"}}, 500)
+        return None
+
+
+class FakeServer:
+    """A threaded HTTP server dispatching every request to one route function."""
+
+    def __init__(self, route: Route, faults: Optional[FaultProfile] = None, host: str = "127.0.0.1", port: int = 0):
+        self.route = route
+        self.faults = faults or FaultProfile()
+        self.status_counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                reply = server.faults.apply()
+                if reply is None:
+                    try:
+                        reply = server.route(self.command, parsed.path, parse_qs(parsed.query), body)
+                    except Exception as e:
+                        reply = _json_reply({"error": {"code": 500, "message": str(e)}}, 500)
+                status, headers, payload = reply
+                with server._lock:
+                    server.status_counts[status] = server.status_counts.get(status, 0) + 1
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def load_catalog(path: Path = YOUTUBE_FIXTURE) -> Dict[str, Any]:
+    """
+    Load the recorded videos as {"search": [...], "channels": {channel_id: [...]}, "videos": {id: video}}.
+    """
+    fixture = json.loads(path.read_text())
+    channels = {
+        f"UC{handle.lstrip('@')}": videos
+        for handle, videos in fixture.get("channel_results", {}).items()
+    }
+    videos = {v["video_id"]: v for v in fixture.get("search_results", [])}
+    for channel_videos in channels.values():
+        videos.update({v["video_id"]: v for v in channel_videos})
+    return {"search": fixture.get("search_results", []), "channels": channels, "videos": videos}
+
+
+def _days_ago(days: int) -> str:
+    """A fixed, catalog-independent publish time `days` days before 2025-03-01."""
+    return (datetime(2025, 3, 1) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def youtube_data_api(catalog: Dict[str, Any]) -> Route:
+    """Routes for /youtube/v3/search, /videos, /channels and /playlistItems."""
+
+    def route(method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Reply:
+        params = {key: values[0] for key, values in query.items()}
+        limit = min(int(params.get("maxResults", 5)), 50)
+
+        if path.endswith("/channels"):
+            wanted = f"UC{params.get('forHandle', '')}".lower()
+            items = [{"id": cid} for cid in catalog["channels"] if cid.lower() == wanted]
+            return _json_reply({"items": items})
+
+        if path.endswith("/videos"):
+            items = [
+                {"id": vid, "snippet": {"title": catalog["videos"][vid]["title"]}}
+                for vid in params.get("id", "").split(",") if vid in catalog["videos"]
+            ]
+            return _json_reply({"items": items})
+
+        if path.endswith("/playlistItems"):
+            # Uploads playlist: newest first, one day apart unless the catalog says otherwise
+            channel_id = "UC" + params.get("playlistId", "")[2:]
+            items = [
+                {
+                    "snippet": {"title": v["title"]},
+                    "contentDetails": {
+                        "videoId": v["video_id"],
+                        "videoPublishedAt": v.get("published_at", _days_ago(i)),
+                    },
+                }
+                for i, v in enumerate(catalog["channels"].get(channel_id, [])[:limit])
+            ]
+            return _json_reply({"items": items})
+
+        if path.endswith("/search"):
+            if "channelId" in params:
+                videos = catalog["channels"].get(params["channelId"], [])
+            else:
+                videos = catalog["search"]
+            items = [
+                {"id": {"videoId": v["video_id"]}, "snippet": {"title": v["title"]}}
+                for v in videos[:limit]
+            ]
+            return _json_reply({"items": items})
+
+        return _json_reply({"error": {"code": 404, "message": f"Unknown path {path}"}}, 404)
+
+    return route
+
+
+def youtube_transcripts(catalog: Dict[str, Any], public_url: Callable[[], str]) -> Route:
+    """
+    Routes emulating the watch page, the innertube player API and timedtext,
+    i.e. everything youtube_transcript_api requests from www.youtube.com.
+    """
+
+    def route(method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Reply:
+        if path == "/watch":
+            html = f'<html><script>ytcfg.set({{"INNERTUBE_API_KEY": "{INNERTUBE_API_KEY}"}});</script></html>'
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, html.encode("utf-8")
+
+        if path == "/youtubei/v1/player":
+            video_id = json.loads(body or b"{}").get("videoId", "")
+            video = catalog["videos"].get(video_id)
+            if video is None:
+                return _json_reply({"playabilityStatus": {"status": "ERROR", "reason": "This video is unavailable"}})
+            if not video.get("snippets"):
+                return _json_reply({"playabilityStatus": {"status": "OK"}})
+            language = video.get("language_code", "en")
+            track = {
+                "baseUrl": f"{public_url()}/api/timedtext?v={video_id}&lang={language}",
+                "name": {"runs": [{"text": language}]},
+                "languageCode": language,
+                "isTranslatable": True,
+            }
+            if str(video.get("is_generated")).lower() == "true":
+                track["kind"] = "asr"
+            return _json_reply({
+                "playabilityStatus": {"status": "OK"},
+                "captions": {"playerCaptionsTracklistRenderer": {
+                    "captionTracks": [track],
+                    "translationLanguages": [
+                        {"languageCode": code, "languageName": {"runs": [{"text": code}]}}
+                        for code in ("en", "ko") if code != language
+                    ],
+                }},
+            })
+
+        if path == "/api/timedtext":
+            video = catalog["videos"].get(query.get("v", [""])[0])
+            if video is None:
+                return 404, {}, b""
+            lines = [line for line in video["snippets"].split(". ") if line.strip()]
+            xml = "".join(
+                f'<text start="{i * 2.0}" dur="2.0">{escape(line)}</text>' for i, line in enumerate(lines)
+            )
+            payload = f'<?xml version="1.0" encoding="utf-8" ?><transcript>{xml}</transcript>'
+            return 200, {"Content-Type": "text/xml; charset=utf-8"}, payload.encode("utf-8")
+
+        return 404, {}, b""
+
+    return route
+
+
+def openai_chat(responses: List[Dict[str, Any]], model: str = "gpt-5-nano") -> Route:
+    """
+    Route for POST /v1/chat/completions, replaying recorded recipe completions.
+
+    With "stream": true the completion is sent as server-sent events in
+    small chunks (written in one response body, so no real pacing).
+    """
+    counter = {"n": 0}
+    lock = threading.Lock()
+
+    def route(method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Reply:
+        if not path.endswith("/chat/completions"):
+            return _json_reply({"error": {"message": f"Unknown path {path}"}}, 404)
+        with lock:
+            recorded = responses[counter["n"] % len(responses)]
+            counter["n"] += 1
+        request = json.loads(body or b"{}")
+        if request.get("stream"):
+            return _sse_completion(f"chatcmpl-fake-{counter['n']}", request.get("model", model), recorded)
+        return _json_reply({
+            "id": f"chatcmpl-fake-{counter['n']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": json.loads(body or b"{}").get("model", model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(recorded["content"])},
+                "finish_reason": "stop",
+            }],
+            "usage": recorded.get("usage", {}),
+        })
+
+    return route
+
+
+def _sse_completion(completion_id: str, model: str, recorded: Dict[str, Any], chunk_chars: int = 16) -> Reply:
+    content = json.dumps(recorded["content"])
+    base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+    chunks = [
+        {**base, "choices": [{"index": 0, "delta": {"content": content[i:i + chunk_chars]}, "finish_reason": None}]}
+        for i in range(0, len(content), chunk_chars)
+    ]
+    chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    chunks.append({**base, "choices": [], "usage": recorded.get("usage", {})})
+    events = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+    return 200, {"Content-Type": "text/event-stream"}, events.encode("utf-8")
+
+
+class FakeStack:
+    """The three fake upstreams, started together."""
+
+    def __init__(
+        self,
+        youtube_faults: Optional[FaultProfile] = None,
+        transcript_faults: Optional[FaultProfile] = None,
+        openai_faults: Optional[FaultProfile] = None,
+    ):
+        catalog = load_catalog()
+        llm_fixture = json.loads(LLM_FIXTURE.read_text())
+        self.catalog = catalog
+        self.youtube = FakeServer(youtube_data_api(catalog), youtube_faults)
+        self.transcripts = FakeServer(youtube_transcripts(catalog, lambda: self.transcripts.url), transcript_faults)
+        self.openai = FakeServer(openai_chat(llm_fixture["responses"], llm_fixture.get("model", "gpt-5-nano")), openai_faults)
+
+    def start(self) -> "FakeStack":
+        for server in (self.youtube, self.transcripts, self.openai):
+            server.start()
+        return self
+
+    def stop(self) -> None:
+        for server in (self.youtube, self.transcripts, self.openai):
+            server.stop()
+
+    def env(self) -> Dict[str, str]:
+        """Environment that points the service at this stack."""
+        return {
+            "UPSTREAM_OVERRIDES": (
+                f"https://www.googleapis.com={self.youtube.url},"
+                f"https://www.youtube.com={self.transcripts.url}"
+            ),
+            "OPENAI_BASE_URL": f"{self.openai.url}/v1",
+        }
+
+
+def _faults(args: argparse.Namespace, prefix: str) -> FaultProfile:
+    latency = getattr(args, f"{prefix}_latency_ms")
+    return FaultProfile(
+        latency_ms=args.latency_ms if latency is None else latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit_rps=getattr(args, f"{prefix}_rps_limit"),
+        retry_after=args.retry_after,
+    )
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fake YouTube/OpenAI upstreams for load tests")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Default added latency for every fake")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 reply")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of a 429 reply")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    for prefix in ("youtube", "transcript", "openai"):
+        parser.add_argument(f"--{prefix}-latency-ms", type=float, default=None)
+        parser.add_argument(f"--{prefix}-rps-limit", type=float, default=None, help="429 above this request rate")
+    parser.add_argument("--app", action="store_true", help="Also run the service under uvicorn")
+    parser.add_argument("--app-port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    stack = FakeStack(_faults(args, "youtube"), _faults(args, "transcript"), _faults(args, "openai")).start()
+    env = stack.env()
+    print(f"YouTube Data API fake: {stack.youtube.url}")
+    print(f"Transcript fake:       {stack.transcripts.url}")
+    print(f"OpenAI fake:           {stack.openai.url}")
+    for key, value in env.items():
+        print(f"export {key}='{value}'")
+
+    app_process = None
+    try:
+        if args.app:
+            scratch = tempfile.mkdtemp(prefix="chefpanda-load-")
+            app_env = dict(os.environ, **env)
+            app_env.update({
+                "YOUTUBE_API_KEY": app_env.get("YOUTUBE_API_KEY", "fake-youtube-key-for-load-tests"),
+                "OPENAI_API_KEY": app_env.get("OPENAI_API_KEY", "fake-openai-key-for-load-tests"),
+                "USE_SQLITE": "true",
+                "SQLITE_DB_PATH": os.path.join(scratch, "recipes.db"),
+            })
+            app_process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "youtube_parser.main:app", "--port", str(args.app_port)],
+                cwd=SERVICES_DIR,
+                env=app_env,
+            )
+            app_process.wait()
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if app_process is not None and app_process.poll() is None:
+            app_process.terminate()
+        stack.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
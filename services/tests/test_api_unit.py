@@ -0,0 +1,568 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import httpx # type: ignore
+import openai # type: ignore
+import pytest # type: ignore
+from unittest.mock import Mock
+from fastapi.testclient import TestClient # type: ignore
+from youtube_parser import main
+from youtube_parser.recipe_gen import RecipeGenerator
+from youtube_parser.retry import Deadline, DeadlineExceeded
+from youtube_parser.type import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_parser.yt_scrape import YouTubeScraper
+
+RECIPE_JSON = {
+    "title": "Garlic Pasta",
+    "ingredients": [
+        {"name": "spaghetti", "quantity": "200 g"},
+        {"name": "garlic", "quantity": "4 cloves"},
+        {"name": "olive oil", "quantity": "1/4 cup"},
+    ],
+    "steps": [
+        {"step_number": 1, "description": "Boil the pasta."},
+        {"step_number": 2, "description": "Fry the garlic in oil and toss with the pasta."},
+    ],
+    "servings": "2",
+    "prep_time": "15 minutes",
+    "cook_time": "10 minutes",
+    "nutritional_info": {"calories": 550.0, "protein": 14.0, "carbs": 75.0, "fat": 20.0},
+}
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("YOUTUBE_API_KEY", "fake_youtube_key")
+    monkeypatch.setenv("OPENAI_API_KEY", "fake_openai_key")
+    monkeypatch.setenv("USE_SQLITE", "true")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "recipes.db"))
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def fake_pipeline(client, monkeypatch):
+    """Stub YouTube and OpenAI so endpoints run the real pipeline offline."""
+    def get_transcript(self, video_id, *args, **kwargs):
+        return FetchedTranscript(
+            snippets=[FetchedTranscriptSnippet(text="boil pasta and fry garlic", start=0.0, duration=1.0)],
+            video_id=video_id,
+            language_code="en",
+            is_generated=False,
+        )
+
+    monkeypatch.setattr(YouTubeScraper, "list_videos", lambda self, type, arg: [(arg, f"Title {arg}")])
+    monkeypatch.setattr(YouTubeScraper, "iter_video_pages", lambda self, type, arg: iter([[(arg, f"Title {arg}")]]))
+    monkeypatch.setattr(YouTubeScraper, "fetch_video_details", lambda self, video_ids: {})
+    monkeypatch.setattr(YouTubeScraper, "get_transcript", get_transcript)
+    llm = Mock()
+    response = Mock()
+    response.choices = [Mock(message=Mock(content=json.dumps(RECIPE_JSON)))]
+    response.usage = Mock(prompt_tokens=100, completion_tokens=50, total_tokens=150)
+    llm.chat.completions.create.return_value = response
+    monkeypatch.setattr(main, "recipe_generator", RecipeGenerator("fake_openai_key", client=llm))
+    return llm
+
+def test_status_reports_startup_time(client):
+    response = client.get("/status")
+    assert response.status_code == 200
+    assert response.json()["startup_ms"] is not None
+
+def test_lifespan_creates_shared_clients(client):
+    assert main.db_backend == "sqlite"
+    assert main.http_session is not None
+    assert main.recipe_generator is not None
+    assert main._make_scraper("en").session is main.http_session
+
+def test_list_recipes_empty(client):
+    response = client.get("/recipes")
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_metrics_endpoint(client):
+    client.get("/recipes")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'chefpanda_http_requests_total{method="GET",route="/recipes",status="200"}' in body
+    assert 'chefpanda_stage_duration_seconds_count{stage="db_read"}' in body
+
+def test_scrape_video_id_stores_recipe(client, fake_pipeline):
+    response = client.post("/scrape_video_id", json={"id": "vid1"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Garlic Pasta"
+
+    stored = client.get("/recipes/video/vid1")
+    assert stored.status_code == 200
+    assert [i["name"] for i in stored.json()["ingredients"]] == ["spaghetti", "garlic", "olive oil"]
+
+def test_stored_nutrition_is_computed_and_recomputed(client, fake_pipeline):
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    stored = client.get("/recipes/video/vid1").json()
+    # Computed from the ingredients, not the model's 550 kcal guess
+    assert stored["calories"] == pytest.approx(621.2, abs=1)
+
+    main.sqlite_conn.execute("UPDATE ingredients SET quantity = '400 g' WHERE name = 'spaghetti'")
+    response = client.post("/recipes/nutrition/recompute")
+
+    assert response.json() == {"updated": 1}
+    assert client.get("/recipes/video/vid1").json()["calories"] == pytest.approx(992.2, abs=1)
+
+def test_concurrent_stores_keep_recipes_whole(client):
+    # A None user fails the last insert, after the recipe and its children were written
+    users = ["user", None, "user", "user"] * 4
+    barrier = threading.Barrier(len(users))
+    failures = []
+
+    def store(index, user_id):
+        barrier.wait()
+        try:
+            main._store_recipe_sqlite(user_id, {**RECIPE_JSON, "video_id": f"vid{index}"})
+        except sqlite3.IntegrityError:
+            failures.append(index)
+
+    threads = [threading.Thread(target=store, args=item) for item in enumerate(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    stored = len(users) - len(failures)
+    assert len(failures) == users.count(None)
+    assert main.sqlite_conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0] == stored
+    assert main.sqlite_conn.execute("SELECT COUNT(*) FROM recipe_generations").fetchone()[0] == stored
+    assert main.sqlite_conn.execute(
+        "SELECT COUNT(*) FROM ingredients WHERE recipe_id NOT IN (SELECT id FROM recipes)"
+    ).fetchone()[0] == 0
+    assert main.sqlite_conn.execute(
+        "SELECT COUNT(*) FROM steps GROUP BY recipe_id HAVING COUNT(*) != 2"
+    ).fetchall() == []
+
+def test_recipe_without_nutrition_is_stored(client, fake_pipeline):
+    unknown = {**RECIPE_JSON, "ingredients": [{"name": "mystery spice", "quantity": "a pinch"}]}
+    fake_pipeline.chat.completions.create.return_value.choices[0].message.content = json.dumps(unknown)
+
+    response = client.post("/scrape_video_id", json={"id": "vid1"})
+
+    assert response.status_code == 200
+    assert response.json()["nutritional_info"] is None
+    assert client.get("/recipes/video/vid1").json()["calories"] is None
+
+def test_scale_recipe(client, fake_pipeline):
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    recipe_id = client.get("/recipes/video/vid1").json()["id"]
+
+    response = client.get(f"/recipes/{recipe_id}/scale", params={"servings": 3})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["factor"] == 1.5
+    assert [i["quantity"] for i in body["ingredients"]] == ["300 g", "6 cloves", "3/8 cup"]
+
+def test_scale_recipe_errors(client):
+    assert client.get("/recipes/999/scale", params={"servings": 2}).status_code == 404
+    assert client.get("/recipes/1/scale", params={"servings": 0}).status_code == 422
+
+def test_existing_database_gets_parsed_quantities(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ingredients (id INTEGER PRIMARY KEY AUTOINCREMENT, recipe_id INTEGER, name TEXT, quantity TEXT)")
+    conn.execute("INSERT INTO ingredients (recipe_id, name, quantity) VALUES (1, 'flour', '1 1/2 cups')")
+    conn.commit()
+    conn.close()
+
+    conn = main._init_sqlite(path)
+
+    assert conn.execute("SELECT amount, amount_max, unit, note FROM ingredients").fetchone() == (1.5, None, "cup", None)
+    conn.close()
+
+def test_existing_database_gets_parsed_times(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE recipes (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, video_id TEXT NOT NULL, "
+        "servings TEXT, prep_time TEXT, cook_time TEXT, calories REAL, protein REAL, carbs REAL, fat REAL)"
+    )
+    conn.execute("INSERT INTO recipes (video_id, prep_time, cook_time) VALUES ('v1', '15 minutes', '1 hr')")
+    conn.commit()
+    conn.close()
+
+    conn = main._init_sqlite(path)
+
+    assert conn.execute("SELECT prep_minutes, cook_minutes, total_minutes FROM recipes").fetchone() == (15, 60, 75)
+    conn.close()
+
+def test_list_recipes_range_filters(client):
+    main._store_recipe_sqlite("local-user", {**RECIPE_JSON, "video_id": "quick", "cook_time": "5 minutes"})
+    main._store_recipe_sqlite("local-user", {**RECIPE_JSON, "video_id": "slow", "cook_time": "2 hours"})
+
+    quick = client.get("/recipes", params={"max_total_minutes": 30}).json()
+
+    assert [r["video_id"] for r in quick] == ["quick"]
+    assert quick[0]["total_minutes"] == 20 and quick[0]["ingredients"]
+    assert len(client.get("/recipes").json()) == 2
+    assert client.get("/recipes/summary", params={"min_total_minutes": 60}).json()["total"] == 1
+    assert client.get("/recipes", params={"max_total_minutes": -1}).status_code == 422
+
+    # The filtered listing is answered through the total time index
+    queries = []
+    main.sqlite_conn.set_trace_callback(queries.append)
+    client.get("/recipes", params={"max_total_minutes": 30})
+    main.sqlite_conn.set_trace_callback(None)
+    listing = next(sql for sql in queries if "FROM recipes WHERE" in sql)
+    plan = main.sqlite_conn.execute(f"EXPLAIN QUERY PLAN {listing}").fetchall()
+    assert any("idx_recipes_total_minutes" in row[-1] for row in plan)
+
+def test_near_duplicate_video_reuses_recipe(client, fake_pipeline):
+    client.post("/scrape_video_id", json={"id": "full"})
+
+    response = client.post("/scrape_video_id", json={"id": "short"})
+
+    assert response.status_code == 200
+    assert response.json()["duplicate_of"] == "full"
+    assert response.json()["video_id"] == "short"
+    assert fake_pipeline.chat.completions.create.call_count == 1
+    # No second row; the short resolves to the full video's recipe
+    assert len(client.get("/recipes").json()) == 1
+    assert client.get("/recipes/video/short").json()["video_id"] == "full"
+    # Both requests are logged as generations for the user
+    assert main.sqlite_conn.execute("SELECT COUNT(*) FROM recipe_generations").fetchone()[0] == 2
+
+def test_channel_sync_reuses_near_duplicate_recipe(client, fake_pipeline, monkeypatch):
+    client.post("/scrape_video_id", json={"id": "full"})
+    monkeypatch.setattr(YouTubeScraper, "get_channel_id_by_handle", lambda self, handle: "UCchannel")
+    monkeypatch.setattr(
+        YouTubeScraper, "fetch_uploads",
+        lambda self, channel_id, since=None, known_ids=None: [("short", "Title short", "2025-01-01T00:00:00Z")],
+    )
+    monkeypatch.setattr(YouTubeScraper, "prefilter", lambda self, videos: videos)
+
+    assert main._sync_followed_channel("@channel") == 1
+
+    assert len(client.get("/recipes").json()) == 1
+    assert client.get("/recipes/video/short").json()["video_id"] == "full"
+    assert main.sqlite_conn.execute("SELECT COUNT(*) FROM recipe_generations").fetchone()[0] == 2
+
+def test_failed_store_records_no_link(client, fake_pipeline, monkeypatch):
+    client.post("/scrape_video_id", json={"id": "full"})
+    # With the original gone, the duplicate must be stored as its own recipe
+    main.sqlite_conn.execute("DELETE FROM recipes")
+    main.sqlite_conn.commit()
+    monkeypatch.setattr(main, "_store_recipe_sqlite", Mock(side_effect=sqlite3.OperationalError("disk I/O error")))
+
+    response = client.post("/scrape_video_id", json={"id": "short"})
+
+    assert response.status_code == 500
+    assert main.duplicate_index.canonical("short") is None
+
+def test_dedupe_can_be_disabled(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "full"})
+    client.post("/scrape_video_id", json={"id": "short"})
+
+    assert fake_pipeline.chat.completions.create.call_count == 2
+
+def test_similar_recipes_follow_stored_recipes(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    client.post("/scrape_video_id", json={"id": "vid2"})
+    first = client.get("/recipes/video/vid1").json()["id"]
+
+    similar = client.get(f"/recipes/{first}/similar").json()
+
+    assert [recipe["video_id"] for recipe in similar] == ["vid2"]
+    assert similar[0]["score"] == pytest.approx(1.0)
+    assert client.post("/recipes/similar/rebuild").json() == {"indexed": 2}
+    assert client.get(f"/recipes/{first}/similar").json() == similar
+
+def test_recipe_changes_feed(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    client.post("/scrape_video_id", json={"id": "vid2"})
+
+    first = client.get("/recipes/changes", params={"limit": 1}).json()
+    rest = client.get("/recipes/changes", params={"since": first["next_since"]}).json()
+    assert [r["video_id"] for r in first["recipes"]] == ["vid1"] and first["has_more"]
+    assert [r["video_id"] for r in rest["recipes"]] == ["vid2"] and not rest["has_more"]
+    assert rest["recipes"][0]["steps"] == client.get("/recipes/video/vid2").json()["steps"]
+
+    since = rest["next_since"]
+    assert client.get("/recipes/changes", params={"since": since}).json() == {
+        "recipes": [], "deleted": [], "next_since": since, "has_more": False, "reset": False,
+    }
+
+    vid1, vid2 = first["recipes"][0]["id"], rest["recipes"][0]["id"]
+    main.sqlite_conn.execute("UPDATE recipes SET title = title WHERE id = ?", (vid1,))
+    main.sqlite_conn.execute("UPDATE steps SET description = 'Stir' WHERE recipe_id = ?", (vid1,))
+    main.sqlite_conn.execute("DELETE FROM recipes WHERE id = ?", (vid2,))
+    main.sqlite_conn.commit()
+
+    changes = client.get("/recipes/changes", params={"since": since}).json()
+    assert [r["id"] for r in changes["recipes"]] == [vid1]
+    assert changes["recipes"][0]["steps"][0]["description"] == "Stir"
+    assert changes["deleted"] == [vid2]
+
+    # Children added to a recipe whose own row is unchanged, as a regeneration does
+    main.sqlite_conn.execute("INSERT INTO steps (recipe_id, step_number, description) VALUES (?, 3, 'Serve')", (vid1,))
+    main.sqlite_conn.commit()
+    added = client.get("/recipes/changes", params={"since": changes["next_since"]}).json()
+    assert [step["description"] for step in added["recipes"][0]["steps"]][-1] == "Serve"
+
+    assert client.get("/recipes/changes", params={"since": added["next_since"] + 10}).json()["reset"]
+
+def test_regenerate_only_stale_recipes(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    client.post("/scrape_video_id", json={"id": "vid2"})
+    ids = [client.get(f"/recipes/video/{video_id}").json()["id"] for video_id in ("vid1", "vid2")]
+    assert client.post("/recipes/regenerate", params={"dry_run": True}).json()["stale"] == 0
+
+    monkeypatch.setattr(main.recipe_generator, "model", "gpt-next")
+    main.sqlite_conn.execute("UPDATE recipes SET model = 'gpt-next' WHERE video_id = 'vid2'")
+    main.sqlite_conn.commit()
+    # Transcripts come from the cache filled by the first generation
+    monkeypatch.setattr(YouTubeScraper, "get_transcript", Mock(side_effect=AssertionError("not cached")))
+    calls = fake_pipeline.chat.completions.create.call_count
+
+    result = client.post("/recipes/regenerate", params={"concurrency": 2}).json()
+
+    assert result["model"] == "gpt-next"
+    assert (result["stale"], result["regenerated"], result["failed"]) == (1, 1, 0)
+    assert fake_pipeline.chat.completions.create.call_count == calls + 1
+    assert fake_pipeline.chat.completions.create.call_args.kwargs["model"] == "gpt-next"
+    assert [client.get(f"/recipes/video/{video_id}").json()["id"] for video_id in ("vid1", "vid2")] == ids
+    assert client.post("/recipes/regenerate", params={"dry_run": True}).json()["stale"] == 0
+
+def test_catalog_is_updated_under_the_write_lock(client, fake_pipeline, monkeypatch):
+    # Concurrent stores must reach the catalog in id order, so it is fed under the lock
+    add = type(main.catalog).add
+    locked = []
+    monkeypatch.setattr(
+        type(main.catalog), "add", lambda self, row: locked.append(main.sqlite_write_lock.locked()) or add(self, row)
+    )
+
+    client.post("/scrape_video_id", json={"id": "vid1"})
+
+    assert locked == [True]
+
+def test_recipe_summaries(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    client.post("/scrape_video_id", json={"id": "vid2"})
+    params = {"q": "garlic", "max_calories": 700, "limit": 1}
+
+    from_catalog = client.get("/recipes/summary", params=params).json()
+    monkeypatch.setattr(main.catalog, "complete", False)
+    from_sqlite = client.get("/recipes/summary", params=params).json()
+
+    assert from_catalog["total"] == 2
+    assert [r["video_id"] for r in from_catalog["recipes"]] == ["vid2"]
+    assert "ingredients" not in from_catalog["recipes"][0]
+    assert from_sqlite == from_catalog
+    assert client.get("/recipes/summary", params={"min_protein": 100}).json() == {"total": 0, "recipes": []}
+
+def test_scrape_video_id_without_transcript(client, fake_pipeline, monkeypatch):
+    def no_transcript(self, video_id, *args, **kwargs):
+        raise RuntimeError("Transcripts are disabled")
+    monkeypatch.setattr(YouTubeScraper, "get_transcript", no_transcript)
+
+    response = client.post("/scrape_video_id", json={"id": "vid1"})
+    assert response.status_code == 404
+    fake_pipeline.chat.completions.create.assert_not_called()
+
+def test_scrape_query_stops_at_deadline(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(YouTubeScraper, "iter_video_pages", lambda self, type, arg: iter([[("v1", "One"), ("v2", "Two")]]))
+
+    response = client.post("/scrape_query", json={"query": "pasta", "deadline_seconds": 0})
+
+    assert response.status_code == 404
+    fake_pipeline.chat.completions.create.assert_not_called()
+
+def test_generation_timeout_at_deadline_is_504(client, fake_pipeline, monkeypatch):
+    deadlines = []
+    monkeypatch.setattr(main, "_job_deadline", lambda seconds: deadlines.append(Deadline(seconds)) or deadlines[-1])
+
+    def time_out(**kwargs):
+        # The request timeout is derived from the job deadline, which has now passed
+        deadlines[0].expires_at = 0.0
+        raise openai.APITimeoutError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+    fake_pipeline.chat.completions.create.side_effect = time_out
+
+    response = client.post("/scrape_video_id", json={"id": "vid1", "deadline_seconds": 30})
+
+    assert response.status_code == 504
+
+def test_followed_channels_are_synced(tmp_path, monkeypatch):
+    monkeypatch.setenv("YOUTUBE_API_KEY", "fake_youtube_key")
+    monkeypatch.setenv("OPENAI_API_KEY", "fake_openai_key")
+    monkeypatch.setenv("USE_SQLITE", "true")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "recipes.db"))
+    monkeypatch.setenv("FOLLOWED_CHANNELS", "@one, @two")
+    synced = []
+    warmed = []
+    monkeypatch.setattr(main, "_sync_followed_channel", lambda handle: synced.append(handle) or 0)
+    monkeypatch.setattr(YouTubeScraper, "warm_channel_ids", lambda self, handles: warmed.extend(handles) or {})
+
+    with TestClient(main.app) as test_client:
+        for _ in range(100):
+            if len(synced) == 2:
+                break
+            test_client.get("/status")
+        assert main.sync_task is not None
+
+    assert warmed == ["@one", "@two"]
+    assert synced == ["@one", "@two"]
+    assert main.sync_task is None
+
+def test_followed_channel_sync_needs_sync_user(monkeypatch):
+    monkeypatch.setattr(main, "db_backend", "supabase")
+    monkeypatch.delenv("SYNC_USER_ID", raising=False)
+    sync_channel = Mock()
+    monkeypatch.setattr(main, "_sync_channel", sync_channel)
+
+    assert main._sync_followed_channel("@one") == 0
+    # Nothing could be stored, so the uploads must not be marked processed
+    sync_channel.assert_not_called()
+
+def test_low_transcript_score_skips_llm(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "transcript_score_cutoff", 1.5)
+
+    response = client.post("/scrape_query", json={"query": "pasta"})
+
+    assert response.status_code == 404
+    fake_pipeline.chat.completions.create.assert_not_called()
+
+def test_packed_generation_shares_request(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "pack_token_budget", 4000)
+    monkeypatch.setattr(YouTubeScraper, "iter_video_pages", lambda self, type, arg: iter([[("v1", "One"), ("v2", "Two")]]))
+    packed = {"recipes": [{**RECIPE_JSON, "video_id": "v1"}, {**RECIPE_JSON, "video_id": "v2"}]}
+    fake_pipeline.chat.completions.create.return_value.choices[0].message.content = json.dumps(packed)
+
+    response = client.post("/scrape_query", json={"query": "pasta"})
+
+    assert response.status_code == 200
+    assert fake_pipeline.chat.completions.create.call_count == 1
+    assert [recipe["video_id"] for recipe in response.json()] == ["v1", "v2"]
+
+def test_packed_generation_flushes_full_packs(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "pack_token_budget", 5)
+    monkeypatch.setattr(main, "duplicate_index", None)
+    monkeypatch.setattr(YouTubeScraper, "iter_video_pages", lambda self, type, arg: iter([[("v1", "One"), ("v2", "Two")]]))
+    fetched = []
+    process_video = YouTubeScraper.process_video
+
+    def tracked(self, video_id, title, deadline=None):
+        fetched.append((video_id, fake_pipeline.chat.completions.create.call_count))
+        return process_video(self, video_id, title, deadline)
+    monkeypatch.setattr(YouTubeScraper, "process_video", tracked)
+
+    response = client.post("/scrape_query", json={"query": "pasta"})
+
+    assert response.status_code == 200
+    # Each transcript fills the budget, so v1 is generated before v2 is fetched
+    assert fetched == [("v1", 0), ("v2", 1)]
+
+def test_packed_generation_waits_for_a_slot_within_the_deadline(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "pack_token_budget", 4000)
+    monkeypatch.setattr(main, "duplicate_index", None)
+    work_slot = main._work_slot
+    deadlines = []
+
+    def slot(user, lane, deadline=None):
+        deadlines.append(deadline)
+        if len(deadlines) == 3:  # the packed request, once both videos are fetched
+            raise DeadlineExceeded("Job deadline exceeded")
+        return work_slot(user, lane, deadline)
+    monkeypatch.setattr(main, "_work_slot", slot)
+    deadline = Deadline(30)
+
+    recipes = main._generate_recipes(main._make_scraper("en"), [("v1", "One"), ("v2", "Two")], deadline)
+
+    assert recipes == []
+    assert deadlines == [deadline] * 3
+    assert fake_pipeline.chat.completions.create.call_count == 0
+
+def _stream_chunks(text, size=20):
+    chunks = [Mock(choices=[Mock(delta=Mock(content=text[i:i + size]))], usage=None) for i in range(0, len(text), size)]
+    chunks.append(Mock(choices=[], usage=Mock(prompt_tokens=100, completion_tokens=50, total_tokens=150)))
+    return chunks
+
+def test_scrape_video_id_stream(client, fake_pipeline):
+    fake_pipeline.chat.completions.create.return_value = _stream_chunks(json.dumps(RECIPE_JSON))
+
+    with client.stream("POST", "/scrape_video_id/stream", json={"id": "vid123"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert events[0] == {"event": "field", "name": "title", "value": "Garlic Pasta"}
+    assert [e["value"]["name"] for e in events if e["event"] == "ingredient"] == ["spaghetti", "garlic", "olive oil"]
+    assert events[-1]["event"] == "recipe"
+    assert events[-1]["value"]["video_id"] == "vid123"
+    assert fake_pipeline.chat.completions.create.call_args.kwargs["stream"] is True
+    assert client.get("/recipes/video/vid123").json()["title"] == "Garlic Pasta"
+
+def test_scrape_video_id_stream_reports_invalid_output(client, fake_pipeline):
+    fake_pipeline.chat.completions.create.return_value = _stream_chunks('{"title": "Half a recipe"')
+
+    with client.stream("POST", "/scrape_video_id/stream", json={"id": "vid123"}) as response:
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert events[0]["name"] == "title"
+    assert events[-1]["event"] == "error"
+    assert client.get("/recipes/video/vid123").status_code == 404
+
+def test_export_streams_jsonl(client, fake_pipeline, monkeypatch):
+    monkeypatch.setattr(main, "duplicate_index", None)
+    client.post("/scrape_video_id", json={"id": "vid1"})
+    client.post("/scrape_video_id", json={"id": "vid2"})
+
+    response = client.get("/recipes/export")
+    records = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert [r["video_id"] for r in records] == ["vid1", "vid2"]
+    assert records[0]["ingredients"] and records[0]["steps"]
+    resumed = client.get("/recipes/export", params={"after_id": records[0]["id"]}).text.splitlines()
+    assert [json.loads(line)["video_id"] for line in resumed] == ["vid2"]
+    assert client.get("/recipes/export", params={"format": "csv"}).status_code == 422
+
+def test_client_disconnect_cancels_the_job(monkeypatch):
+    monkeypatch.setattr(main, "DISCONNECT_POLL_SECONDS", 0.01)
+    checks = iter([False, False, True])
+
+    async def is_disconnected():
+        return next(checks)
+
+    request = Mock(is_disconnected=is_disconnected, url=Mock(path="/scrape_query"))
+    deadline = Deadline()
+
+    async def run():
+        async with main._cancel_on_disconnect(request, deadline):
+            for _ in range(100):
+                if deadline.cancelled:
+                    return
+                await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert deadline.cancelled
+
+def test_abandoned_stream_cancels_the_job():
+    async def consume(deadline, limit=None):
+        lines = main._cancel_when_abandoned(iter(["a", "b"]), deadline, "/scrape_video_id/stream")
+        taken = []
+        async for line in lines:
+            taken.append(line)
+            if len(taken) == limit:
+                break
+        await lines.aclose()
+        return taken
+
+    finished, abandoned = Deadline(), Deadline()
+
+    assert asyncio.run(consume(finished)) == ["a", "b"]
+    assert asyncio.run(consume(abandoned, limit=1)) == ["a"]
+    assert not finished.cancelled
+    assert abandoned.cancelled
@@ -0,0 +1,42 @@
+import pytest # type: ignore
+from benchmarks.pipeline_bench import Latency, check_regression, percentile, run_benchmark
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+def test_run_benchmark_search(tmp_path):
+    report = run_benchmark("search", max_results=5, db_path=str(tmp_path / "bench.db"))
+
+    assert report["videos"] == 5
+    assert report["recipes"] == 5
+    assert report["failures"] == 0
+    assert report["throughput_videos_per_s"] > 0
+    for stage in ("transcript", "generate", "store"):
+        assert report["stages"][stage]["count"] == 5
+
+def test_run_benchmark_channel_with_latency():
+    report = run_benchmark("channel", "@1mincook", max_results=3, latency=Latency({"openai": 0.01}))
+
+    assert report["recipes"] == 3
+    assert report["stages"]["generate"]["p50_ms"] >= 10.0
+
+def test_run_benchmark_invalid_source():
+    with pytest.raises(ValueError, match="Invalid source"):
+        run_benchmark("playlist")
+
+def test_check_regression():
+    baseline = {
+        "throughput_videos_per_s": 10.0,
+        "stages": {"generate": {"count": 10, "p95_ms": 100.0, "p99_ms": 120.0}},
+    }
+    ok = {"throughput_videos_per_s": 9.5, "stages": {"generate": {"p95_ms": 110.0, "p99_ms": 125.0}}}
+    slow = {"throughput_videos_per_s": 5.0, "stages": {"generate": {"p95_ms": 200.0, "p99_ms": 125.0}}}
+
+    assert check_regression(ok, baseline) == []
+    problems = check_regression(slow, baseline)
+    assert len(problems) == 2
+    assert problems[0].startswith("generate p95_ms")
@@ -0,0 +1,147 @@
+import pytest # type: ignore
+from unittest.mock import Mock, patch
+from youtube_transcript_api import TranscriptsDisabled # type: ignore
+from youtube_parser.cache import TTLCache
+from youtube_parser.metrics import CACHE_LOOKUPS
+from youtube_parser.retry import RetryPolicy
+from youtube_parser.type import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_parser.yt_scrape import CHANNEL_HANDLES, TRANSCRIPT_FAILURES, TRANSCRIPTS, YouTubeScraper
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = TTLCache(str(tmp_path / "cache.db"), clock=clock)
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def scraper(cache):
+    return YouTubeScraper("fake_api_key", retry_policy=RetryPolicy(sleep=lambda _: None), cache=cache, negative_ttl=60)
+
+def test_get_set_and_expiry(cache, clock):
+    cache.set("ns", "a", {"reason": "x"}, ttl=10)
+    cache.set("ns", "forever", 1)
+
+    assert cache.get("ns", "a") == {"reason": "x"}
+    assert cache.get("other", "a") is None
+
+    clock.now += 10
+    assert cache.get("ns", "a") is None
+    assert cache.get("ns", "forever") == 1
+    assert cache.purge_expired() == 1
+
+def test_entries_survive_reopen(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    first = TTLCache(path, clock=clock)
+    first.set("ns", "a", "value", ttl=10)
+    first.close()
+
+    second = TTLCache(path, clock=clock)
+    assert second.get("ns", "a") == "value"
+    second.close()
+
+def test_lookups_are_counted(cache):
+    hits = CACHE_LOOKUPS.value(cache="ns", result="hit")
+    misses = CACHE_LOOKUPS.value(cache="ns", result="miss")
+
+    cache.get("ns", "missing")
+    cache.set("ns", "a", 1)
+    cache.get("ns", "a")
+
+    assert CACHE_LOOKUPS.value(cache="ns", result="hit") == hits + 1
+    assert CACHE_LOOKUPS.value(cache="ns", result="miss") == misses + 1
+
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_transcripts_are_cached_when_enabled(mock_get_transcript, scraper, cache):
+    mock_get_transcript.return_value = FetchedTranscript(
+        snippets=[FetchedTranscriptSnippet(text="boil pasta", start=0.0, duration=1.0)],
+        video_id="video1",
+        language_code="en",
+        is_generated=False,
+    )
+
+    scraper.process_video("video1", "Title 1")
+    assert cache.get(TRANSCRIPTS, "video1:en") is None
+
+    scraper.transcript_ttl = 60
+    first = scraper.process_video("video1", "Title 1")
+    second = scraper.process_video("video1", "Title 1")
+
+    assert mock_get_transcript.call_count == 2
+    assert second == first
+    assert second["snippets"] == "boil pasta. "
+
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_permanent_failure_is_cached(mock_get_transcript, scraper, cache, clock):
+    mock_get_transcript.side_effect = TranscriptsDisabled("video1")
+
+    first = scraper.process_video("video1", "Title 1")
+    second = scraper.process_video("video1", "Title 1")
+
+    assert mock_get_transcript.call_count == 1
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["reason"] == "TranscriptsDisabled"
+    assert cache.get(TRANSCRIPT_FAILURES, "video1:en") == {"reason": "TranscriptsDisabled"}
+
+    # Once the TTL passes the video is tried again
+    clock.now += 60
+    scraper.process_video("video1", "Title 1")
+    assert mock_get_transcript.call_count == 2
+
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_transient_failure_is_not_cached(mock_get_transcript, scraper, cache):
+    mock_get_transcript.side_effect = Exception("Network hiccup")
+
+    scraper.process_video("video1", "Title 1")
+
+    assert cache.get(TRANSCRIPT_FAILURES, "video1:en") is None
+
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_negative_cache_is_per_language(mock_get_transcript, cache):
+    mock_get_transcript.side_effect = TranscriptsDisabled("video1")
+    policy = RetryPolicy(sleep=lambda _: None)
+
+    YouTubeScraper("fake_api_key", "en", retry_policy=policy, cache=cache).process_video("video1", "Title 1")
+    YouTubeScraper("fake_api_key", "ko", retry_policy=policy, cache=cache).process_video("video1", "Title 1")
+
+    assert mock_get_transcript.call_count == 2
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_channel_id_is_cached(mock_get, scraper, cache):
+    mock_get.return_value.json.return_value = {"items": [{"id": "UCchannel"}]}
+
+    assert scraper.get_channel_id_by_handle("@TryToEat") == "UCchannel"
+    assert scraper.get_channel_id_by_handle("tryToEat") == "UCchannel"
+
+    assert mock_get.call_count == 1
+    assert cache.get(CHANNEL_HANDLES, "trytoeat") == "UCchannel"
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_unknown_handle_is_not_cached(mock_get, scraper, cache):
+    mock_get.return_value.json.return_value = {"items": []}
+
+    with pytest.raises(ValueError, match="Channel not found"):
+        scraper.get_channel_id_by_handle("@missing")
+
+    assert cache.get(CHANNEL_HANDLES, "missing") is None
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_warm_channel_ids(mock_get, scraper):
+    found, missing = Mock(), Mock()
+    found.json.return_value = {"items": [{"id": "UCone"}]}
+    missing.json.return_value = {"items": []}
+    mock_get.side_effect = [found, missing]
+
+    assert scraper.warm_channel_ids(["@one", "@missing", "@one"]) == {"@one": "UCone"}
+    assert mock_get.call_count == 2
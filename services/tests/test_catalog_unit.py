@@ -0,0 +1,69 @@
+import pytest # type: ignore
+from youtube_parser.catalog import RECORD_BYTES, RecipeCatalog
+
+ROWS = [
+    (1, "Garlic Pasta", "v1", "2", "10 minutes", "10 minutes", 620.0, 13.4, 75.0, 28.9, 20),
+    (2, "Kimchi Fried Rice", "v2", "2", "10 minutes", "15 minutes", 450.0, 12.0, 60.0, 15.0, 25),
+    (3, "Green Salad", "v3", "4", "10 minutes", None, None, None, None, None, 10),
+]
+
+@pytest.fixture
+def catalog():
+    catalog = RecipeCatalog()
+    assert catalog.load(ROWS)
+    return catalog
+
+def _ids(result):
+    return [summary["id"] for summary in result[1]]
+
+def test_query_newest_first(catalog):
+    total, recipes = catalog.query()
+
+    assert total == 3
+    assert [r["id"] for r in recipes] == [3, 2, 1]
+    assert recipes[2] == dict(zip(
+        ("id", "title", "video_id", "servings", "prep_time", "cook_time", "calories", "protein", "carbs", "fat",
+         "total_minutes"),
+        ROWS[0],
+    ))
+    assert recipes[0]["calories"] is None
+
+def test_filters(catalog):
+    assert _ids(catalog.query("RICE")) == [2]
+    assert _ids(catalog.query(ranges={"calories": (None, 500)})) == [2]
+    assert _ids(catalog.query(ranges={"protein": (13, None), "fat": (20, 30)})) == [1]
+    # A missing macro never matches a bound on it
+    assert _ids(catalog.query(ranges={"calories": (0, None)})) == [2, 1]
+    assert _ids(catalog.query(ranges={"total_minutes": (None, 20)})) == [3, 1]
+
+def test_paging(catalog):
+    total, recipes = catalog.query(offset=1, limit=1)
+    assert total == 3
+    assert [r["id"] for r in recipes] == [2]
+
+def test_add_and_replace(catalog):
+    catalog.add((4, "Omelette", "v4", "1", None, None, 300.0, 20.0, 2.0, 22.0))
+    catalog.add((1, "Garlic Pasta", "v1", "2", "10 minutes", "10 minutes", 500.0, 13.0, 70.0, 20.0))
+
+    assert len(catalog) == 4
+    assert _ids(catalog.query()) == [4, 3, 2, 1]
+    assert catalog.query("garlic")[1][0]["calories"] == 500.0
+
+def test_strings_are_shared():
+    catalog = RecipeCatalog()
+    # Separately built but equal strings, as they come out of SQLite
+    catalog.load([(i, "Soup", f"v{i}", "2", " ".join(["10", "minutes"]), None, None, None, None, None) for i in range(3)])
+
+    assert len({id(summary["prep_time"]) for summary in catalog.query()[1]}) == 1
+
+def test_memory_budget():
+    catalog = RecipeCatalog(max_bytes=RECORD_BYTES * 2 + 500)
+
+    assert catalog.load(ROWS[:1])
+    assert not catalog.load(ROWS)
+    assert not catalog.complete
+    assert len(catalog) == 0
+    assert not catalog.add(ROWS[0])
+
+    assert catalog.load(ROWS[:1])
+    assert catalog.complete
@@ -0,0 +1,110 @@
+import pytest # type: ignore
+from unittest.mock import Mock, patch
+from youtube_parser import main
+from youtube_parser.channel_sync import ChannelSyncStore
+from youtube_parser.yt_scrape import YouTubeScraper
+
+def _item(video_id, published_at):
+    return {
+        "snippet": {"title": f"Title {video_id}"},
+        "contentDetails": {"videoId": video_id, "videoPublishedAt": published_at},
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChannelSyncStore(str(tmp_path / "sync.db"))
+    yield store
+    store.close()
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_fetch_uploads_pages_until_since(mock_get):
+    first, second = Mock(), Mock()
+    first.json.return_value = {
+        "items": [_item("v4", "2025-01-04T00:00:00Z"), _item("v3", "2025-01-03T00:00:00Z")],
+        "nextPageToken": "page2",
+    }
+    second.json.return_value = {
+        "items": [_item("v2", "2025-01-02T00:00:00Z"), _item("v1", "2025-01-01T00:00:00Z")],
+    }
+    mock_get.side_effect = [first, second]
+
+    uploads = YouTubeScraper("fake_api_key").fetch_uploads(
+        "UCchannel", since="2025-01-02T00:00:00Z", known_ids={"v3"}
+    )
+
+    assert uploads == [("v4", "Title v4", "2025-01-04T00:00:00Z"), ("v2", "Title v2", "2025-01-02T00:00:00Z")]
+    assert mock_get.call_args_list[0].kwargs["params"]["playlistId"] == "UUchannel"
+    assert mock_get.call_args_list[1].kwargs["params"]["pageToken"] == "page2"
+
+def test_record_sync_advances_watermark(store):
+    listed = [("v2", "Two", "2025-01-02T00:00:00Z"), ("v1", "One", "2025-01-01T00:00:00Z")]
+
+    store.record_sync("system", "UCchannel", listed, ["v1", "v2"])
+
+    state = store.get_state("system", "UCchannel")
+    assert state["last_video_id"] == "v2"
+    assert state["last_published_at"] == "2025-01-02T00:00:00Z"
+    assert store.processed_ids("system", "UCchannel") == {"v1", "v2"}
+    assert store.get_state("system", "UCother") is None
+
+def test_record_sync_holds_watermark_at_unprocessed(store):
+    store.record_sync("system", "UCchannel", [("v1", "One", "2025-01-01T00:00:00Z")], ["v1"])
+    listed = [
+        ("v3", "Three", "2025-01-03T00:00:00Z"),
+        ("v2", "Two", "2025-01-02T00:00:00Z"),
+    ]
+
+    store.record_sync("system", "UCchannel", listed, ["v3"])
+
+    # v2 failed transiently, so the next run must list it again
+    assert store.get_state("system", "UCchannel")["last_published_at"] == "2025-01-02T00:00:00Z"
+
+    store.record_sync("system", "UCchannel", [("v2", "Two", "2025-01-02T00:00:00Z")], ["v2"])
+    assert store.get_state("system", "UCchannel")["last_published_at"] == "2025-01-02T00:00:00Z"
+
+def test_sync_channel_generates_only_new_uploads(store, monkeypatch):
+    def fake_generate(scraper, videos, deadline, processed, user):
+        assert user == "system"
+        for video_id, title in videos:
+            processed.append(video_id)
+            yield {"title": title}
+
+    monkeypatch.setattr(main, "sync_store", store)
+    monkeypatch.setattr(main, "_iter_recipes", fake_generate)
+    store.record_sync("system", "UCchannel", [("v1", "One", "2025-01-01T00:00:00Z")], ["v1"])
+
+    scraper = Mock()
+    scraper.fetch_uploads.return_value = [
+        ("v3", "Weekend vlog", "2025-01-03T00:00:00Z"),
+        ("v2", "Two", "2025-01-02T00:00:00Z"),
+    ]
+    scraper.prefilter.side_effect = lambda videos: [video for video in videos if "vlog" not in video[1]]
+
+    stored = []
+    recipes = main._sync_channel(scraper, "UCchannel", store=stored.append)
+
+    assert recipes == stored == [{"title": "Two"}]
+    scraper.fetch_uploads.assert_called_once_with(
+        "UCchannel", since="2025-01-01T00:00:00Z", known_ids={"v1"}
+    )
+    # The vlog was rejected by the prefilter, so it is never listed again
+    assert store.processed_ids("system", "UCchannel") == {"v1", "v2", "v3"}
+
+def test_sync_state_is_kept_per_consumer(store, monkeypatch):
+    def fake_generate(scraper, videos, deadline, processed, user):
+        for video_id, title in videos:
+            processed.append(video_id)
+            yield {"title": title}
+
+    monkeypatch.setattr(main, "sync_store", store)
+    monkeypatch.setattr(main, "_iter_recipes", fake_generate)
+    scraper = Mock()
+    scraper.fetch_uploads.return_value = [("v1", "One", "2025-01-01T00:00:00Z")]
+    scraper.prefilter.side_effect = lambda videos: videos
+
+    assert main._sync_channel(scraper, "UCchannel", user="client:a") == [{"title": "One"}]
+    # Another caller (or the background sync) still gets the same new upload
+    assert main._sync_channel(scraper, "UCchannel", user=main.CHANNEL_SYNC_USER) == [{"title": "One"}]
+    assert scraper.fetch_uploads.call_args_list[1].kwargs["known_ids"] == set()
+    assert store.processed_ids("client:a", "UCchannel") == {"v1"}
+    assert store.get_state("client:b", "UCchannel") is None
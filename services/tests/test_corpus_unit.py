@@ -0,0 +1,153 @@
+import pytest # type: ignore
+from youtube_parser import corpus
+from youtube_parser.main import _init_sqlite
+
+def _store(conn, title, video_id, ingredients, steps):
+    recipe_id = conn.execute(
+        "INSERT INTO recipes (title, video_id, servings, calories) VALUES (?, ?, '2', 500.0)", (title, video_id)
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO ingredients (recipe_id, name, quantity) VALUES (?, ?, ?)",
+        [(recipe_id, name, quantity) for name, quantity in ingredients],
+    )
+    conn.executemany(
+        "INSERT INTO steps (recipe_id, step_number, description) VALUES (?, ?, ?)",
+        [(recipe_id, number, text) for number, text in enumerate(steps, 1)],
+    )
+    conn.commit()
+
+@pytest.fixture
+def source(tmp_path):
+    conn = _init_sqlite(str(tmp_path / "source.db"))
+    _store(conn, "Garlic Pasta", "v1", [("spaghetti", "200 g"), ("garlic", "4 cloves")], ["Boil", "Toss"])
+    _store(conn, "Kimchi Fried Rice", "v2", [("rice", "2 cups")], ["Fry"])
+    _store(conn, "Green Salad", "v3", [], [])
+    yield conn
+    conn.close()
+
+def test_iter_recipes_sqlite_pages_in_id_order(source):
+    records = list(corpus.iter_recipes_sqlite(source, batch_size=2))
+
+    assert [r["id"] for r in records] == [1, 2, 3]
+    assert records[0]["ingredients"] == [
+        {"name": "spaghetti", "quantity": "200 g"},
+        {"name": "garlic", "quantity": "4 cloves"},
+    ]
+    assert records[0]["steps"] == [{"step_number": 1, "description": "Boil"}, {"step_number": 2, "description": "Toss"}]
+    assert records[2]["ingredients"] == [] and records[2]["steps"] == []
+    assert [r["id"] for r in corpus.iter_recipes_sqlite(source, after_id=2)] == [3]
+
+def test_jsonl_export_resumes_after_last_id(source, tmp_path):
+    path = str(tmp_path / "recipes.jsonl")
+    assert corpus.export_recipes(corpus.iter_recipes_sqlite(source, after_id=0, batch_size=1), path) == 3
+    # Simulate an export cut off after the first record
+    with open(path, encoding="utf-8") as f:
+        first_line = f.readline()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(first_line)
+
+    after_id = corpus.resume_jsonl(path)
+    written = corpus.export_recipes(corpus.iter_recipes_sqlite(source, after_id), path, append=True)
+
+    assert (after_id, written) == (1, 2)
+    assert [r["title"] for r in corpus.read_jsonl(path)] == ["Garlic Pasta", "Kimchi Fried Rice", "Green Salad"]
+
+def test_jsonl_export_resumes_after_truncated_record(source, tmp_path):
+    path = str(tmp_path / "recipes.jsonl")
+    corpus.export_recipes(corpus.iter_recipes_sqlite(source), path)
+    # Simulate a process killed halfway through writing the second record
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(lines[0] + lines[1][: len(lines[1]) // 2])
+
+    after_id = corpus.resume_jsonl(path)
+    written = corpus.export_recipes(corpus.iter_recipes_sqlite(source, after_id), path, append=True)
+
+    assert (after_id, written) == (1, 2)
+    assert [r["title"] for r in corpus.read_jsonl(path)] == ["Garlic Pasta", "Kimchi Fried Rice", "Green Salad"]
+    assert corpus.resume_jsonl(str(tmp_path / "missing.jsonl")) == 0
+
+def test_import_into_fresh_database_parses_quantities(source, tmp_path):
+    target = _init_sqlite(str(tmp_path / "target.db"))
+    records = list(corpus.iter_recipes_sqlite(source))
+
+    assert corpus.import_recipes(records, corpus.SQLiteSink(target), "dump", batch_size=2) == 3
+
+    assert [
+        {key: r[key] for key in ("title", "ingredients", "steps")} for r in corpus.iter_recipes_sqlite(target)
+    ] == [{key: r[key] for key in ("title", "ingredients", "steps")} for r in records]
+    assert target.execute(
+        "SELECT amount, unit FROM ingredients WHERE name = 'spaghetti'"
+    ).fetchone() == (200.0, "g")
+    target.close()
+
+def test_import_resumes_from_committed_batch(source, tmp_path):
+    target = _init_sqlite(str(tmp_path / "target.db"))
+    sink = corpus.SQLiteSink(target)
+    records = list(corpus.iter_recipes_sqlite(source))
+    write_batch = sink.write_batch
+    calls = []
+
+    def failing_write(batch, source_name, position):
+        calls.append(position)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        write_batch(batch, source_name, position)
+
+    sink.write_batch = failing_write
+    with pytest.raises(RuntimeError):
+        corpus.import_recipes(records, sink, "dump", batch_size=2)
+    sink.write_batch = write_batch
+
+    assert sink.position("dump") == 2
+    assert corpus.import_recipes(records, sink, "dump", batch_size=2) == 1
+    assert [row[0] for row in target.execute("SELECT title FROM recipes ORDER BY id")] == [
+        "Garlic Pasta", "Kimchi Fried Rice", "Green Salad",
+    ]
+    target.close()
+
+def test_cli_round_trip(source, tmp_path, capsys):
+    path = str(tmp_path / "recipes.jsonl")
+    source_path = source.execute("PRAGMA database_list").fetchone()[2]
+
+    assert corpus.main_cli(["export", path, "--db", source_path]) == 0
+    assert corpus.main_cli(["import", path, "--db", str(tmp_path / "target.db")]) == 0
+    # A second run finds the import complete
+    assert corpus.main_cli(["import", path, "--db", str(tmp_path / "target.db")]) == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        f"Exported 3 recipes to {path}",
+        f"Imported 3 recipes from {path}",
+        f"Imported 0 recipes from {path}",
+    ]
+
+def test_parquet_round_trip(source, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "recipes.parquet")
+
+    assert corpus.export_recipes(corpus.iter_recipes_sqlite(source), path) == 3
+
+    assert list(corpus.read_parquet(path)) == list(corpus.iter_recipes_sqlite(source))
+
+def test_iter_recipes_supabase_pages_with_keyset(source):
+    class Query:
+        def __init__(self, table):
+            self.table, self.filters, self.limit_to = table, [], None
+        def select(self, columns): return self
+        def gt(self, column, value): self.filters.append(lambda row: row[column] > value); return self
+        def in_(self, column, values): self.filters.append(lambda row: row[column] in values); return self
+        def order(self, column): return self
+        def limit(self, count): self.limit_to = count; return self
+        def execute(self):
+            rows = [row for row in tables[self.table] if all(f(row) for f in self.filters)]
+            return type("Response", (), {"data": rows[:self.limit_to]})
+
+    def rows(sql):
+        cursor = source.execute(sql)
+        return [dict(zip([c[0] for c in cursor.description], row)) for row in cursor]
+
+    tables = {name: rows(f"SELECT * FROM {name} ORDER BY id") for name in ("recipes", "ingredients", "steps")}
+    client = type("Client", (), {"table": lambda self, name: Query(name)})()
+
+    assert list(corpus.iter_recipes_supabase(client, batch_size=2)) == list(corpus.iter_recipes_sqlite(source))
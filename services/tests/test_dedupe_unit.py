@@ -0,0 +1,79 @@
+import random
+import pytest # type: ignore
+from youtube_parser.dedupe import DuplicateIndex, MinHasher, shingles, similarity
+
+WORDS = "boil salt pasta garlic oil pan fry toss parsley pepper minutes heat stir serve water cup".split()
+
+def _transcript(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(length))
+
+def _edited(text, keep=0.95, seed=0):
+    """Drop a few words, like a re-upload with a different intro."""
+    rng = random.Random(seed)
+    return " ".join(word for word in text.split() if rng.random() < keep)
+
+@pytest.fixture
+def index():
+    index = DuplicateIndex()
+    yield index
+    index.close()
+
+def test_shingles():
+    assert shingles("") == set()
+    assert len(shingles("one two three")) == 1
+    assert len(shingles("a b c d e f g", size=5)) == 3
+    assert shingles("Boil The Pasta") == shingles("boil the pasta")
+
+def test_signature_similarity_tracks_overlap():
+    hasher = MinHasher()
+    original = _transcript(1)
+
+    assert similarity(hasher.signature(original), hasher.signature(original)) == 1.0
+    assert similarity(hasher.signature(original), hasher.signature(_edited(original))) > 0.6
+    assert similarity(hasher.signature(original), hasher.signature(_transcript(2))) < 0.1
+
+def test_find_near_duplicate(index):
+    original = _transcript(1)
+    index.add("full", index.signature(original), {"title": "Garlic Pasta"})
+    index.add("other", index.signature(_transcript(2)), {"title": "Other"})
+
+    match = index.find(index.signature(original + " thanks for watching"))
+
+    assert match["video_id"] == "full"
+    assert match["similarity"] >= index.threshold
+    assert match["recipe"] == {"title": "Garlic Pasta"}
+    assert index.find(index.signature(_transcript(3))) is None
+
+def test_find_excludes_the_video_itself(index):
+    text = _transcript(1)
+    index.add("full", index.signature(text), {})
+
+    assert index.find(index.signature(text), exclude="full") is None
+
+def test_re_adding_replaces_buckets(index):
+    index.add("video", index.signature(_transcript(1)), {})
+    index.add("video", index.signature(_transcript(2)), {})
+
+    assert index.find(index.signature(_transcript(1))) is None
+    assert index.find(index.signature(_transcript(2)))["video_id"] == "video"
+
+def test_links(index):
+    assert index.canonical("short") is None
+    index.link("short", "full", 0.9)
+    assert index.canonical("short") == "full"
+
+def test_bands_must_divide_signature():
+    with pytest.raises(ValueError, match="do not divide"):
+        DuplicateIndex(hasher=MinHasher(num_perm=10), bands=3)
+
+def test_index_survives_reopen(tmp_path):
+    path = str(tmp_path / "dedupe.db")
+    text = _transcript(1)
+    first = DuplicateIndex(path)
+    first.add("full", first.signature(text), {"title": "Garlic Pasta"})
+    first.close()
+
+    second = DuplicateIndex(path)
+    assert second.find(second.signature(text))["video_id"] == "full"
+    second.close()
@@ -1 +1,82 @@
-#todo
\ No newline at end of file
+import pytest # type: ignore
+from youtube_transcript_api import YouTubeTranscriptApi # type: ignore
+from loadtest.fake_servers import FakeStack, FaultProfile
+from youtube_parser.recipe_gen import RecipeGenerator
+from youtube_parser.upstream import create_session, parse_overrides
+from youtube_parser.yt_scrape import YouTubeScraper
+
+@pytest.fixture
+def fake_stack():
+    stack = FakeStack().start()
+    yield stack
+    stack.stop()
+
+@pytest.fixture
+def scraper(fake_stack):
+    session = create_session(parse_overrides(fake_stack.env()["UPSTREAM_OVERRIDES"]))
+    return YouTubeScraper(
+        "fake_api_key",
+        max_results=3,
+        session=session,
+        transcript_api=YouTubeTranscriptApi(http_client=session),
+    )
+
+def test_parse_overrides():
+    assert parse_overrides("https://a.com=http://127.0.0.1:1, https://b.com=http://127.0.0.1:2") == {
+        "https://a.com": "http://127.0.0.1:1",
+        "https://b.com": "http://127.0.0.1:2",
+    }
+    assert parse_overrides(None) == {}
+    with pytest.raises(ValueError, match="Invalid upstream override"):
+        parse_overrides("https://a.com")
+
+def test_scrape_through_fake_upstreams(scraper):
+    results = scraper.process_videos(type="query", arg="easy dinner")
+
+    assert len(results) == 3
+    assert results[0]["video_id"] == "H1Pi1OjQlgg"
+    assert "soy glazed chicken" in results[0]["snippets"]
+
+def test_channel_lookup_through_fake_upstreams(scraper):
+    assert scraper.get_channel_id_by_handle("@1mincook") == "UC1mincook"
+
+def test_generate_through_fake_openai(fake_stack, scraper):
+    import openai # type: ignore
+
+    client = openai.OpenAI(api_key="fake", base_url=fake_stack.env()["OPENAI_BASE_URL"])
+    video = scraper.process_videos(type="id", arg="H1Pi1OjQlgg")[0]
+    recipe = RecipeGenerator("fake", client=client).generate_recipe(str(video))
+
+    assert recipe.video_id == "H1Pi1OjQlgg"
+    assert len(recipe.steps) > 0
+
+def test_stream_through_fake_openai(fake_stack, scraper):
+    import openai # type: ignore
+
+    client = openai.OpenAI(api_key="fake", base_url=fake_stack.env()["OPENAI_BASE_URL"])
+    video = scraper.process_videos(type="id", arg="H1Pi1OjQlgg")[0]
+    events = list(RecipeGenerator("fake", client=client).stream_recipe(str(video)))
+
+    kinds = [event["event"] for event in events]
+    assert kinds[0] == "field" and events[0]["name"] == "title"
+    assert kinds.count("step") == len(events[-1]["value"]["steps"])
+    assert kinds[-1] == "recipe"
+
+def test_fault_profile_throttles():
+    stack = FakeStack(youtube_faults=FaultProfile(throttle_rate=1.0, retry_after=2)).start()
+    try:
+        session = create_session(parse_overrides(stack.env()["UPSTREAM_OVERRIDES"]))
+        response = session.get("https://www.googleapis.com/youtube/v3/search", params={"q": "x"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        assert stack.youtube.status_counts == {429: 1}
+    finally:
+        stack.stop()
+
+def test_uploads_through_fake_upstreams(scraper):
+    uploads = scraper.fetch_uploads("UC1mincook")
+    assert len(uploads) == 3
+    assert uploads[0][2] > uploads[1][2] > uploads[2][2]
+
+    newer = scraper.fetch_uploads("UC1mincook", since=uploads[1][2], known_ids={uploads[0][0]})
+    assert [video_id for video_id, _, _ in newer] == [uploads[1][0]]
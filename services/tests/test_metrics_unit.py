@@ -0,0 +1,64 @@
+import pytest # type: ignore
+from youtube_parser.metrics import Counter, Histogram, Registry, STAGE_DURATION, PLACEHOLDER_FAILURES
+from youtube_parser.yt_scrape import YouTubeScraper
+from youtube_parser.retry import RetryPolicy
+from unittest.mock import patch
+
+def test_counter_render():
+    registry = Registry()
+    counter = registry.counter("test_total", "Test counter.", ["stage"])
+    counter.inc(stage="a")
+    counter.inc(2, stage="a")
+    counter.inc(stage='b"x')
+
+    text = registry.render()
+    assert "# TYPE test_total counter" in text
+    assert 'test_total{stage="a"} 3' in text
+    assert 'test_total{stage="b\\"x"} 1' in text
+
+def test_counter_rejects_wrong_labels():
+    counter = Counter("test_total", "Test counter.", ["stage"])
+    with pytest.raises(ValueError):
+        counter.inc(other="a")
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test histogram.", ["stage"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="x")
+    histogram.observe(0.5, stage="x")
+    histogram.observe(5.0, stage="x")
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="x",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="x",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="x"} 3' in lines
+
+def test_histogram_timer_decorator():
+    histogram = Histogram("test_seconds", "Test histogram.", ["stage"])
+
+    @histogram.time(stage="work")
+    def work():
+        return 42
+
+    assert work() == 42
+    assert histogram.count(stage="work") == 1
+
+@patch.object(YouTubeScraper, 'fetch_video_by_id')
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_process_videos_counts_placeholders(mock_get_transcript, mock_fetch_video):
+    mock_fetch_video.return_value = [("video1", "Title 1")]
+    mock_get_transcript.side_effect = Exception("Error")
+    before = PLACEHOLDER_FAILURES.value()
+
+    YouTubeScraper("fake_api_key", retry_policy=RetryPolicy(sleep=lambda _: None)).process_videos(type="id", arg="video1")
+
+    assert PLACEHOLDER_FAILURES.value() == before + 1
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_youtube_lookup_is_timed(mock_get):
+    mock_get.return_value.json.return_value = {"items": [{"id": "channel123"}]}
+    before = STAGE_DURATION.count(stage="youtube_channel_lookup")
+
+    YouTubeScraper("fake_api_key").get_channel_id_by_handle("@TestChannel")
+
+    assert STAGE_DURATION.count(stage="youtube_channel_lookup") == before + 1
@@ -0,0 +1,66 @@
+import pytest # type: ignore
+from youtube_parser.main import _init_sqlite
+from youtube_parser.neighbors import NeighborIndex, recipe_terms
+
+RECIPES = {
+    "Garlic Pasta": ["spaghetti", "garlic", "olive oil", "parmesan"],
+    "Aglio e Olio": ["linguine", "garlic cloves", "extra virgin olive oil", "chili flakes"],
+    "Tomato Pasta": ["penne", "tomatoes", "garlic", "basil"],
+    "Kimchi Fried Rice": ["cooked rice", "kimchi", "egg", "sesame oil"],
+    "Egg Fried Rice": ["steamed rice", "eggs", "green onions", "soy sauce"],
+}
+
+@pytest.fixture
+def conn():
+    conn = _init_sqlite(":memory:")
+    yield conn
+    conn.close()
+
+def _store(conn, title, ingredients):
+    recipe_id = conn.execute("INSERT INTO recipes (title, video_id) VALUES (?, ?)", (title, title)).lastrowid
+    conn.executemany(
+        "INSERT INTO ingredients (recipe_id, name, quantity) VALUES (?, ?, '1')",
+        [(recipe_id, name) for name in ingredients],
+    )
+    return recipe_id
+
+def _titles(index, recipe_id):
+    return [neighbor["title"] for neighbor in index.similar(recipe_id)]
+
+def test_recipe_terms_normalize_ingredients():
+    terms = recipe_terms("The Best Garlic Pasta", ["Garlic cloves, minced", "linguine", "unobtainium dust"])
+
+    assert terms == {"i:garlic": 1, "i:spaghetti": 1, "i:unobtainium dust": 1, "t:garlic": 0.5, "t:pasta": 0.5}
+
+def test_rebuild_ranks_neighbors(conn):
+    ids = {title: _store(conn, title, ingredients) for title, ingredients in RECIPES.items()}
+    index = NeighborIndex(conn, k=2)
+
+    assert index.rebuild() == 5
+
+    assert _titles(index, ids["Garlic Pasta"]) == ["Aglio e Olio", "Tomato Pasta"]
+    assert _titles(index, ids["Kimchi Fried Rice"])[0] == "Egg Fried Rice"
+    scores = [neighbor["score"] for neighbor in index.similar(ids["Garlic Pasta"])]
+    assert scores == sorted(scores, reverse=True)
+    assert index.similar(ids["Garlic Pasta"], limit=1)[0]["video_id"] == "Aglio e Olio"
+
+def test_add_matches_rebuild_order(conn):
+    index = NeighborIndex(conn, k=2)
+    ids = {}
+    for title, ingredients in RECIPES.items():
+        ids[title] = _store(conn, title, ingredients)
+        index.add(ids[title])
+
+    incremental = {title: _titles(index, recipe_id) for title, recipe_id in ids.items()}
+    index.rebuild()
+
+    assert incremental == {title: _titles(index, recipe_id) for title, recipe_id in ids.items()}
+
+def test_unrelated_recipe_has_no_neighbors(conn):
+    index = NeighborIndex(conn)
+    first = _store(conn, "Garlic Pasta", ["spaghetti"])
+    second = _store(conn, "Fruit Salad", ["apple"])
+    index.rebuild()
+
+    assert index.similar(first) == []
+    assert index.similar(second) == []
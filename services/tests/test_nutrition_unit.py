@@ -0,0 +1,64 @@
+import pytest # type: ignore
+from youtube_parser.nutrition import NutritionEngine, default_engine
+
+@pytest.fixture
+def engine():
+    return default_engine()
+
+@pytest.mark.parametrize("name, expected", [
+    ("spaghetti", "spaghetti"),
+    ("Garlic cloves, minced", "garlic"),
+    ("minced garlic", "garlic"),
+    ("green onions", "green onion"),
+    ("red bell pepper", "bell pepper"),
+    ("boneless chicken breast (skinless)", "chicken breast"),
+    ("고추장", "gochujang"),
+])
+def test_match(engine, name, expected):
+    assert engine.names[engine.match(name)] == expected
+
+def test_unknown_ingredient_does_not_match(engine):
+    assert engine.match("unobtainium") is None
+
+def test_grams_by_unit_kind(engine):
+    oil = engine.match("olive oil")
+    garlic = engine.match("garlic")
+    beef = engine.match("beef")
+
+    assert engine.grams(oil, "1 tbsp") == pytest.approx(14.79 * 0.91)
+    assert engine.grams(garlic, "4 cloves") == 12
+    assert engine.grams(beef, "1 lb") == 453.6
+    # Beef has no piece weight, so a bare count cannot be converted
+    assert engine.grams(beef, "2") is None
+
+def test_compute_per_serving(engine):
+    nutrition = engine.compute(
+        [("spaghetti", "200 g"), ("garlic", "4 cloves"), ("olive oil", "1/4 cup"), ("salt", "to taste")],
+        "2",
+    )
+
+    assert set(nutrition) == {"calories", "protein", "carbs", "fat"}
+    assert nutrition["calories"] == pytest.approx(621.2, abs=0.1)
+    assert nutrition["protein"] == pytest.approx(13.4, abs=0.1)
+    assert nutrition["fat"] == pytest.approx(28.9, abs=0.1)
+
+def test_compute_without_measurable_ingredients(engine):
+    assert engine.compute([("salt", "to taste"), ("mystery", "1 cup")]) is None
+
+def test_compute_many_matches_compute():
+    engine = NutritionEngine([
+        {"name": "flour", "calories": "300", "protein": "10", "carbs": "60", "fat": "1", "grams_per_ml": "0.5"},
+        {"name": "egg", "aliases": "eggs", "calories": "150", "protein": "12", "carbs": "1", "fat": "10", "grams_per_piece": "50"},
+    ])
+    recipes = [
+        ("pancakes", [("flour", "1 cup"), ("eggs", "2")], "2"),
+        ("omelette", [("egg", "3")], None),
+        ("water", [("water", "1 cup")], None),
+    ]
+
+    results = engine.compute_many(recipes)
+
+    assert results["pancakes"] == engine.compute(recipes[0][1], "2")
+    assert results["pancakes"]["calories"] == pytest.approx((300 * 1.2 + 150) / 2)
+    assert results["omelette"]["protein"] == 18.0
+    assert results["water"] is None
@@ -0,0 +1,76 @@
+import pytest # type: ignore
+from unittest.mock import Mock, patch
+from youtube_parser.metrics import PREFILTER_SKIPPED
+from youtube_parser.prefilter import DEFAULT_CUTOFF, NEUTRAL_SCORE, parse_duration, score_transcript, score_video
+from youtube_parser.yt_scrape import YouTubeScraper
+
+def test_parse_duration():
+    assert parse_duration("PT1H2M3S") == 3723
+    assert parse_duration("PT45S") == 45
+    assert parse_duration("P1DT1M") == 86460
+    assert parse_duration("") is None
+    assert parse_duration("bogus") is None
+
+def test_score_video():
+    recipe = score_video({
+        "title": "Quick and Easy Chili Recipe",
+        "description": "Ingredients: 500g beef, 2 tbsp chili powder",
+        "duration_seconds": 9 * 60,
+        "category_id": "26",
+    })
+    vlog = score_video({"title": "Weekend vlog in Seoul", "duration_seconds": 15 * 60, "category_id": "22"})
+    livestream = score_video({"title": "Sunday livestream", "duration_seconds": 3 * 3600, "live": True})
+
+    assert recipe > DEFAULT_CUTOFF > vlog
+    assert livestream == 0.0
+    # Titles without any signal, common on Korean channels, are kept
+    assert score_video({"title": "요즘 애들은 모르는 주먹밥"}) == NEUTRAL_SCORE
+    assert score_video({"title": "대만 고기국수 탐방기 : 맛집 투어"}) < DEFAULT_CUTOFF
+
+def test_score_transcript():
+    assert score_transcript("") == 0.0
+    assert score_transcript("add 2 cups of flour, whisk the eggs and bake for 20 minutes") == 1.0
+    assert score_transcript("hey guys welcome back to my channel today we are talking about life") == 0.0
+
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_fetch_video_details_batches(mock_get):
+    mock_get.return_value.json.return_value = {
+        "items": [{
+            "id": "video1",
+            "snippet": {"title": "Chili Recipe", "description": "", "categoryId": "26", "liveBroadcastContent": "none"},
+            "contentDetails": {"duration": "PT9M"},
+        }]
+    }
+    ids = [f"video{i}" for i in range(120)]
+
+    details = YouTubeScraper("fake_api_key").fetch_video_details(ids)
+
+    assert mock_get.call_count == 3
+    assert len(mock_get.call_args_list[0].kwargs["params"]["id"].split(",")) == 50
+    assert details["video1"] == {
+        "title": "Chili Recipe", "description": "", "duration_seconds": 540, "category_id": "26", "live": False,
+    }
+
+def test_prefilter_drops_low_scores():
+    scraper = YouTubeScraper("fake_api_key", score_cutoff=DEFAULT_CUTOFF)
+    scraper.fetch_video_details = Mock(return_value={
+        "v1": {"title": "Chili Recipe", "duration_seconds": 540},
+        "v2": {"title": "My weekend vlog", "duration_seconds": 600},
+    })
+    before = PREFILTER_SKIPPED.value(stage="metadata")
+
+    kept = scraper.prefilter([("v1", "Chili Recipe"), ("v2", "My weekend vlog"), ("v3", "주먹밥")])
+
+    assert kept == [("v1", "Chili Recipe"), ("v3", "주먹밥")]
+    assert PREFILTER_SKIPPED.value(stage="metadata") == before + 1
+
+def test_prefilter_disabled_or_failing_keeps_everything():
+    videos = [("v1", "My weekend vlog")]
+    scraper = YouTubeScraper("fake_api_key")
+    scraper.fetch_video_details = Mock()
+    assert scraper.prefilter(videos) == videos
+    scraper.fetch_video_details.assert_not_called()
+
+    scraper.score_cutoff = DEFAULT_CUTOFF
+    scraper.fetch_video_details.side_effect = RuntimeError("quota exceeded")
+    assert scraper.prefilter(videos) == videos
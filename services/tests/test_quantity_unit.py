@@ -0,0 +1,87 @@
+import pytest # type: ignore
+from youtube_parser.quantity import (
+    Quantity, convert, format_amount, format_quantity, normalize_unit, parse_minutes, parse_quantity, parse_servings,
+    recipe_minutes, scale_amounts,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("200 g", Quantity(200.0, None, "g", None)),
+    ("200g", Quantity(200.0, None, "g", None)),
+    ("1/4 cup", Quantity(0.25, None, "cup", None)),
+    ("1 1/2 Tablespoons", Quantity(1.5, None, "tbsp", None)),
+    ("½ tsp", Quantity(0.5, None, "tsp", None)),
+    ("2-3 cloves, minced", Quantity(2.0, 3.0, "clove", "minced")),
+    ("2 to 3 tbsp.", Quantity(2.0, 3.0, "tbsp", None)),
+    ("2큰술", Quantity(2.0, None, "큰술", None)),
+    ("1 fl oz", Quantity(1.0, None, "fl oz", None)),
+    ("a pinch", Quantity(1.0, None, "pinch", None)),
+    ("3 large eggs", Quantity(3.0, None, None, "large eggs")),
+    ("1.5 kg (about 3 lbs)", Quantity(1.5, None, "kg", "(about 3 lbs)")),
+    ("a handful", Quantity(None, None, None, "a handful")),
+    ("to taste", Quantity(None, None, None, "to taste")),
+    (None, Quantity(None, None, None, None)),
+])
+def test_parse_quantity(text, expected):
+    assert parse_quantity(text) == expected
+
+def test_normalize_unit():
+    assert normalize_unit("Cups") == "cup"
+    assert normalize_unit("fl. oz") == "fl oz"
+    assert normalize_unit("숟가락") == "큰술"
+    assert normalize_unit("large") is None
+
+def test_parse_servings():
+    assert parse_servings("4") == 4
+    assert parse_servings("serves 2-3") == 2.5
+    assert parse_servings(None) == 1
+    assert parse_servings("a crowd") == 1
+
+@pytest.mark.parametrize("text, expected", [
+    ("15 minutes", 15),
+    ("1 hr", 60),
+    ("1 hour 30 minutes", 90),
+    ("1h30m", 90),
+    ("1.5 hours", 90),
+    ("10-15 min", 15),
+    ("1시간 20분", 80),
+    ("30 seconds", 1),
+    ("an hour", 60),
+    ("20", 20),
+    ("Overnight", None),
+    (None, None),
+])
+def test_parse_minutes(text, expected):
+    assert parse_minutes(text) == expected
+
+def test_recipe_minutes():
+    assert recipe_minutes("10 minutes", "1 hr") == (10, 60, 70)
+    assert recipe_minutes(None, "20 min") == (None, 20, 20)
+    assert recipe_minutes("N/A", None) == (None, None, None)
+
+def test_convert():
+    assert convert(3, "tsp", "tbsp") == pytest.approx(1, abs=0.01)
+    assert convert(1, "lb", "g") == 453.6
+    with pytest.raises(ValueError, match="Cannot convert"):
+        convert(1, "cup", "g")
+    with pytest.raises(ValueError, match="Unknown unit"):
+        convert(1, "cup", "bucket")
+
+@pytest.mark.parametrize("value, unit, expected", [
+    (1.5, "cup", "1 1/2"),
+    (0.333, "cup", "1/3"),
+    (2.0, None, "2"),
+    (1.1, "tsp", "1.1"),
+    (0.02, "tsp", "0.02"),
+    (412.6, "g", "413"),
+])
+def test_format_amount(value, unit, expected):
+    assert format_amount(value, unit) == expected
+
+def test_format_quantity_round_trips():
+    for text in ("1 1/2 cups", "2-3 cloves minced", "200 g", "to taste", "1 tbsp"):
+        assert format_quantity(*parse_quantity(text)) == text
+
+def test_scale_amounts():
+    amounts, maxes = scale_amounts([1.5, None, 2.0], [None, None, 3.0], 2)
+    assert amounts == [3.0, None, 4.0]
+    assert maxes == [None, None, 6.0]
@@ -1,7 +1,9 @@
 import pytest # type: ignore
 from dotenv import load_dotenv # type: ignore
 import os
-from youtube_parser.recipe_gen import RecipeGenerator
+import json
+from youtube_parser.recipe_gen import RecipeGenerator, SHORT_TRANSCRIPT_TOKENS, prompt_hash
+from youtube_parser.retry import Cancelled, Deadline
 from youtube_parser.type import Recipe, Ingredient, InstructionStep
 import openai # type: ignore
 from unittest.mock import patch, Mock
@@ -172,3 +174,167 @@ def test_recipe_missing_fields(recipe_generator):
     
     with pytest.raises(RuntimeError, match="Nutritional info not set in recipe"):
         recipe_generator.receive_nutritional_info()
+
+def test_prompts_loaded_once():
+    first = RecipeGenerator("test_key")
+    second = RecipeGenerator("test_key")
+    assert first.system_prompt is second.system_prompt
+    assert first.extraction_prompt_template is second.extraction_prompt_template
+
+@patch('openai.OpenAI')
+def test_openai_client_created_lazily(mock_openai):
+    recipe_generator = RecipeGenerator("test_key")
+    mock_openai.assert_not_called()
+
+    client = recipe_generator.openai
+    assert recipe_generator.openai is client
+    mock_openai.assert_called_once_with(api_key="test_key")
+
+def test_injected_client_is_used():
+    client = Mock()
+    recipe_generator = RecipeGenerator("test_key", client=client)
+    assert recipe_generator.openai is client
+
+def _completion(content):
+    return Mock(choices=[Mock(message=Mock(content=json.dumps(content)))], usage=None)
+
+def _recipe_json(title):
+    return {"title": title, "ingredients": [], "steps": [{"step_number": 1, "description": "Cook"}]}
+
+def _transcript(video_id, text="Boil pasta, add garlic."):
+    return str({"video_id": video_id, "title": video_id, "snippets": text})
+
+def test_short_transcripts_share_one_request():
+    client = Mock()
+    client.chat.completions.create.return_value = _completion({"recipes": [
+        {"video_id": "v2", **_recipe_json("Two")},
+        {"video_id": "v1", **_recipe_json("One")},
+    ]})
+    recipe_generator = RecipeGenerator("test_key", client=client)
+
+    recipes, errors = recipe_generator.generate_recipes_packed([_transcript("v1"), _transcript("v2")])
+
+    assert client.chat.completions.create.call_count == 1
+    assert errors == {}
+    assert recipes["v1"].title == "One"
+    assert recipes["v2"].video_id == "v2"
+
+def test_missing_or_invalid_packed_recipe_falls_back():
+    client = Mock()
+    client.chat.completions.create.side_effect = [
+        _completion({"recipes": [
+            {"video_id": "v1", **_recipe_json("One")},
+            {"video_id": "v2", "title": "No steps"},
+        ]}),
+        _completion(_recipe_json("Two")),
+        _completion(_recipe_json("Three")),
+    ]
+    recipe_generator = RecipeGenerator("test_key", client=client)
+
+    recipes, errors = recipe_generator.generate_recipes_packed([_transcript(v) for v in ("v1", "v2", "v3")])
+
+    assert client.chat.completions.create.call_count == 3
+    assert errors == {}
+    assert [recipes[v].title for v in ("v1", "v2", "v3")] == ["One", "Two", "Three"]
+
+def test_failed_pack_request_falls_back():
+    client = Mock()
+    client.chat.completions.create.side_effect = [
+        openai.APIError("API Error", Mock(), body=None),
+        _completion(_recipe_json("One")),
+        openai.APIError("API Error", Mock(), body=None),
+    ]
+    recipe_generator = RecipeGenerator("test_key", client=client)
+
+    recipes, errors = recipe_generator.generate_recipes_packed([_transcript("v1"), _transcript("v2")])
+
+    assert recipes["v1"].title == "One"
+    assert isinstance(errors["v2"], RuntimeError)
+
+def test_long_transcripts_and_budget_are_respected():
+    client = Mock()
+    client.chat.completions.create.return_value = _completion(_recipe_json("Single"))
+    recipe_generator = RecipeGenerator("test_key", client=client)
+    long_text = "word " * (SHORT_TRANSCRIPT_TOKENS * 2)
+    medium_text = "x" * 2000
+
+    recipes, errors = recipe_generator.generate_recipes_packed(
+        [_transcript("long", long_text), _transcript("a", medium_text), _transcript("b", medium_text)],
+        token_budget=600,
+    )
+
+    # The long transcript goes alone and the budget leaves one per pack
+    assert client.chat.completions.create.call_count == 3
+    for call in client.chat.completions.create.call_args_list:
+        assert "Video " not in call.kwargs["messages"][1]["content"]
+    assert set(recipes) == {"long", "a", "b"}
+
+def test_recipes_record_prompt_hash_and_model():
+    client = Mock()
+    client.chat.completions.create.return_value = _completion(_recipe_json("One"))
+    recipe_generator = RecipeGenerator("test_key", client=client, model="gpt-4o-mini")
+
+    recipe = recipe_generator.generate_recipe(_transcript("v1"))
+
+    assert client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o-mini"
+    assert (recipe.prompt_hash, recipe.model) == (recipe_generator.prompt_hash, "gpt-4o-mini")
+    assert recipe.prompt_hash == prompt_hash(
+        recipe_generator.system_prompt,
+        recipe_generator.extraction_prompt_template,
+        recipe_generator.batch_prompt_template,
+    )
+    assert prompt_hash("a", "bc") != prompt_hash("ab", "c")
+
+def test_generation_is_bounded_by_the_deadline():
+    client = Mock()
+    client.chat.completions.create.return_value = _completion(_recipe_json("One"))
+    recipe_generator = RecipeGenerator("test_key", client=client)
+
+    recipe_generator.generate_recipe(_transcript("v1"), Deadline(30))
+    assert 0 < client.chat.completions.create.call_args.kwargs["timeout"] <= 30
+
+    deadline = Deadline()
+    deadline.cancel()
+    with pytest.raises(Cancelled):
+        recipe_generator.generate_recipe(_transcript("v1"), deadline)
+    assert client.chat.completions.create.call_count == 1
+
+def test_cancelled_stream_is_closed():
+    deadline = Deadline()
+    chunks = [Mock(usage=None, choices=[Mock(delta=Mock(content='{"title": "One",'))])] * 3
+
+    def stream():
+        for chunk in chunks:
+            yield chunk
+            deadline.cancel()
+
+    completion = Mock(__iter__=lambda self: stream())
+    client = Mock()
+    client.chat.completions.create.return_value = completion
+    events = RecipeGenerator("test_key", client=client).stream_recipe(_transcript("v1"), deadline)
+
+    with pytest.raises(Cancelled):
+        list(events)
+    completion.close.assert_called_once_with()
+
+def test_stream_timing_excludes_slow_consumer(monkeypatch):
+    from youtube_parser import recipe_gen
+
+    clock = [0.0]
+    observed = []
+    monkeypatch.setattr(recipe_gen, "time", Mock(perf_counter=lambda: clock[0]))
+    monkeypatch.setattr(recipe_gen.STAGE_DURATION, "observe", lambda value, **labels: observed.append((value, labels)))
+    content = json.dumps(_recipe_json("One"))
+
+    def stream():
+        for start in range(0, len(content), 20):
+            clock[0] += 1  # waiting on OpenAI
+            yield Mock(usage=None, choices=[Mock(delta=Mock(content=content[start:start + 20]))])
+
+    client = Mock()
+    client.chat.completions.create.return_value = Mock(__iter__=lambda self: stream())
+    for event in RecipeGenerator("test_key", client=client).stream_recipe(_transcript("v1")):
+        clock[0] += 100  # a slow client reading the event
+
+    chunk_count = -(-len(content) // 20)
+    assert observed == [(chunk_count, {"stage": "llm_generation"})]
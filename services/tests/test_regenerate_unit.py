@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from youtube_parser import main
+from youtube_parser.regenerate import regenerate_stale, replace_recipe, stale_recipes
+from youtube_parser.retry import Deadline
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = main._init_sqlite(str(tmp_path / "recipes.db"))
+    yield conn
+    conn.close()
+
+
+def _store(conn, video_id, prompt_hash="new", model="gpt-5-nano"):
+    recipe_id = conn.execute(
+        "INSERT INTO recipes (title, video_id, prompt_hash, model) VALUES (?, ?, ?, ?)",
+        (f"Old {video_id}", video_id, prompt_hash, model),
+    ).lastrowid
+    conn.execute("INSERT INTO ingredients (recipe_id, name, quantity) VALUES (?, 'salt', '1 tsp')", (recipe_id,))
+    conn.execute("INSERT INTO steps (recipe_id, step_number, description) VALUES (?, 1, 'Old step')", (recipe_id,))
+    conn.commit()
+    return recipe_id
+
+
+def _recipe(video_id, title="New"):
+    return {
+        "title": title,
+        "video_id": video_id,
+        "servings": "2",
+        "prep_time": "10 minutes",
+        "cook_time": "5 minutes",
+        "ingredients": [{"name": "pasta", "quantity": "200 g"}, {"name": "garlic", "quantity": "2 cloves"}],
+        "steps": [{"step_number": 1, "description": "Boil"}],
+        "nutritional_info": {"calories": 500.0, "protein": 10.0, "carbs": 80.0, "fat": 5.0},
+        "prompt_hash": "new",
+        "model": "gpt-5-nano",
+    }
+
+
+def test_only_other_versions_are_stale(conn):
+    _store(conn, "current")
+    old_prompt = _store(conn, "old-prompt", prompt_hash="old")
+    old_model = _store(conn, "old-model", model="gpt-4o-mini")
+    unversioned = _store(conn, "unversioned", prompt_hash=None, model=None)
+
+    assert [row[0] for row in stale_recipes(conn, "new", "gpt-5-nano")] == [old_prompt, old_model, unversioned]
+    assert [row[1] for row in stale_recipes(conn, "new", "gpt-5-nano", limit=1)] == ["old-prompt"]
+
+
+def test_replace_keeps_id_and_swaps_children(conn):
+    recipe_id = _store(conn, "vid1", prompt_hash="old")
+
+    assert replace_recipe(conn, recipe_id, _recipe("vid1"))
+    assert not replace_recipe(conn, recipe_id + 1, _recipe("missing"))
+
+    row = conn.execute(
+        "SELECT title, total_minutes, calories, prompt_hash FROM recipes WHERE id = ?", (recipe_id,)
+    ).fetchone()
+    assert row == ("New", 15, 500.0, "new")
+    assert conn.execute("SELECT name, amount, unit FROM ingredients WHERE recipe_id = ?", (recipe_id,)).fetchall() == [
+        ("pasta", 200.0, "g"), ("garlic", 2.0, "clove"),
+    ]
+    assert conn.execute("SELECT description FROM steps WHERE recipe_id = ?", (recipe_id,)).fetchall() == [("Boil",)]
+
+
+def test_replace_waits_for_the_write_lock(conn):
+    recipe_id = _store(conn, "vid1", prompt_hash="old")
+    lock = threading.Lock()
+    lock.acquire()
+    replacer = threading.Thread(target=replace_recipe, args=(conn, recipe_id, _recipe("vid1"), lock))
+    replacer.start()
+
+    replacer.join(0.05)
+    assert replacer.is_alive()
+    assert conn.execute("SELECT title FROM recipes WHERE id = ?", (recipe_id,)).fetchone() == ("Old vid1",)
+
+    lock.release()
+    replacer.join(5)
+    assert conn.execute("SELECT title FROM recipes WHERE id = ?", (recipe_id,)).fetchone() == ("New",)
+
+
+def test_regenerate_stale_with_bounded_concurrency(conn):
+    ids = [_store(conn, f"vid{i}", prompt_hash="old") for i in range(6)]
+    _store(conn, "current")
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def generate(video_id, title):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        if video_id == "vid3":
+            raise RuntimeError("no transcript")
+        return _recipe(video_id, title=f"New {video_id}")
+
+    replaced = []
+    counts = regenerate_stale(conn, generate, "new", "gpt-5-nano", concurrency=2, on_replaced=replaced.append)
+
+    assert counts == {"stale": 6, "regenerated": 5, "failed": 1, "skipped": 0}
+    assert peak[0] == 2
+    assert sorted(replaced) == [recipe_id for recipe_id in ids if recipe_id != ids[3]]
+    # The failed video keeps its old recipe and is picked up by the next run
+    assert [row[1] for row in stale_recipes(conn, "new", "gpt-5-nano")] == ["vid3"]
+    assert conn.execute("SELECT title FROM recipes WHERE id = ?", (ids[3],)).fetchone() == ("Old vid3",)
+
+
+def test_regenerate_stops_at_deadline(conn):
+    for i in range(3):
+        _store(conn, f"vid{i}", prompt_hash="old")
+    deadline = Deadline()
+
+    def generate(video_id, title):
+        deadline.cancel()
+        return _recipe(video_id)
+
+    counts = regenerate_stale(conn, generate, "new", "gpt-5-nano", concurrency=1, deadline=deadline)
+
+    assert counts == {"stale": 3, "regenerated": 1, "failed": 0, "skipped": 2}
@@ -0,0 +1,137 @@
+import random
+import threading
+import time
+import pytest # type: ignore
+import requests # type: ignore
+from unittest.mock import Mock, patch
+from xml.etree.ElementTree import ParseError
+from youtube_transcript_api import TranscriptsDisabled # type: ignore
+from youtube_parser.retry import (
+    PERMANENT,
+    TRANSIENT,
+    Cancelled,
+    Deadline,
+    DeadlineExceeded,
+    RetryPolicy,
+    classify_error,
+)
+from youtube_parser.yt_scrape import YouTubeScraper
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+@pytest.fixture
+def sleeps():
+    return []
+
+@pytest.fixture
+def policy(sleeps):
+    return RetryPolicy(max_attempts=4, base_delay=0.5, max_delay=8.0, sleep=sleeps.append, rng=random.Random(0))
+
+def test_classify_error():
+    assert classify_error(TranscriptsDisabled("video1")) == PERMANENT
+    assert classify_error(_http_error(404)) == PERMANENT
+    assert classify_error(_http_error(429)) == TRANSIENT
+    assert classify_error(_http_error(503)) == TRANSIENT
+    assert classify_error(ParseError("truncated")) == TRANSIENT
+    assert classify_error(requests.ConnectionError()) == TRANSIENT
+    assert classify_error(Exception("unknown")) == TRANSIENT
+
+def test_permanent_error_fails_fast(policy, sleeps):
+    fn = Mock(side_effect=TranscriptsDisabled("video1"))
+
+    with pytest.raises(TranscriptsDisabled):
+        policy.call(fn)
+
+    assert fn.call_count == 1
+    assert sleeps == []
+
+def test_transient_error_retried_with_backoff(policy, sleeps):
+    fn = Mock(side_effect=[ParseError("truncated"), requests.Timeout(), "ok"])
+    retries = []
+
+    assert policy.call(fn, on_retry=lambda attempt, exc, delay: retries.append(attempt)) == "ok"
+
+    assert fn.call_count == 3
+    assert retries == [1, 2]
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5
+    assert 0 <= sleeps[1] <= 1.0
+
+def test_gives_up_after_max_attempts(policy, sleeps):
+    fn = Mock(side_effect=requests.ConnectionError())
+
+    with pytest.raises(requests.ConnectionError):
+        policy.call(fn)
+
+    assert fn.call_count == 4
+    assert len(sleeps) == 3
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0, rng=random.Random(0))
+    assert all(policy.backoff(attempt) <= 3.0 for attempt in range(1, 20))
+
+def test_expired_deadline_stops_before_attempt(policy):
+    deadline = Deadline(0)
+    fn = Mock(return_value="ok")
+
+    with pytest.raises(DeadlineExceeded):
+        policy.call(fn, deadline=deadline)
+
+    fn.assert_not_called()
+
+def test_does_not_sleep_past_deadline(sleeps):
+    policy = RetryPolicy(base_delay=10.0, max_delay=10.0, sleep=sleeps.append, rng=Mock(uniform=Mock(return_value=10.0)))
+    fn = Mock(side_effect=requests.Timeout())
+
+    with pytest.raises(requests.Timeout):
+        policy.call(fn, deadline=Deadline(5))
+
+    assert fn.call_count == 1
+    assert sleeps == []
+
+def test_deadline_without_limit_never_expires():
+    deadline = Deadline()
+    assert not deadline.expired()
+    assert deadline.remaining() is None
+    assert deadline.timeout(10) == 10
+
+def test_cancelled_deadline_expires():
+    deadline = Deadline(60)
+    assert deadline.timeout(10) == 10
+    assert deadline.timeout() <= 60
+
+    deadline.cancel()
+
+    assert deadline.expired()
+    assert deadline.remaining() == 0
+    with pytest.raises(Cancelled):
+        deadline.check()
+    with pytest.raises(Cancelled):
+        deadline.timeout(10)
+
+def test_cancel_cuts_backoff_short():
+    deadline = Deadline()
+    policy = RetryPolicy(base_delay=30.0, max_delay=30.0, rng=Mock(uniform=Mock(return_value=30.0)))
+    fn = Mock(side_effect=[requests.Timeout(), "unreachable"])
+    threading.Timer(0.05, deadline.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(Cancelled):
+        policy.call(fn, deadline=deadline)
+
+    assert time.monotonic() - started < 5
+    assert fn.call_count == 1
+
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_process_video_disabled_transcript_single_attempt(mock_get_transcript, policy):
+    mock_get_transcript.side_effect = TranscriptsDisabled("video1")
+    scraper = YouTubeScraper("fake_api_key", retry_policy=policy)
+
+    result = scraper.process_video("video1", "Title 1")
+
+    assert mock_get_transcript.call_count == 1
+    assert result["error"] == "Failed to fetch transcript"
+    assert result["reason"] == "TranscriptsDisabled"
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from youtube_parser.retry import Cancelled, Deadline, DeadlineExceeded
+from youtube_parser.scheduler import BULK, INTERACTIVE, FairScheduler
+
+
+def _hold(scheduler, user, lane, started, release):
+    def run():
+        with scheduler.slot(user, lane):
+            started.append(user)
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition never became true")
+
+
+def _run_queued(scheduler, jobs):
+    """Queue `jobs` behind a held slot, then release it and record the grant order."""
+    order, release = [], threading.Event()
+    blocker = _hold(scheduler, "blocker", INTERACTIVE, [], release)
+    _wait_for(lambda: scheduler.snapshot()["lanes"][INTERACTIVE]["running"] == 1)
+
+    def run(user, lane):
+        with scheduler.slot(user, lane):
+            order.append(user)
+
+    threads = []
+    for user, lane in jobs:
+        thread = threading.Thread(target=run, args=(user, lane))
+        thread.start()
+        threads.append(thread)
+        waiting = len(threads)
+        _wait_for(lambda: sum(lane["waiting"] for lane in scheduler.snapshot()["lanes"].values()) == waiting)
+
+    release.set()
+    for thread in [blocker, *threads]:
+        thread.join(5)
+    return order
+
+
+def test_interactive_runs_before_queued_bulk():
+    scheduler = FairScheduler(slots=1, per_user=1, reserved=0)
+
+    order = _run_queued(scheduler, [("bulk", BULK), ("bulk", BULK), ("alice", INTERACTIVE)])
+
+    assert order == ["alice", "bulk", "bulk"]
+
+
+def test_users_alternate_within_a_lane():
+    scheduler = FairScheduler(slots=1, per_user=1, reserved=0)
+
+    order = _run_queued(scheduler, [("big", BULK)] * 3 + [("small", BULK)])
+
+    assert order[:2] == ["big", "small"]
+
+
+def test_bulk_never_takes_reserved_slots():
+    scheduler = FairScheduler(slots=2, per_user=2, reserved=1)
+    started, release = [], threading.Event()
+    threads = [_hold(scheduler, "importer", BULK, started, release) for _ in range(2)]
+    _wait_for(lambda: started == ["importer"])
+
+    # The reserved slot is still free for interactive work
+    with scheduler.slot("alice", INTERACTIVE, deadline=Deadline(1)):
+        assert scheduler.snapshot()["lanes"] == {
+            INTERACTIVE: {"running": 1, "waiting": 0},
+            BULK: {"running": 1, "waiting": 1},
+        }
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert started == ["importer", "importer"]
+
+
+def test_per_user_cap():
+    scheduler = FairScheduler(slots=4, per_user=1, reserved=0)
+    started, release = [], threading.Event()
+    first = _hold(scheduler, "alice", BULK, started, release)
+    _wait_for(lambda: started == ["alice"])
+
+    with pytest.raises(DeadlineExceeded):
+        with scheduler.slot("alice", BULK, deadline=Deadline(0.05)):
+            pass
+    with scheduler.slot("bob", BULK, deadline=Deadline(1)):
+        pass
+
+    release.set()
+    first.join(5)
+    assert scheduler.snapshot()["lanes"][BULK] == {"running": 0, "waiting": 0}
+
+
+def test_cancel_stops_waiting():
+    scheduler = FairScheduler(slots=1, per_user=1, reserved=0)
+    started, release = [], threading.Event()
+    holder = _hold(scheduler, "alice", BULK, started, release)
+    _wait_for(lambda: started == ["alice"])
+    deadline = Deadline()
+    threading.Timer(0.05, deadline.cancel).start()
+
+    with pytest.raises(Cancelled):
+        with scheduler.slot("bob", BULK, deadline=deadline):
+            pass
+
+    assert scheduler.snapshot()["lanes"][BULK]["waiting"] == 0
+    release.set()
+    holder.join(5)
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        FairScheduler(slots=2, reserved=2)
+    with pytest.raises(ValueError):
+        with FairScheduler().slot("alice", "batch"):
+            pass
@@ -1,11 +1,14 @@
 import pytest # type: ignore
 from unittest.mock import Mock, patch
-from youtube_parser.yt_scrape import YouTubeScraper
+from youtube_transcript_api import NoTranscriptFound # type: ignore
+from youtube_parser.cache import TTLCache
+from youtube_parser.yt_scrape import YouTubeScraper, select_track
+from youtube_parser.retry import RetryPolicy
 from youtube_parser.type import FetchedTranscript, FetchedTranscriptSnippet
 
 @pytest.fixture
 def youtube_scraper():
-    return YouTubeScraper("fake_api_key")
+    return YouTubeScraper("fake_api_key", retry_policy=RetryPolicy(sleep=lambda _: None))
 
 @pytest.fixture
 def mock_transcript():
@@ -30,7 +33,9 @@ def test_init():
 
 @patch('youtube_parser.yt_scrape.YouTubeTranscriptApi')
 def test_get_transcript(mock_ytt_api, youtube_scraper, mock_transcript):
-    mock_ytt_api.return_value.fetch.return_value = mock_transcript
+    track = Mock(language_code="en", is_generated=False)
+    track.fetch.return_value = mock_transcript
+    mock_ytt_api.return_value.list.return_value = [track]
     
     transcript = youtube_scraper.get_transcript("test_video_id")
     
@@ -145,6 +150,43 @@ def test_fetch_video_by_id(mock_get, youtube_scraper):
     assert results[0] == ("video1", "Title 1")
     mock_get.assert_called_once()
 
+@patch('youtube_parser.yt_scrape.requests.get')
+def test_search_pages_until_max_results(mock_get):
+    def page(ids, token=None):
+        response = Mock()
+        response.json.return_value = {
+            "items": [{"id": {"videoId": vid}, "snippet": {"title": vid}} for vid in ids],
+            **({"nextPageToken": token} if token else {}),
+        }
+        return response
+    mock_get.side_effect = [page([f"a{i}" for i in range(50)], "p2"), page(["b1", "b2", "b3"], "p3")]
+    scraper = YouTubeScraper("fake_api_key", max_results=52)
+
+    results = scraper.fetch_videos_by_query("pasta")
+
+    assert [vid for vid, _ in results][-2:] == ["b1", "b2"] and len(results) == 52
+    second = mock_get.call_args_list[1].kwargs["params"]
+    assert (second["pageToken"], second["maxResults"]) == ("p2", 2)
+
+@patch.object(YouTubeScraper, 'process_video')
+@patch.object(YouTubeScraper, 'iter_video_pages')
+def test_iter_videos_fetches_lazily(mock_pages, mock_process, youtube_scraper):
+    requested = []
+
+    def pages(type, arg):
+        for number in (1, 2):
+            requested.append(number)
+            yield [(f"v{number}", f"Title {number}")]
+    mock_pages.side_effect = pages
+    mock_process.side_effect = lambda video_id, title, deadline: {"video_id": video_id}
+
+    videos = youtube_scraper.iter_videos(type="channel_id", arg="UCchannel")
+
+    assert next(videos) == {"video_id": "v1"}
+    assert requested == [1] and mock_process.call_count == 1
+    assert list(videos) == [{"video_id": "v2"}]
+    assert requested == [1, 2]
+
 def test_process_videos_invalid_type(youtube_scraper):
     with pytest.raises(ValueError, match="Invalid type: invalid"):
         youtube_scraper.process_videos(type="invalid", arg="test")
@@ -205,7 +247,7 @@ def test_process_videos_all_retries_fail(mock_get_transcript, mock_fetch_video,
 def test_process_videos_with_retries(mock_ytt_api, youtube_scraper):
     # Mock get_transcript to fail 2 times then succeed
     fail_count = [0]
-    def mock_get_transcript(video_id):
+    def mock_get_transcript(video_id, deadline=None):
         if fail_count[0] < 2:
             fail_count[0] += 1
             raise Exception("Test error")
@@ -227,7 +269,7 @@ def test_process_videos_with_retries(mock_ytt_api, youtube_scraper):
 @patch('youtube_parser.yt_scrape.YouTubeTranscriptApi')
 def test_process_videos_max_retries_failure(mock_ytt_api, youtube_scraper):
     # Mock get_transcript to always fail
-    def mock_get_transcript(video_id):
+    def mock_get_transcript(video_id, deadline=None):
         raise Exception("Test error")
     
     youtube_scraper.get_transcript = mock_get_transcript
@@ -236,3 +278,75 @@ def test_process_videos_max_retries_failure(mock_ytt_api, youtube_scraper):
     # Process videos - should handle max retries gracefully
     results = youtube_scraper.process_videos(type="id", arg="test_id")
     assert len(results) == 0  # No results due to failure
+
+def _track(language_code, is_generated=False, translatable_to=()):
+    track = Mock(language_code=language_code, is_generated=is_generated, is_translatable=bool(translatable_to))
+    track.translation_languages = [Mock(language_code=code) for code in translatable_to]
+    return track
+
+def test_select_track_prefers_manual_then_fallback_then_translation():
+    manual_en, generated_en = _track("en"), _track("en", is_generated=True)
+    generated_ko = _track("ko", is_generated=True, translatable_to=["en"])
+    manual_ja = _track("ja", translatable_to=["en"])
+
+    assert select_track([generated_en, manual_en], "en") == (manual_en, None)
+    assert select_track([generated_ko, generated_en], "en") == (generated_en, None)
+    assert select_track([manual_ja, generated_ko], "en", ["ko"]) == (generated_ko, None)
+    assert select_track([generated_ko, manual_ja], "en") == (manual_ja, "en")
+    with pytest.raises(LookupError):
+        select_track([_track("ja")], "en")
+
+def test_get_transcript_lists_once_and_translates(mock_transcript):
+    track = _track("ko", translatable_to=["en"])
+    track.translate.return_value.fetch.return_value = mock_transcript
+    ytt_api = Mock()
+    ytt_api.list.return_value = [track]
+    scraper = YouTubeScraper("fake_api_key", transcript_api=ytt_api)
+
+    assert scraper.get_transcript("video1") is mock_transcript
+
+    ytt_api.list.assert_called_once_with("video1")
+    ytt_api.fetch.assert_not_called()
+    track.translate.assert_called_once_with("en")
+
+def test_get_transcript_without_track_is_permanent():
+    ytt_api = Mock()
+    ytt_api.list.return_value = [_track("ja")]
+    scraper = YouTubeScraper("fake_api_key", transcript_api=ytt_api)
+
+    with pytest.raises(NoTranscriptFound):
+        scraper.get_transcript("video1")
+
+def test_get_transcript_reuses_cached_choice(tmp_path, mock_transcript):
+    cache = TTLCache(str(tmp_path / "cache.db"))
+    track = _track("en", is_generated=True)
+    track.fetch.return_value = mock_transcript
+    ytt_api = Mock()
+    ytt_api.list.return_value = [track]
+    ytt_api.fetch.return_value = mock_transcript
+    scraper = YouTubeScraper("fake_api_key", transcript_api=ytt_api, cache=cache)
+
+    scraper.get_transcript("video1")
+    scraper.get_transcript("video1")
+
+    assert ytt_api.list.call_count == 1
+    ytt_api.fetch.assert_called_once_with("video1", languages=["en"])
+    cache.close()
+
+def test_cached_choice_is_per_fallback_languages(tmp_path, mock_transcript):
+    cache = TTLCache(str(tmp_path / "cache.db"))
+    track = _track("ko", is_generated=True, translatable_to=["en"])
+    track.fetch.return_value = mock_transcript
+    track.translate.return_value.fetch.return_value = mock_transcript
+    ytt_api = Mock()
+    ytt_api.list.return_value = [track]
+    with_fallback = YouTubeScraper("fake_api_key", transcript_api=ytt_api, cache=cache, fallback_languages=["ko"])
+    english_only = YouTubeScraper("fake_api_key", transcript_api=ytt_api, cache=cache)
+
+    with_fallback.get_transcript("video1")
+    english_only.get_transcript("video1")
+
+    # The Korean track accepted as a fallback is not reused untranslated without it
+    assert ytt_api.list.call_count == 2
+    track.translate.assert_called_once_with("en")
+    cache.close()
@@ -0,0 +1,54 @@
+import json
+import pytest # type: ignore
+from youtube_parser.stream_json import IncrementalRecipeParser
+
+RECIPE = {
+    "title": 'Garlic "Pasta"',
+    "ingredients": [
+        {"name": "spaghetti", "quantity": "200 g"},
+        {"name": "chili {flakes}", "quantity": "1, to taste"},
+    ],
+    "steps": [
+        {"step_number": 1, "description": "Boil: salted [well]."},
+        {"step_number": 2, "description": "Toss with garlic\\noil."},
+    ],
+    "servings": "2",
+    "nutritional_info": {"calories": 550.0, "protein": 14.0},
+}
+
+def _feed_in_chunks(text, size):
+    parser = IncrementalRecipeParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return parser, events
+
+@pytest.mark.parametrize("size", [1, 3, 64, 10_000])
+def test_events_regardless_of_chunking(size):
+    text = json.dumps(RECIPE, indent=2)
+    parser, events = _feed_in_chunks(text, size)
+
+    assert events == [
+        {"event": "field", "name": "title", "value": 'Garlic "Pasta"'},
+        {"event": "ingredient", "value": RECIPE["ingredients"][0]},
+        {"event": "ingredient", "value": RECIPE["ingredients"][1]},
+        {"event": "step", "value": RECIPE["steps"][0]},
+        {"event": "step", "value": RECIPE["steps"][1]},
+        {"event": "field", "name": "servings", "value": "2"},
+        {"event": "field", "name": "nutritional_info", "value": RECIPE["nutritional_info"]},
+    ]
+    assert parser.buffer == text
+
+def test_step_emitted_before_stream_ends():
+    parser = IncrementalRecipeParser()
+    assert parser.feed('{"title": "Soup", "steps": [{"step_number": 1, "descr') == [
+        {"event": "field", "name": "title", "value": "Soup"},
+    ]
+    assert parser.feed('iption": "Boil."}, {"step') == [
+        {"event": "step", "value": {"step_number": 1, "description": "Boil."}},
+    ]
+
+def test_nested_keys_are_not_reported_as_fields():
+    parser = IncrementalRecipeParser()
+    events = parser.feed('{"ingredients": [{"name": "x", "title": "not a title"}]}')
+    assert events == [{"event": "ingredient", "value": {"name": "x", "title": "not a title"}}]
@@ -0,0 +1,119 @@
+import json
+import pytest # type: ignore
+from unittest.mock import Mock, patch
+from youtube_parser import tracing
+from youtube_parser.recipe_gen import RecipeGenerator
+from youtube_parser.type import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_parser.yt_scrape import YouTubeScraper
+from youtube_parser.retry import RetryPolicy
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+    def export(self, span):
+        self.spans.append(span.to_dict())
+    def shutdown(self):
+        pass
+
+@pytest.fixture
+def exporter():
+    exporter = ListExporter()
+    tracing.tracer.exporters = [exporter]
+    yield exporter
+    tracing.tracer.exporters = []
+
+def test_nested_spans_share_trace(exporter):
+    with tracing.start_span("parent", video_id="v1") as parent:
+        with tracing.start_span("child") as child:
+            child.set_attribute("attempt", 1)
+
+    child_dict, parent_dict = exporter.spans
+    assert child_dict["parent_id"] == parent.span_id
+    assert child_dict["trace_id"] == parent_dict["trace_id"]
+    assert parent_dict["parent_id"] is None
+    assert parent_dict["attributes"] == {"video_id": "v1"}
+    assert tracing.current_span() is None
+
+def test_exception_recorded(exporter):
+    with pytest.raises(ValueError):
+        with tracing.start_span("failing"):
+            raise ValueError("boom")
+
+    span = exporter.spans[0]
+    assert span["status"] == "error"
+    assert span["attributes"]["error.type"] == "ValueError"
+
+def test_jsonl_exporter(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.tracer.configure(export_path=str(path))
+    try:
+        with tracing.start_span("one"):
+            pass
+    finally:
+        tracing.tracer.shutdown()
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[0])["name"] == "one"
+
+@patch.object(YouTubeScraper, 'fetch_video_by_id')
+@patch.object(YouTubeScraper, 'get_transcript')
+def test_process_videos_spans(mock_get_transcript, mock_fetch_video, exporter):
+    mock_fetch_video.return_value = [("video1", "Title 1")]
+    mock_get_transcript.side_effect = [Exception("First try"),
+        FetchedTranscript(
+            snippets=[FetchedTranscriptSnippet(text="Test", start=0.0, duration=1.0)],
+            video_id="video1",
+            language_code="en",
+            is_generated=False
+        )
+    ]
+
+    YouTubeScraper("fake_api_key", retry_policy=RetryPolicy(sleep=lambda _: None)).process_videos(type="id", arg="video1")
+
+    by_name = {}
+    for span in exporter.spans:
+        by_name.setdefault(span["name"], []).append(span)
+    attempts = by_name["get_transcript"]
+    assert [s["attributes"]["attempt"] for s in attempts] == [1, 2]
+    assert attempts[0]["status"] == "error"
+    video = by_name["video"][0]
+    assert video["attributes"]["video_id"] == "video1"
+    assert video["attributes"]["attempts"] == 2
+    assert attempts[0]["parent_id"] == video["span_id"]
+
+def test_generate_recipe_span_records_tokens(exporter):
+    client = Mock()
+    response = Mock()
+    response.choices = [Mock(message=Mock(content=json.dumps({
+        "title": "Toast",
+        "ingredients": [{"name": "bread", "quantity": "1 slice"}],
+        "steps": [{"step_number": 1, "description": "Toast the bread."}],
+    })))]
+    response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+    client.chat.completions.create.return_value = response
+
+    RecipeGenerator("test_key", client=client).generate_recipe(str({"video_id": "v1", "snippets": "toast"}))
+
+    span = exporter.spans[-1]
+    assert span["name"] == "generate_recipe"
+    assert span["attributes"]["video_id"] == "v1"
+    assert span["attributes"]["total_tokens"] == 15
+
+def test_bind_context_keeps_spans_across_threads(exporter):
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    def steps():
+        with tracing.start_span("stream"):
+            yield 1
+            with tracing.start_span("chunk"):
+                yield 2
+
+    iterator = tracing.bind_context(steps())
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # Each step runs on a fresh context, as in a server's threadpool
+        results = [pool.submit(contextvars.Context().run, next, iterator, None).result() for _ in range(3)]
+
+    assert results == [1, 2, None]
+    by_name = {s["name"]: s for s in exporter.spans}
+    assert by_name["chunk"]["parent_id"] == by_name["stream"]["span_id"]
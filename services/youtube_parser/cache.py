@@ -0,0 +1,95 @@
+"""
+Persistent key/value cache with per-entry expiry, backed by SQLite.
+
+Entries live in a single table keyed by (namespace, key), so unrelated
+caches (failed transcripts, channel handles, ...) can share one file.
+Values are stored as JSON.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .metrics import record_cache_lookup
+
+
+class TTLCache:
+    """
+    SQLite-backed cache whose entries expire after a per-entry TTL.
+
+    Args:
+        path: SQLite database file (":memory:" for a process-local cache)
+        clock: Time source in epoch seconds (injectable for tests)
+    """
+
+    def __init__(self, path: str = ":memory:", clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Return the cached value, or None when missing or expired.
+
+        Every lookup is counted in the cache hit/miss metric under `namespace`.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        hit = row is not None and (row[1] is None or row[1] > self.clock())
+        record_cache_lookup(namespace, hit)
+        return json.loads(row[0]) if hit else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` under (namespace, key).
+
+        Args:
+            namespace: Cache name
+            key: Entry key
+            value: JSON-serializable value
+            ttl: Seconds until the entry expires; None keeps it forever
+        """
+        expires_at = None if ttl is None else self.clock() + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (self.clock(),),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,171 @@
+"""
+In-memory columnar catalog of recipe summaries for list and filter queries.
+
+Summary fields are kept in parallel columns: ids, macros and total time
+in typed arrays (NaN for a missing value), strings in lists of interned values so
+repeated ones ("10 minutes", "2") are stored once. Queries scan the
+columns and only build dicts for the page being returned.
+"""
+
+import math
+import sys
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MACROS = ("calories", "protein", "carbs", "fat")
+# Numeric fields that range filters apply to
+RANGE_FIELDS = (*MACROS, "total_minutes")
+SUMMARY_FIELDS = ("id", "title", "video_id", "servings", "prep_time", "cook_time", *RANGE_FIELDS)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Estimated fixed cost of one record: array slots, list pointers and the id index entry
+RECORD_BYTES = 200
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class RecipeCatalog:
+    """
+    Recipe summaries in columns, bounded by an approximate memory budget.
+
+    When adding a record would exceed `max_bytes` the catalog empties
+    itself and reports `complete == False`; callers then fall back to the
+    database until the next successful load.
+
+    Args:
+        max_bytes: Memory budget for records and unique strings
+    """
+
+    __slots__ = (
+        "max_bytes", "nbytes", "complete", "_lock", "_strings", "_positions",
+        "_ids", "_titles", "_folded_titles", "_video_ids", "_servings", "_prep_times", "_cook_times", "_numbers",
+    )
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.nbytes = 0
+        self.complete = True
+        self._strings: Dict[str, str] = {}
+        self._positions: Dict[int, int] = {}
+        self._ids = array("q")
+        self._titles: List[Optional[str]] = []
+        self._folded_titles: List[str] = []
+        self._video_ids: List[Optional[str]] = []
+        self._servings: List[Optional[str]] = []
+        self._prep_times: List[Optional[str]] = []
+        self._cook_times: List[Optional[str]] = []
+        self._numbers = {field: array("d") for field in RANGE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _intern(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        interned = self._strings.get(value)
+        if interned is None:
+            interned = self._strings[value] = sys.intern(value)
+            self.nbytes += sys.getsizeof(value)
+        return interned
+
+    def load(self, rows: Iterable[Sequence[Any]]) -> bool:
+        """
+        Replace the catalog with `rows` (SUMMARY_FIELDS order, oldest first).
+
+        Returns:
+            Whether everything fit in the memory budget
+        """
+        with self._lock:
+            self._clear()
+            for row in rows:
+                if not self._append(row):
+                    return False
+            return True
+
+    def add(self, row: Sequence[Any]) -> bool:
+        """Add or replace one recipe; returns False if the catalog is (now) incomplete."""
+        with self._lock:
+            if not self.complete:
+                return False
+            return self._append(row)
+
+    def _append(self, row: Sequence[Any]) -> bool:
+        recipe_id, title, video_id, servings, prep_time, cook_time, *numbers = row
+        if recipe_id in self._positions:
+            position = self._positions[recipe_id]
+        else:
+            self.nbytes += RECORD_BYTES
+            if self.nbytes > self.max_bytes:
+                self._clear()
+                self.complete = False
+                return False
+            position = len(self._ids)
+            self._positions[recipe_id] = position
+            self._ids.append(recipe_id)
+            for column in (self._titles, self._folded_titles, self._video_ids, self._servings,
+                           self._prep_times, self._cook_times):
+                column.append(None)
+            for field in RANGE_FIELDS:
+                self._numbers[field].append(math.nan)
+
+        self._titles[position] = self._intern(title)
+        self._folded_titles[position] = self._intern((title or "").casefold())
+        self._video_ids[position] = self._intern(video_id)
+        self._servings[position] = self._intern(servings)
+        self._prep_times[position] = self._intern(prep_time)
+        self._cook_times[position] = self._intern(cook_time)
+        for field, value in zip(RANGE_FIELDS, numbers):
+            self._numbers[field][position] = math.nan if value is None else value
+        return True
+
+    def _summary(self, position: int) -> Dict[str, Any]:
+        summary = {
+            "id": self._ids[position],
+            "title": self._titles[position],
+            "video_id": self._video_ids[position],
+            "servings": self._servings[position],
+            "prep_time": self._prep_times[position],
+            "cook_time": self._cook_times[position],
+        }
+        for field in RANGE_FIELDS:
+            value = self._numbers[field][position]
+            summary[field] = None if math.isnan(value) else value if field in MACROS else int(value)
+        return summary
+
+    def query(
+        self,
+        text: Optional[str] = None,
+        ranges: Optional[Dict[str, Range]] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Filter and page the catalog, newest first.
+
+        Args:
+            text: Case-insensitive substring of the title
+            ranges: (min, max) bounds by RANGE_FIELDS name, either side
+                optional; recipes missing a bounded field never match
+            offset: Matches to skip
+            limit: Maximum summaries returned
+
+        Returns:
+            (total matches, summaries of the requested page)
+        """
+        folded = text.casefold() if text else None
+        bounds = [
+            (self._numbers[field], -math.inf if low is None else low, math.inf if high is None else high)
+            for field, (low, high) in (ranges or {}).items()
+        ]
+        with self._lock:
+            matches = [
+                position
+                for position in range(len(self._ids) - 1, -1, -1)
+                if (folded is None or folded in self._folded_titles[position])
+                and all(low <= column[position] <= high for column, low, high in bounds)
+            ]
+            return len(matches), [self._summary(position) for position in matches[offset:offset + limit]]
@@ -0,0 +1,143 @@
+"""
+Per-channel sync state for incremental channel scraping.
+
+For every consumer of a synced channel we keep a watermark (the newest
+upload known to be handled, by video ID and publish time) and the set of
+processed video IDs. An incremental sync only lists uploads at or after the
+watermark and skips the ones already processed. State is kept per consumer
+(a caller or the background sync) so one consumer's run doesn't hide new
+uploads from the others.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ChannelSyncStore:
+    """
+    SQLite-backed sync state, one row per (consumer, channel) plus its processed videos.
+
+    Args:
+        path: SQLite database file (":memory:" for a process-local store)
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS channel_sync_state (
+                consumer TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                last_video_id TEXT,
+                last_published_at TEXT,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (consumer, channel_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS channel_sync_videos (
+                consumer TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                PRIMARY KEY (consumer, channel_id, video_id)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_state(self, consumer: str, channel_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the consumer's watermark for a channel, or None if it never synced it.
+
+        Returns:
+            Dict with last_video_id, last_published_at and synced_at
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_video_id, last_published_at, synced_at FROM channel_sync_state"
+                " WHERE consumer = ? AND channel_id = ?",
+                (consumer, channel_id),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def processed_ids(self, consumer: str, channel_id: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id FROM channel_sync_videos WHERE consumer = ? AND channel_id = ?",
+                (consumer, channel_id),
+            ).fetchall()
+        return {row["video_id"] for row in rows}
+
+    def record_sync(
+        self,
+        consumer: str,
+        channel_id: str,
+        listed: List[Tuple[str, str, str]],
+        processed: Iterable[str],
+    ) -> None:
+        """
+        Save the outcome of a sync run.
+
+        The watermark moves to the newest listed upload when every listed
+        video was processed. Otherwise it stays at the oldest unprocessed
+        one, so the next run lists it again (processed videos are still
+        skipped through the processed set).
+
+        Args:
+            consumer: Who the sync ran for (a scheduling key or the background sync)
+            channel_id: YouTube channel ID
+            listed: (video_id, title, published_at) tuples listed this run
+            processed: IDs of the videos that are done for good
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO channel_sync_videos (consumer, channel_id, video_id) VALUES (?, ?, ?)",
+                [(consumer, channel_id, video_id) for video_id in processed],
+            )
+            done = {
+                row["video_id"]
+                for row in self._conn.execute(
+                    "SELECT video_id FROM channel_sync_videos WHERE consumer = ? AND channel_id = ?",
+                    (consumer, channel_id),
+                )
+            }
+            pending = [(published_at, video_id) for video_id, _, published_at in listed if video_id not in done]
+            if pending:
+                mark: Optional[Tuple[str, str]] = min(pending)
+            elif listed:
+                mark = max((published_at, video_id) for video_id, _, published_at in listed)
+            else:
+                mark = None
+
+            row = self._conn.execute(
+                "SELECT last_video_id, last_published_at FROM channel_sync_state"
+                " WHERE consumer = ? AND channel_id = ?",
+                (consumer, channel_id),
+            ).fetchone()
+            watermark = (row["last_published_at"], row["last_video_id"]) if row else None
+            if mark is not None and (watermark is None or watermark[0] is None or mark[0] >= watermark[0]):
+                watermark = mark
+
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO channel_sync_state
+                    (consumer, channel_id, last_video_id, last_published_at, synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    consumer,
+                    channel_id,
+                    watermark[1] if watermark else None,
+                    watermark[0] if watermark else None,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
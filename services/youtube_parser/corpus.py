@@ -0,0 +1,453 @@
+"""
+Streaming export and import of the recipe corpus (JSONL and Parquet).
+
+Recipes are read from a backend in id order, one batch at a time (keyset
+pagination), and written out as one record per recipe with its
+ingredients and steps nested. Import reads such files record by record
+and writes them in batches, one transaction per batch in SQLite, saving
+how far it got so an interrupted import resumes where it stopped.
+
+Parquet needs the optional pyarrow package. Run as a CLI:
+
+    python -m youtube_parser.corpus export recipes.jsonl --db recipes.db
+    python -m youtube_parser.corpus import recipes.parquet --supabase
+"""
+
+import argparse
+import io
+import json
+import os
+import sqlite3
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .quantity import parse_quantity, recipe_minutes
+
+DEFAULT_BATCH_SIZE = 500
+RECIPE_FIELDS = ("id", "title", "video_id", "servings", "prep_time", "cook_time", "calories", "protein", "carbs", "fat")
+
+Record = Dict[str, Any]
+
+
+def load_pyarrow() -> Any:
+    """
+    Import pyarrow and pyarrow.parquet on demand.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore
+    except ImportError:
+        raise RuntimeError("Parquet support requires the pyarrow package")
+    return pyarrow
+
+
+def _parquet_schema(pa: Any) -> Any:
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("title", pa.string()),
+            ("video_id", pa.string()),
+            ("servings", pa.string()),
+            ("prep_time", pa.string()),
+            ("cook_time", pa.string()),
+            ("calories", pa.float64()),
+            ("protein", pa.float64()),
+            ("carbs", pa.float64()),
+            ("fat", pa.float64()),
+            ("ingredients", pa.list_(pa.struct([("name", pa.string()), ("quantity", pa.string())]))),
+            ("steps", pa.list_(pa.struct([("step_number", pa.int64()), ("description", pa.string())]))),
+        ]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Reading from a backend
+
+
+def iter_recipes_sqlite(
+    conn: sqlite3.Connection, after_id: int = 0, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[Record]:
+    """
+    Yield stored recipes with ingredients and steps, in id order.
+
+    Only one batch of recipes is held in memory at a time.
+
+    Args:
+        conn: Connection to the recipes database
+        after_id: Resume after this recipe id
+        batch_size: Recipes read per query
+    """
+    while True:
+        rows = conn.execute(
+            f"SELECT {', '.join(RECIPE_FIELDS)} FROM recipes WHERE id > ? ORDER BY id ASC LIMIT ?;",
+            (after_id, batch_size),
+        ).fetchall()
+        if not rows:
+            return
+        records = {row[0]: {**dict(zip(RECIPE_FIELDS, row)), "ingredients": [], "steps": []} for row in rows}
+        placeholders = ", ".join("?" * len(records))
+        for recipe_id, name, quantity in conn.execute(
+            f"SELECT recipe_id, name, quantity FROM ingredients WHERE recipe_id IN ({placeholders}) ORDER BY id ASC;",
+            tuple(records),
+        ):
+            records[recipe_id]["ingredients"].append({"name": name, "quantity": quantity})
+        for recipe_id, step_number, description in conn.execute(
+            f"""
+            SELECT recipe_id, step_number, description FROM steps
+            WHERE recipe_id IN ({placeholders}) ORDER BY step_number ASC, id ASC;
+            """,
+            tuple(records),
+        ):
+            records[recipe_id]["steps"].append({"step_number": step_number, "description": description})
+        yield from records.values()
+        after_id = rows[-1][0]
+
+
+def iter_recipes_supabase(client: Any, after_id: int = 0, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Record]:
+    """
+    Yield recipes with ingredients and steps from Supabase, in id order.
+
+    Same contract as iter_recipes_sqlite.
+    """
+    while True:
+        rows = (
+            client.table("recipes").select(",".join(RECIPE_FIELDS))
+            .gt("id", after_id).order("id").limit(batch_size).execute().data
+        )
+        if not rows:
+            return
+        records = {row["id"]: {**{field: row.get(field) for field in RECIPE_FIELDS}, "ingredients": [], "steps": []}
+                   for row in rows}
+        ids = list(records)
+        for row in client.table("ingredients").select("recipe_id,name,quantity").in_("recipe_id", ids).order("id").execute().data:
+            records[row["recipe_id"]]["ingredients"].append({"name": row["name"], "quantity": row["quantity"]})
+        for row in (
+            client.table("steps").select("recipe_id,step_number,description")
+            .in_("recipe_id", ids).order("step_number").execute().data
+        ):
+            records[row["recipe_id"]]["steps"].append(
+                {"step_number": row["step_number"], "description": row["description"]}
+            )
+        yield from records.values()
+        after_id = rows[-1]["id"]
+
+
+# ---------------------------------------------------------------------------
+# File formats
+
+
+def iter_jsonl_lines(records: Iterable[Record]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def read_jsonl(path: str) -> Iterator[Record]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def resume_jsonl(path: str) -> int:
+    """
+    Prepare an interrupted JSONL export for appending.
+
+    An export killed mid-write leaves a partial last line. The file is
+    truncated after the last complete record, so appended records start
+    on a fresh line.
+
+    Returns:
+        Id of the last complete record, 0 if there is none
+    """
+    if not os.path.exists(path):
+        return 0
+    last, end = 0, 0
+    with open(path, "r+b") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                try:
+                    last = json.loads(line)["id"]
+                except (ValueError, KeyError):
+                    break
+            end += len(line)
+        f.truncate(end)
+    return last
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting bytes until drained, with a running position."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_parquet_chunks(records: Iterable[Record], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Encode records as a Parquet file, yielding its bytes one row group at a time.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    pa = load_pyarrow()
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema)
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def read_parquet(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Record]:
+    pa = load_pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """Records from a .parquet or JSONL file."""
+    return read_parquet(path) if path.endswith(".parquet") else read_jsonl(path)
+
+
+def export_recipes(records: Iterable[Record], path: str, append: bool = False) -> int:
+    """
+    Write records to a .parquet or JSONL file.
+
+    Args:
+        records: Recipes as yielded by iter_recipes_*
+        path: Output file; the extension picks the format
+        append: Append to an existing JSONL file (resuming an export)
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+
+    def counted() -> Iterator[Record]:
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    if path.endswith(".parquet"):
+        with open(path, "wb") as f:
+            for chunk in iter_parquet_chunks(counted()):
+                f.write(chunk)
+    else:
+        with open(path, "a" if append else "w", encoding="utf-8") as f:
+            f.writelines(iter_jsonl_lines(counted()))
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Writing to a backend
+
+
+class SQLiteSink:
+    """
+    Bulk writer into the SQLite recipes database.
+
+    Each batch and its import progress are committed in one transaction,
+    so a resumed import never duplicates or skips a record.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS import_progress (source TEXT PRIMARY KEY, position INTEGER NOT NULL);"
+        )
+        conn.commit()
+
+    def position(self, source: str) -> int:
+        row = self.conn.execute("SELECT position FROM import_progress WHERE source = ?;", (source,)).fetchone()
+        return row[0] if row else 0
+
+    def write_batch(self, records: List[Record], source: str, position: int) -> None:
+        with self.conn:
+            for record in records:
+                recipe_id = self.conn.execute(
+                    f"""
+                    INSERT INTO recipes ({', '.join(RECIPE_FIELDS[1:])}, prep_minutes, cook_minutes, total_minutes)
+                    VALUES ({', '.join('?' * 12)});
+                    """,
+                    (
+                        *(record.get(field) for field in RECIPE_FIELDS[1:]),
+                        *recipe_minutes(record.get("prep_time"), record.get("cook_time")),
+                    ),
+                ).lastrowid
+                self.conn.executemany(
+                    """
+                    INSERT INTO ingredients (recipe_id, name, quantity, amount, amount_max, unit, note)
+                    VALUES (?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (recipe_id, ing["name"], ing["quantity"], *parse_quantity(ing["quantity"]))
+                        for ing in record.get("ingredients") or []
+                    ],
+                )
+                self.conn.executemany(
+                    "INSERT INTO steps (recipe_id, step_number, description) VALUES (?, ?, ?);",
+                    [(recipe_id, step["step_number"], step["description"]) for step in record.get("steps") or []],
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO import_progress (source, position) VALUES (?, ?);", (source, position)
+            )
+
+
+class SupabaseSink:
+    """
+    Bulk writer through a Supabase client, one insert per table per batch.
+
+    Supabase offers no cross-table transaction here, so progress is kept in
+    a local JSON file written after each batch: a crash mid-batch can
+    repeat that one batch on resume.
+
+    Args:
+        client: Supabase client
+        progress_path: File holding the import progress by source
+    """
+
+    def __init__(self, client: Any, progress_path: str):
+        self.client = client
+        self.progress_path = Path(progress_path)
+
+    def _progress(self) -> Dict[str, int]:
+        if not self.progress_path.exists():
+            return {}
+        return json.loads(self.progress_path.read_text())
+
+    def position(self, source: str) -> int:
+        return self._progress().get(source, 0)
+
+    def write_batch(self, records: List[Record], source: str, position: int) -> None:
+        rows = self.client.table("recipes").insert(
+            [{field: record.get(field) for field in RECIPE_FIELDS[1:]} for record in records]
+        ).execute().data
+        ingredients = [
+            {"recipe_id": row["id"], "name": ing["name"], "quantity": ing["quantity"]}
+            for row, record in zip(rows, records)
+            for ing in record.get("ingredients") or []
+        ]
+        steps = [
+            {"recipe_id": row["id"], "step_number": step["step_number"], "description": step["description"]}
+            for row, record in zip(rows, records)
+            for step in record.get("steps") or []
+        ]
+        if ingredients:
+            self.client.table("ingredients").insert(ingredients).execute()
+        if steps:
+            self.client.table("steps").insert(steps).execute()
+        progress = self._progress()
+        progress[source] = position
+        self.progress_path.write_text(json.dumps(progress))
+
+
+def import_recipes(records: Iterable[Record], sink: Any, source: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Load records into a backend in batches, resuming after the last saved position.
+
+    Args:
+        records: Records in file order
+        sink: SQLiteSink or SupabaseSink
+        source: Stable name of the input (e.g. its absolute path) for progress tracking
+        batch_size: Records per transaction
+
+    Returns:
+        Number of records imported by this run
+    """
+    start = sink.position(source)
+    position = start
+    remaining = islice(records, start, None)
+    while True:
+        batch = list(islice(remaining, batch_size))
+        if not batch:
+            return position - start
+        position += len(batch)
+        sink.write_batch(batch, source, position)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+
+
+def _supabase_client() -> Any:
+    from .main import _load_supabase_factory
+
+    factory = _load_supabase_factory()
+    if factory is None:
+        raise RuntimeError("The supabase package is not installed")
+    return factory(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export or import the recipe corpus (JSONL or .parquet)")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="File to write or read; a .parquet extension selects Parquet")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--db", default=os.getenv("SQLITE_DB_PATH", "recipes.db"), help="SQLite database")
+    backend.add_argument("--supabase", action="store_true", help="Use Supabase (SUPABASE_URL/SUPABASE_KEY)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--resume", action="store_true", help="Append to an existing JSONL export")
+    parser.add_argument("--progress", help="Supabase import progress file (default: <path>.progress.json)")
+    args = parser.parse_args(argv)
+
+    if args.supabase:
+        client = _supabase_client()
+    else:
+        from .main import _init_sqlite
+
+        conn = _init_sqlite(args.db)
+
+    if args.command == "export":
+        append = args.resume and not args.path.endswith(".parquet")
+        after_id = resume_jsonl(args.path) if append else 0
+        records = (
+            iter_recipes_supabase(client, after_id, args.batch_size)
+            if args.supabase
+            else iter_recipes_sqlite(conn, after_id, args.batch_size)
+        )
+        count = export_recipes(records, args.path, append=append)
+        print(f"Exported {count} recipes to {args.path}")
+    else:
+        sink = (
+            SupabaseSink(client, args.progress or f"{args.path}.progress.json")
+            if args.supabase
+            else SQLiteSink(conn)
+        )
+        count = import_recipes(read_records(args.path), sink, str(Path(args.path).resolve()), args.batch_size)
+        print(f"Imported {count} recipes from {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,210 @@
+"""
+Near-duplicate transcript detection with MinHash signatures and LSH.
+
+Re-uploads of one recipe (a short, a compilation segment, the full video)
+have transcripts that share most of their word shingles. Each transcript
+gets a MinHash signature whose agreement with another signature estimates
+the Jaccard similarity of their shingle sets. Signatures are split into
+bands and every band is hashed into a bucket, so a lookup only compares
+against transcripts sharing at least one bucket instead of the whole corpus.
+"""
+
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+DEFAULT_NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 similarity almost always share a bucket
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashes of the overlapping `size`-word windows of the lowercased text."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash over shingle hashes with `num_perm` random linear permutations.
+
+    The seed fixes the permutations; signatures are only comparable between
+    hashers built with the same seed and num_perm.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Signature:
+        hashes = shingles(text)
+        if not hashes:
+            return (_MERSENNE_PRIME,) * self.num_perm
+        return tuple(min((a * x + b) % _MERSENNE_PRIME for x in hashes) for a, b in self._permutations)
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the share of positions where the signatures agree."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class DuplicateIndex:
+    """
+    SQLite-backed LSH index of generated recipes by transcript signature.
+
+    Besides signatures and buckets it keeps the recipe generated for each
+    indexed video, and links from videos detected as duplicates to the
+    video whose recipe they reuse.
+
+    Args:
+        path: SQLite database file (":memory:" for a process-local index)
+        threshold: Minimum estimated similarity for a duplicate
+        hasher: MinHasher used for signatures
+        bands: Number of LSH bands; must divide the signature length
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        threshold: float = DEFAULT_THRESHOLD,
+        hasher: Optional[MinHasher] = None,
+        bands: int = DEFAULT_BANDS,
+    ):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError(f"{bands} bands do not divide a signature of {self.hasher.num_perm}")
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dedupe_signatures (
+                video_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                recipe TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS dedupe_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                video_id TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, video_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS dedupe_links (
+                video_id TEXT PRIMARY KEY,
+                duplicate_of TEXT NOT NULL,
+                similarity REAL NOT NULL,
+                linked_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def signature(self, text: str) -> Signature:
+        return self.hasher.signature(text)
+
+    def _buckets(self, signature: Signature) -> List[Tuple[int, int]]:
+        buckets = []
+        for band in range(self.bands):
+            rows = array("Q", signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            digest = hashlib.blake2b(rows, digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+        return buckets
+
+    def find(self, signature: Signature, exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar indexed video at or above the threshold.
+
+        Only videos sharing an LSH bucket with `signature` are compared.
+
+        Args:
+            signature: Signature of the new transcript
+            exclude: Video ID to ignore (the video itself, when regenerating)
+
+        Returns:
+            Dict with video_id, similarity and recipe, or None
+        """
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, bucket in self._buckets(signature):
+                candidates.update(
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT video_id FROM dedupe_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                    )
+                )
+            candidates.discard(exclude)
+            rows = [
+                self._conn.execute(
+                    "SELECT video_id, signature, recipe FROM dedupe_signatures WHERE video_id = ?", (video_id,)
+                ).fetchone()
+                for video_id in sorted(candidates)
+            ]
+
+        best = None
+        for video_id, blob, recipe in filter(None, rows):
+            score = similarity(signature, array("Q", blob))
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {"video_id": video_id, "similarity": score, "recipe": json.loads(recipe)}
+        return best
+
+    def add(self, video_id: str, signature: Signature, recipe: Dict[str, Any]) -> None:
+        """Index a video's signature together with the recipe generated for it."""
+        with self._lock:
+            self._conn.execute("DELETE FROM dedupe_buckets WHERE video_id = ?", (video_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dedupe_signatures (video_id, signature, recipe) VALUES (?, ?, ?)",
+                (video_id, array("Q", signature).tobytes(), json.dumps(recipe)),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO dedupe_buckets (band, bucket, video_id) VALUES (?, ?, ?)",
+                [(band, bucket, video_id) for band, bucket in self._buckets(signature)],
+            )
+            self._conn.commit()
+
+    def link(self, video_id: str, duplicate_of: str, similarity: float) -> None:
+        """Record that `video_id` reuses the recipe of `duplicate_of`."""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO dedupe_links (video_id, duplicate_of, similarity, linked_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (video_id, duplicate_of, similarity, time.time()),
+            )
+            self._conn.commit()
+
+    def canonical(self, video_id: str) -> Optional[str]:
+        """The video whose recipe `video_id` was linked to, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT duplicate_of FROM dedupe_links WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
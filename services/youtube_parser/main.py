@@ -8,32 +8,241 @@ To-do:
 """
 
 
+import time
+
+_import_started = time.perf_counter()
+
 import fastapi  # type: ignore
-from fastapi import HTTPException, Header  # type: ignore
+from fastapi import Depends, HTTPException, Header, Query  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
-from .yt_scrape import YouTubeScraper
-from .recipe_gen import RecipeGenerator
+from fastapi.responses import PlainTextResponse, StreamingResponse  # type: ignore
+from starlette.concurrency import iterate_in_threadpool  # type: ignore
+import requests  # type: ignore
+# Eager on purpose, unlike openai and supabase: yt_scrape and retry need it at
+# import time anyway, and it costs ~7 ms of the ~550 ms it takes to import main
+from youtube_transcript_api import YouTubeTranscriptApi  # type: ignore
+from .upstream import create_session, parse_overrides
+from .retry import Cancelled, Deadline, DeadlineExceeded
+from .cache import TTLCache
+from .channel_sync import ChannelSyncStore
+from .dedupe import DEFAULT_THRESHOLD as DEFAULT_DEDUPE_THRESHOLD, DuplicateIndex, Signature
+from .neighbors import DEFAULT_K as DEFAULT_NEIGHBORS, NeighborIndex
+from .catalog import DEFAULT_MAX_BYTES as DEFAULT_CATALOG_BYTES, RANGE_FIELDS, Range, RecipeCatalog
+from . import corpus, metrics, regenerate, tracing
+from .scheduler import BULK, DEFAULT_PER_USER, DEFAULT_RESERVED, DEFAULT_SLOTS, INTERACTIVE, FairScheduler
+from .yt_scrape import DEFAULT_HANDLE_TTL, DEFAULT_NEGATIVE_TTL, DEFAULT_TRANSCRIPT_TTL, YouTubeScraper
+from .recipe_gen import DEFAULT_MODEL, MAX_PACK_SIZE, RecipeGenerator, estimate_tokens
+from .nutrition import NUTRIENTS, default_engine
+from .quantity import format_amount, format_quantity, parse_quantity, parse_servings, recipe_minutes, scale_amounts
+from .prefilter import DEFAULT_CUTOFF, score_transcript
 from .types import ScrapeRequest, QueryRequest, VideoRequest
 from dotenv import load_dotenv  # type: ignore
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
 import os
-from contextlib import asynccontextmanager
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager, nullcontext
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Sequence, Tuple
 import sqlite3
+import threading
 
-try:
-    # Supabase is optional now – only required if not using SQLite
-    from supabase import create_client, Client  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency for local dev
-    create_client = None  # type: ignore
-    Client = object  # type: ignore
+logger = logging.getLogger(__name__)
 
 yt_api_key: Optional[str] = None
 openai_api_key: Optional[str] = None
-supabase: Optional["Client"] = None
+supabase: Optional[Any] = None
+# Supabase is optional – imported lazily in lifespan only when it is the backend
+create_client: Optional[Callable[..., Any]] = None
 
 # database backend config
 db_backend: str = "supabase"  # or "sqlite"
 sqlite_conn: Optional[sqlite3.Connection] = None
+# Serializes writes through sqlite_conn, which request threads, the channel
+# sync loop and regeneration share: a commit or rollback applies to every
+# statement pending on the connection, not just the caller's
+sqlite_write_lock = threading.Lock()
+
+# App-scoped clients, created once in lifespan and shared by every request
+# thread. The transcript client keeps no per-call state: it only sets
+# headers when constructed and a consent cookie on the session's cookie
+# jar, which locks internally, and urllib3's connection pool is thread-safe.
+http_session: Optional[requests.Session] = None
+transcript_api: Optional[YouTubeTranscriptApi] = None
+recipe_generator: Optional[RecipeGenerator] = None
+cache: Optional[TTLCache] = None
+negative_cache_ttl: float = DEFAULT_NEGATIVE_TTL
+handle_cache_ttl: float = DEFAULT_HANDLE_TTL
+transcript_cache_ttl: Optional[float] = None
+# Transcript languages accepted when the requested one is missing
+fallback_languages: List[str] = []
+# Recipe prefilter cutoffs (None disables): metadata score before transcript
+# fetch, transcript keyword score before the LLM call
+score_cutoff: Optional[float] = DEFAULT_CUTOFF
+transcript_score_cutoff: Optional[float] = None
+# Estimated transcript tokens per packed generation request; None generates one video per request
+pack_token_budget: Optional[int] = None
+sync_store: Optional[ChannelSyncStore] = None
+# Near-duplicate transcript index; None when DEDUPE_THRESHOLD is "off"
+duplicate_index: Optional[DuplicateIndex] = None
+# Precomputed similar-recipe neighbors (SQLite backend only)
+neighbor_index: Optional[NeighborIndex] = None
+# In-memory summaries answering list/filter queries (SQLite backend only)
+catalog: Optional[RecipeCatalog] = None
+# Worker slots shared by all requests: interactive lane first, fair share per user
+scheduler: Optional[FairScheduler] = None
+# Background task keeping FOLLOWED_CHANNELS synced, when configured
+sync_task: Optional["asyncio.Task[None]"] = None
+
+# Seconds from module import until the app was ready to serve
+startup_seconds: Optional[float] = None
+
+
+def _optional_float(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric setting; unset, empty or "off" means disabled (None)."""
+    if value is None or value.strip().lower() in ("", "off", "none"):
+        return None
+    return float(value)
+
+
+def _load_supabase_factory() -> Optional[Callable[..., Any]]:
+    """
+    Import supabase.create_client on demand.
+
+    Returns None when the optional supabase package is not installed.
+    """
+    try:
+        from supabase import create_client as factory  # type: ignore
+    except ImportError:  # pragma: no cover - optional dependency for local dev
+        return None
+    return factory
+
+
+def _make_scraper(language: str, max_results: int = 50) -> YouTubeScraper:
+    """
+    Build a per-request scraper that reuses the app-scoped HTTP clients.
+    """
+    return YouTubeScraper(
+        yt_api_key,
+        language,
+        max_results,
+        session=http_session,
+        transcript_api=transcript_api,
+        cache=cache,
+        negative_ttl=negative_cache_ttl,
+        handle_ttl=handle_cache_ttl,
+        transcript_ttl=transcript_cache_ttl,
+        fallback_languages=fallback_languages,
+        score_cutoff=score_cutoff,
+    )
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    """
+    Add columns introduced after a database was created.
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table});")}
+    for name, column_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type};")
+
+
+def _parse_stored_quantities(conn: sqlite3.Connection) -> None:
+    """
+    Fill the parsed quantity columns of ingredients stored before they existed.
+    """
+    rows = conn.execute(
+        """
+        SELECT id, quantity FROM ingredients
+        WHERE amount IS NULL AND note IS NULL AND quantity IS NOT NULL AND quantity != '';
+        """
+    ).fetchall()
+    conn.executemany(
+        "UPDATE ingredients SET amount = ?, amount_max = ?, unit = ?, note = ? WHERE id = ?;",
+        [(*parse_quantity(quantity), ingredient_id) for ingredient_id, quantity in rows],
+    )
+
+
+def _parse_stored_times(conn: sqlite3.Connection) -> None:
+    """
+    Fill the minutes columns of recipes stored before they existed.
+    """
+    rows = conn.execute(
+        """
+        SELECT id, prep_time, cook_time FROM recipes
+        WHERE total_minutes IS NULL AND (prep_time IS NOT NULL OR cook_time IS NOT NULL);
+        """
+    ).fetchall()
+    conn.executemany(
+        "UPDATE recipes SET prep_minutes = ?, cook_minutes = ?, total_minutes = ? WHERE id = ?;",
+        [(*recipe_minutes(prep_time, cook_time), recipe_id) for recipe_id, prep_time, cook_time in rows],
+    )
+
+
+# Recipe columns /recipes serves; changing any of them is a change for the feed
+_SERVED_RECIPE_COLUMNS = (
+    "title", "video_id", "servings", "prep_time", "cook_time", "calories", "protein", "carbs", "fat", "total_minutes",
+)
+
+
+def _init_change_feed(conn: sqlite3.Connection) -> None:
+    """
+    Create the recipe change feed and the triggers that maintain it.
+
+    Every insert, update and delete of a recipe or of its ingredients and
+    steps replaces the recipe's row in recipe_changes with one carrying
+    the next sequence number, so the feed holds one entry per recipe, the
+    latest, and a delete leaves a tombstone (deleted = 1). Clients that
+    remember the last seq they saw ask /recipes/changes for everything
+    after it. Children inserted into an existing recipe (a regeneration
+    swapping them) count as a change even when the recipe row is unchanged.
+    """
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipe_changes';"
+    ).fetchone() is None
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recipe_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipe_id INTEGER NOT NULL UNIQUE,
+            deleted INTEGER NOT NULL DEFAULT 0
+        );
+        """
+    )
+    if created:
+        # Recipes stored before the feed existed count as changed once
+        conn.execute("INSERT INTO recipe_changes (recipe_id) SELECT id FROM recipes ORDER BY id ASC;")
+
+    def changed(columns: Sequence[str]) -> str:
+        # Rewrites that leave every served column as it was (e.g. a nutrition
+        # recompute with the same result) are not changes
+        return "(" + " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns) + ")"
+
+    touch = "INSERT OR REPLACE INTO recipe_changes (recipe_id, deleted) VALUES ({}, {});"
+    triggers = {
+        "recipes_changes_insert": ("AFTER INSERT ON recipes", "", touch.format("NEW.id", 0)),
+        "recipes_changes_update": (
+            "AFTER UPDATE ON recipes", f"WHEN {changed(_SERVED_RECIPE_COLUMNS)}", touch.format("NEW.id", 0)
+        ),
+        "recipes_changes_delete": ("AFTER DELETE ON recipes", "", touch.format("OLD.id", 1)),
+    }
+    for table, columns in (("ingredients", ("name", "quantity")), ("steps", ("step_number", "description"))):
+        # A cascading delete of the recipe itself already left a tombstone
+        still_there = "EXISTS (SELECT 1 FROM recipes WHERE id = {}.recipe_id)"
+        triggers[f"{table}_changes_insert"] = (
+            f"AFTER INSERT ON {table}", f"WHEN {still_there.format('NEW')}", touch.format("NEW.recipe_id", 0)
+        )
+        triggers[f"{table}_changes_update"] = (
+            f"AFTER UPDATE ON {table}",
+            f"WHEN {changed(columns)} AND {still_there.format('NEW')}",
+            touch.format("NEW.recipe_id", 0),
+        )
+        triggers[f"{table}_changes_delete"] = (
+            f"AFTER DELETE ON {table}", f"WHEN {still_there.format('OLD')}", touch.format("OLD.recipe_id", 0)
+        )
+    for name, (event, condition, action) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} FOR EACH ROW {condition} BEGIN {action} END;")
 
 
 def _init_sqlite(db_path: str) -> sqlite3.Connection:
@@ -57,10 +266,34 @@ def _init_sqlite(db_path: str) -> sqlite3.Connection:
             calories REAL,
             protein REAL,
             carbs REAL,
-            fat REAL
+            fat REAL,
+            prep_minutes INTEGER,
+            cook_minutes INTEGER,
+            total_minutes INTEGER,
+            prompt_hash TEXT,
+            model TEXT
         );
         """
     )
+    # Recipes stored before prompt_hash and model were recorded have NULLs, so they count as stale
+    _add_missing_columns(
+        conn,
+        "recipes",
+        {
+            "prep_minutes": "INTEGER",
+            "cook_minutes": "INTEGER",
+            "total_minutes": "INTEGER",
+            "prompt_hash": "TEXT",
+            "model": "TEXT",
+        },
+    )
+    _parse_stored_times(conn)
+    # Range filters on /recipes: total time first for "under N minutes", calories first for calorie bounds
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_total_minutes ON recipes (total_minutes, calories);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_calories ON recipes (calories, total_minutes);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_protein ON recipes (protein, calories);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_carbs ON recipes (carbs, calories);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_fat ON recipes (fat, calories);")
 
     # Ingredients table
     conn.execute(
@@ -70,10 +303,16 @@ def _init_sqlite(db_path: str) -> sqlite3.Connection:
             recipe_id INTEGER,
             name TEXT,
             quantity TEXT,
+            amount REAL,
+            amount_max REAL,
+            unit TEXT,
+            note TEXT,
             FOREIGN KEY (recipe_id) REFERENCES recipes (id) ON DELETE CASCADE
         );
         """
     )
+    _add_missing_columns(conn, "ingredients", {"amount": "REAL", "amount_max": "REAL", "unit": "TEXT", "note": "TEXT"})
+    _parse_stored_quantities(conn)
 
     # Steps table
     conn.execute(
@@ -88,6 +327,8 @@ def _init_sqlite(db_path: str) -> sqlite3.Connection:
         """
     )
 
+    _init_change_feed(conn)
+
     # Recipe generations table
     conn.execute(
         """
@@ -103,6 +344,29 @@ def _init_sqlite(db_path: str) -> sqlite3.Connection:
     return conn
 
 
+def _insert_generation(cur: sqlite3.Cursor, user_id: str) -> None:
+    # simple text UUID – doesn't need to match Postgres gen_random_uuid()
+    import uuid
+
+    cur.execute(
+        "INSERT INTO recipe_generations (id, user_id) VALUES (?, ?);",
+        (str(uuid.uuid4()), user_id),
+    )
+
+
+@metrics.time_stage("db_write")
+def _log_generation_sqlite(user_id: str) -> None:
+    """
+    Log a generation served by an already stored recipe (a linked near-duplicate).
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+    with sqlite_write_lock, sqlite_conn:
+        _insert_generation(sqlite_conn.cursor(), user_id)
+
+
+@tracing.traced("store_recipe")
+@metrics.time_stage("db_write")
 def _store_recipe_sqlite(user_id: str, recipe_data: Dict[str, Any]) -> None:
     """
     Store recipe, ingredients, steps and generation log into SQLite.
@@ -110,7 +374,7 @@ def _store_recipe_sqlite(user_id: str, recipe_data: Dict[str, Any]) -> None:
     if sqlite_conn is None:
         raise RuntimeError("SQLite connection is not initialized")
 
-    cur = sqlite_conn.cursor()
+    nutrition = recipe_data.get("nutritional_info") or {}
 
     recipe_insert_data = (
         recipe_data["title"],
@@ -118,84 +382,253 @@ def _store_recipe_sqlite(user_id: str, recipe_data: Dict[str, Any]) -> None:
         recipe_data.get("servings"),
         recipe_data.get("prep_time"),
         recipe_data.get("cook_time"),
-        recipe_data["nutritional_info"].get("calories"),
-        recipe_data["nutritional_info"].get("protein"),
-        recipe_data["nutritional_info"].get("carbs"),
-        recipe_data["nutritional_info"].get("fat"),
-    )
-
-    cur.execute(
-        """
-        INSERT INTO recipes (
-            title, video_id, servings, prep_time, cook_time,
-            calories, protein, carbs, fat
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-        """,
-        recipe_insert_data,
+        nutrition.get("calories"),
+        nutrition.get("protein"),
+        nutrition.get("carbs"),
+        nutrition.get("fat"),
     )
-    recipe_id = cur.lastrowid
+    prep_minutes, cook_minutes, total_minutes = recipe_minutes(recipe_data.get("prep_time"), recipe_data.get("cook_time"))
 
+    # Quantities are parsed once here so scaling never re-parses them
     ingredients_rows = [
-        (recipe_id, ing["name"], ing["quantity"])
+        (ing["name"], ing["quantity"], *parse_quantity(ing["quantity"]))
         for ing in recipe_data["ingredients"]
     ]
-    cur.executemany(
-        "INSERT INTO ingredients (recipe_id, name, quantity) VALUES (?, ?, ?);",
-        ingredients_rows,
-    )
-
     steps_rows = [
-        (recipe_id, step["step_number"], step["description"])
+        (step["step_number"], step["description"])
         for step in recipe_data["steps"]
     ]
-    cur.executemany(
-        "INSERT INTO steps (recipe_id, step_number, description) VALUES (?, ?, ?);",
-        steps_rows,
-    )
 
-    # simple text UUID – doesn't need to match Postgres gen_random_uuid()
-    import uuid
+    # One transaction under the write lock: a failure rolls back only this recipe
+    with sqlite_write_lock:
+        with sqlite_conn:
+            cur = sqlite_conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO recipes (
+                    title, video_id, servings, prep_time, cook_time,
+                    calories, protein, carbs, fat,
+                    prep_minutes, cook_minutes, total_minutes,
+                    prompt_hash, model
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    *recipe_insert_data, prep_minutes, cook_minutes, total_minutes,
+                    recipe_data.get("prompt_hash"), recipe_data.get("model"),
+                ),
+            )
+            recipe_id = cur.lastrowid
+            tracing.set_attributes(backend="sqlite", recipe_id=recipe_id, video_id=recipe_data["video_id"])
+            cur.executemany(
+                """
+                INSERT INTO ingredients (recipe_id, name, quantity, amount, amount_max, unit, note)
+                VALUES (?, ?, ?, ?, ?, ?, ?);
+                """,
+                [(recipe_id, *row) for row in ingredients_rows],
+            )
+            cur.executemany(
+                "INSERT INTO steps (recipe_id, step_number, description) VALUES (?, ?, ?);",
+                [(recipe_id, *row) for row in steps_rows],
+            )
+            _insert_generation(cur, user_id)
+        # Still under the lock so the catalog sees recipes in id order, as its newest-first query assumes
+        if catalog is not None:
+            catalog.add((recipe_id, *recipe_insert_data, total_minutes))
+
+    # Keep similar-recipe neighbors current; POST /recipes/similar/rebuild corrects any drift
+    if neighbor_index is not None:
+        try:
+            neighbor_index.add(recipe_id)
+        except sqlite3.Error as e:
+            logger.warning("Could not index recipe %s for similar recipes: %s", recipe_id, e)
+
+
+def _save_recipe_sqlite(user_id: str, recipe_data: Dict[str, Any]) -> None:
+    """
+    Store a generated recipe, or only log its generation when it is linked
+    to a near-duplicate whose recipe is already stored.
+    """
+    duplicate_of = recipe_data.get("duplicate_of")
+    if duplicate_of and _fetch_recipe_by_video_sqlite(duplicate_of) is not None:
+        _log_generation_sqlite(user_id)
+    else:
+        _store_recipe_sqlite(user_id, recipe_data)
+
+
+@tracing.traced("store_recipe")
+@metrics.time_stage("db_write")
+def _store_recipe_supabase(user_supabase: Any, user_id: str, recipe_data: Dict[str, Any]) -> None:
+    """
+    Store recipe, ingredients, steps and generation log through a Supabase client.
+    """
+    nutrition = recipe_data.get("nutritional_info") or {}
+
+    # 🔹 Insert into recipes table
+    recipe_insert_data = {
+        "title": recipe_data["title"],
+        "video_id": recipe_data["video_id"],
+        "servings": recipe_data.get("servings"),
+        "prep_time": recipe_data.get("prep_time"),
+        "cook_time": recipe_data.get("cook_time"),
+        "calories": nutrition.get("calories"),
+        "protein": nutrition.get("protein"),
+        "carbs": nutrition.get("carbs"),
+        "fat": nutrition.get("fat"),
+    }
+    recipe_response = user_supabase.table("recipes").insert(recipe_insert_data).execute()
+    recipe_id = recipe_response.data[0]["id"]
+    tracing.set_attributes(backend="supabase", recipe_id=recipe_id, video_id=recipe_data["video_id"])
+
+    # 🔹 Insert ingredients
+    ingredients_data = [
+        {
+            "recipe_id": recipe_id,
+            "name": ing["name"],
+            "quantity": ing["quantity"],
+        }
+        for ing in recipe_data["ingredients"]
+    ]
+    user_supabase.table("ingredients").insert(ingredients_data).execute()
+
+    # 🔹 Insert steps
+    steps_data = [
+        {
+            "recipe_id": recipe_id,
+            "step_number": step["step_number"],
+            "description": step["description"],
+        }
+        for step in recipe_data["steps"]
+    ]
+    user_supabase.table("steps").insert(steps_data).execute()
+
+    # 🔹 Log generation last
+    user_supabase.table("recipe_generations").insert(
+        {
+            "user_id": user_id,
+        }
+    ).execute()
 
-    cur.execute(
-        "INSERT INTO recipe_generations (id, user_id) VALUES (?, ?);",
-        (str(uuid.uuid4()), user_id),
-    )
 
-    sqlite_conn.commit()
+_SUMMARY_COLUMNS = "id, title, video_id, servings, prep_time, cook_time, calories, protein, carbs, fat, total_minutes"
 
 
-def _fetch_all_recipes_sqlite() -> List[Dict[str, Any]]:
+def _load_catalog() -> None:
+    """
+    (Re)load the in-memory recipe catalog from SQLite.
+    """
+    if catalog is None or sqlite_conn is None:
+        return
+    rows = sqlite_conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM recipes ORDER BY id ASC;")
+    if not catalog.load(rows):
+        logger.warning("Recipe catalog exceeds CATALOG_MAX_BYTES; listing falls back to SQLite")
+
+
+# Newest first. "+id" keeps SQLite from scanning in rowid order to skip the
+# sort, so range filters are answered from their indexes instead.
+_NEWEST_FIRST = "ORDER BY id DESC"
+_FILTERED_NEWEST_FIRST = "ORDER BY +id DESC"
+
+
+def _range_conditions(ranges: Dict[str, Range]) -> Tuple[List[str], List[Any]]:
+    """
+    SQL conditions and parameters for range filters on indexed recipe columns.
+
+    Raises:
+        ValueError: If a range is on a column that cannot be filtered
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    for column, (low, high) in ranges.items():
+        if column not in RANGE_FIELDS:
+            raise ValueError(f"Cannot filter on {column}")
+        if low is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"{column} <= ?")
+            params.append(high)
+    return conditions, params
+
+
+@metrics.time_stage("db_read")
+def _query_recipe_summaries_sqlite(
+    text: Optional[str], ranges: Dict[str, Range], offset: int, limit: int
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Same as RecipeCatalog.query, answered by SQLite when the catalog is unavailable.
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+
+    conditions, params = _range_conditions(ranges)
+    order = _FILTERED_NEWEST_FIRST if conditions else _NEWEST_FIRST
+    if text:
+        conditions.append("instr(lower(title), ?) > 0")
+        params.append(text.lower())
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    cur = sqlite_conn.cursor()
+    total = cur.execute(f"SELECT COUNT(*) FROM recipes{where};", params).fetchone()[0]
+    rows = cur.execute(
+        f"SELECT {_SUMMARY_COLUMNS} FROM recipes{where} {order} LIMIT ? OFFSET ?;",
+        (*params, limit, offset),
+    ).fetchall()
+    return total, [dict(zip(_SUMMARY_COLUMNS.split(", "), row)) for row in rows]
+
+
+@metrics.time_stage("db_read")
+def _fetch_all_recipes_sqlite(ranges: Optional[Dict[str, Range]] = None) -> List[Dict[str, Any]]:
     """
     Return all recipes with their ingredients and steps from SQLite,
     shaped like the frontend's dummyRecipes.
+
+    With `ranges`, only recipes within every (min, max) bound are
+    returned; the bounds are answered from the indexes on total_minutes
+    and the macros, and only the matching recipes' ingredients and steps
+    are read.
+    """
+    conditions, params = _range_conditions(ranges or {})
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return _read_recipes_sqlite(where, params, _FILTERED_NEWEST_FIRST if conditions else _NEWEST_FIRST)
+
+
+def _read_recipes_sqlite(where: str, params: Sequence[Any], order: str) -> List[Dict[str, Any]]:
+    """
+    Recipes matching `where` (empty for all) with their ingredients and steps.
     """
     if sqlite_conn is None:
         raise RuntimeError("SQLite connection is not initialized")
 
+    # Child rows of the matching recipes only, when filtering
+    owned = f" WHERE recipe_id IN (SELECT id FROM recipes{where})" if where else ""
+
     cur = sqlite_conn.cursor()
     cur.execute(
-        """
+        f"""
         SELECT
             id, title, video_id, servings, prep_time, cook_time,
-            calories, protein, carbs, fat
-        FROM recipes
-        ORDER BY id DESC;
-        """
+            calories, protein, carbs, fat, total_minutes
+        FROM recipes{where}
+        {order};
+        """,
+        params,
     )
     recipes_rows = cur.fetchall()
 
     # Fetch ingredients and steps in bulk
     cur.execute(
-        "SELECT id, recipe_id, name, quantity FROM ingredients ORDER BY id ASC;"
+        f"SELECT id, recipe_id, name, quantity FROM ingredients{owned} ORDER BY id ASC;",
+        params,
     )
     ingredients_rows = cur.fetchall()
     cur.execute(
-        """
+        f"""
         SELECT id, recipe_id, step_number, description
-        FROM steps
+        FROM steps{owned}
         ORDER BY step_number ASC, id ASC;
-        """
+        """,
+        params,
     )
     steps_rows = cur.fetchall()
 
@@ -234,6 +667,7 @@ def _fetch_all_recipes_sqlite() -> List[Dict[str, Any]]:
                 "protein": row[7],
                 "carbs": row[8],
                 "fat": row[9],
+                "total_minutes": row[10],
                 "ingredients": ingredients_by_recipe.get(rid, []),
                 "steps": steps_by_recipe.get(rid, []),
             }
@@ -242,6 +676,145 @@ def _fetch_all_recipes_sqlite() -> List[Dict[str, Any]]:
     return recipes
 
 
+@metrics.time_stage("db_read")
+def _fetch_recipe_changes_sqlite(since: int, limit: int) -> Dict[str, Any]:
+    """
+    Recipes changed and deleted after change sequence `since`, oldest change first.
+
+    Returns:
+        Dict with "recipes" (current state of each changed recipe),
+        "deleted" (ids), "next_since" (seq to ask from next time),
+        "has_more" (another page is waiting) and "reset" (`since` is
+        ahead of the feed, e.g. the database was replaced, so the client
+        must drop its copy and sync from 0)
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+
+    cur = sqlite_conn.cursor()
+    latest = cur.execute("SELECT COALESCE(MAX(seq), 0) FROM recipe_changes;").fetchone()[0]
+    if since > latest:
+        return {"recipes": [], "deleted": [], "next_since": 0, "has_more": False, "reset": True}
+
+    changes = cur.execute(
+        "SELECT seq, recipe_id, deleted FROM recipe_changes WHERE seq > ? ORDER BY seq ASC LIMIT ?;",
+        (since, limit + 1),
+    ).fetchall()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    next_since = changes[-1][0] if changes else since
+
+    changed = " WHERE id IN (SELECT recipe_id FROM recipe_changes WHERE seq > ? AND seq <= ? AND deleted = 0)"
+    return {
+        "recipes": _read_recipes_sqlite(changed, (since, next_since), _NEWEST_FIRST) if changes else [],
+        "deleted": [recipe_id for _, recipe_id, deleted in changes if deleted],
+        "next_since": next_since,
+        "has_more": has_more,
+        "reset": False,
+    }
+
+
+@tracing.traced("recompute_nutrition")
+def _recompute_nutrition_sqlite() -> int:
+    """
+    Recompute nutrition for every stored recipe in one batch pass.
+
+    Reads all recipes and ingredients with two queries, computes the
+    nutrition of the whole corpus at once and writes it back in a single
+    transaction. Recipes without a measurable ingredient get NULLs.
+
+    Returns:
+        Number of recipes updated
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+
+    cur = sqlite_conn.cursor()
+    recipe_rows = cur.execute("SELECT id, servings FROM recipes;").fetchall()
+    ingredients_by_recipe: Dict[int, List[Tuple[str, str]]] = {}
+    for recipe_id, name, quantity in cur.execute(
+        "SELECT recipe_id, name, quantity FROM ingredients ORDER BY id ASC;"
+    ):
+        ingredients_by_recipe.setdefault(recipe_id, []).append((name, quantity))
+
+    results = default_engine().compute_many(
+        (recipe_id, ingredients_by_recipe.get(recipe_id, []), servings)
+        for recipe_id, servings in recipe_rows
+    )
+    update_rows = [
+        (*((info or {}).get(nutrient) for nutrient in NUTRIENTS), recipe_id)
+        for recipe_id, info in results.items()
+    ]
+    with sqlite_write_lock, sqlite_conn:
+        sqlite_conn.executemany(
+            "UPDATE recipes SET calories = ?, protein = ?, carbs = ?, fat = ? WHERE id = ?;",
+            update_rows,
+        )
+    _load_catalog()
+    tracing.set_attributes(recipes=len(update_rows))
+    return len(update_rows)
+
+
+@metrics.time_stage("db_read")
+def _scale_recipe_sqlite(recipe_id: int, servings: float) -> Optional[Dict[str, Any]]:
+    """
+    Return a recipe's ingredients scaled to `servings`.
+
+    Uses the quantity columns parsed at store time; every amount is scaled
+    in one pass. Ingredients without a parsed amount ("to taste") are
+    returned unchanged.
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+
+    cur = sqlite_conn.cursor()
+    row = cur.execute(
+        "SELECT id, title, video_id, servings FROM recipes WHERE id = ?;",
+        (recipe_id,),
+    ).fetchone()
+    if row is None:
+        return None
+
+    ingredient_rows = cur.execute(
+        """
+        SELECT id, name, quantity, amount, amount_max, unit, note
+        FROM ingredients
+        WHERE recipe_id = ?
+        ORDER BY id ASC;
+        """,
+        (recipe_id,),
+    ).fetchall()
+
+    factor = servings / parse_servings(row[3])
+    amounts, amount_maxes = scale_amounts(
+        [r[3] for r in ingredient_rows], [r[4] for r in ingredient_rows], factor
+    )
+    ingredients = [
+        {
+            "id": r[0],
+            "recipe_id": recipe_id,
+            "name": r[1],
+            "quantity": format_quantity(amount, amount_max, r[5], r[6]) if amount is not None else r[2],
+            "amount": amount,
+            "amount_max": amount_max,
+            "unit": r[5],
+            "note": r[6],
+        }
+        for r, amount, amount_max in zip(ingredient_rows, amounts, amount_maxes)
+    ]
+
+    return {
+        "id": row[0],
+        "title": row[1],
+        "video_id": row[2],
+        "servings": format_amount(servings),
+        "original_servings": row[3],
+        "factor": factor,
+        "ingredients": ingredients,
+    }
+
+
+@metrics.time_stage("db_read")
 def _fetch_recipe_by_video_sqlite(video_id: str) -> Optional[Dict[str, Any]]:
     """
     Return a single recipe with ingredients and steps, looked up by video_id.
@@ -316,6 +889,16 @@ def _fetch_recipe_by_video_sqlite(video_id: str) -> Optional[Dict[str, Any]]:
         "steps": steps,
     }
 
+def _recipe_generator() -> RecipeGenerator:
+    """
+    Return the app-scoped RecipeGenerator, creating it if lifespan has not run.
+    """
+    global recipe_generator
+    if recipe_generator is None:
+        recipe_generator = RecipeGenerator(openai_api_key, model=os.getenv("RECIPE_MODEL", DEFAULT_MODEL))
+    return recipe_generator
+
+
 @asynccontextmanager
 async def lifespan(app: fastapi.FastAPI):
     """
@@ -324,7 +907,10 @@ async def lifespan(app: fastapi.FastAPI):
     Initializes API keys and database backend (Supabase or SQLite).
     """
     load_dotenv()
-    global yt_api_key, openai_api_key, supabase, db_backend, sqlite_conn
+    global yt_api_key, openai_api_key, supabase, create_client, db_backend, sqlite_conn
+    global http_session, transcript_api, recipe_generator, startup_seconds, cache, negative_cache_ttl
+    global sync_store, sync_task, handle_cache_ttl, transcript_cache_ttl, fallback_languages, score_cutoff, transcript_score_cutoff
+    global pack_token_budget, duplicate_index, neighbor_index, catalog, scheduler
     yt_api_key = os.getenv("YOUTUBE_API_KEY")
     openai_api_key = os.getenv("OPENAI_API_KEY")
 
@@ -338,16 +924,88 @@ async def lifespan(app: fastapi.FastAPI):
     if not openai_api_key:
         raise ValueError("OPENAI_API_KEY environment variable not set")
 
+    if not use_sqlite and supabase_url and supabase_key:
+        create_client = _load_supabase_factory()
+
     if use_sqlite or not (supabase_url and supabase_key and create_client):
         # Fallback to SQLite when requested or when Supabase is not configured
         db_backend = "sqlite"
         db_path = os.getenv("SQLITE_DB_PATH", "recipes.db")
+        cache_path = os.getenv("CACHE_DB_PATH", db_path)
         sqlite_conn = _init_sqlite(db_path)
+        neighbor_index = NeighborIndex(
+            sqlite_conn, int(os.getenv("SIMILAR_RECIPES_K", DEFAULT_NEIGHBORS)), lock=sqlite_write_lock
+        )
+        catalog = RecipeCatalog(int(os.getenv("CATALOG_MAX_BYTES", DEFAULT_CATALOG_BYTES)))
+        _load_catalog()
     else:
         db_backend = "supabase"
         supabase = create_client(supabase_url, supabase_key)  # type: ignore
+        cache_path = os.getenv("CACHE_DB_PATH", "cache.db")
+
+    # Persistent cache for upstream lookups (e.g. videos with no usable transcript)
+    cache = TTLCache(cache_path)
+    negative_cache_ttl = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", DEFAULT_NEGATIVE_TTL))
+    handle_cache_ttl = float(os.getenv("CHANNEL_HANDLE_TTL_SECONDS", DEFAULT_HANDLE_TTL))
+    transcript_cache_ttl = _optional_float(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(DEFAULT_TRANSCRIPT_TTL)))
+    fallback_languages = [
+        code.strip() for code in os.getenv("TRANSCRIPT_FALLBACK_LANGUAGES", "").split(",") if code.strip()
+    ]
+    score_cutoff = _optional_float(os.getenv("RECIPE_SCORE_CUTOFF", str(DEFAULT_CUTOFF)))
+    transcript_score_cutoff = _optional_float(os.getenv("TRANSCRIPT_SCORE_CUTOFF"))
+    pack_budget = _optional_float(os.getenv("PACKED_GENERATION_TOKEN_BUDGET"))
+    pack_token_budget = int(pack_budget) if pack_budget else None
+    sync_store = ChannelSyncStore(cache_path)
+    dedupe_threshold = _optional_float(os.getenv("DEDUPE_THRESHOLD", str(DEFAULT_DEDUPE_THRESHOLD)))
+    duplicate_index = DuplicateIndex(cache_path, dedupe_threshold) if dedupe_threshold is not None else None
+    scheduler = FairScheduler(
+        int(os.getenv("WORKER_SLOTS", DEFAULT_SLOTS)),
+        int(os.getenv("PER_USER_SLOTS", DEFAULT_PER_USER)),
+        int(os.getenv("INTERACTIVE_RESERVED_SLOTS", DEFAULT_RESERVED)),
+    )
 
-    yield  
+    # Shared clients: one HTTP connection pool and one recipe generator
+    # (prompts preloaded, OpenAI client built lazily on first generation).
+    # UPSTREAM_OVERRIDES redirects YouTube traffic, e.g. to load-test stand-ins.
+    http_session = create_session(parse_overrides(os.getenv("UPSTREAM_OVERRIDES")))
+    transcript_api = YouTubeTranscriptApi(http_client=http_session)
+    recipe_generator = RecipeGenerator(openai_api_key, model=os.getenv("RECIPE_MODEL", DEFAULT_MODEL))
+
+    tracing.configure_from_env()
+
+    # Optional periodic sync of followed channels (comma-separated handles)
+    followed = [h.strip() for h in os.getenv("FOLLOWED_CHANNELS", "").split(",") if h.strip()]
+    if followed and db_backend != "sqlite" and not os.getenv("SYNC_USER_ID"):
+        logger.warning("FOLLOWED_CHANNELS is set but SYNC_USER_ID is not, channel sync disabled")
+    elif followed:
+        interval = float(os.getenv("CHANNEL_SYNC_INTERVAL_SECONDS", "3600"))
+        sync_task = asyncio.create_task(_channel_sync_loop(followed, interval))
+
+    startup_seconds = time.perf_counter() - _import_started
+    logger.info("Startup completed in %.1f ms (backend: %s)", startup_seconds * 1000, db_backend)
+
+    yield
+
+    if sync_task is not None:
+        sync_task.cancel()
+        try:
+            await sync_task
+        except asyncio.CancelledError:
+            pass
+        sync_task = None
+    tracing.tracer.shutdown()
+    http_session.close()
+    cache.close()
+    sync_store.close()
+    if duplicate_index is not None:
+        duplicate_index.close()
+        duplicate_index = None
+    neighbor_index = None
+    catalog = None
+    scheduler = None
+    if sqlite_conn is not None:
+        sqlite_conn.close()
+        sqlite_conn = None
 
 app = fastapi.FastAPI(
     title="ChefPanda YouTube Parser",
@@ -369,8 +1027,438 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_http_metrics(request: fastapi.Request, call_next):
+    """
+    Count responses by status code and time every request, keyed by route template.
+    """
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.HTTP_REQUESTS.inc(method=request.method, route=path, status=status)
+        metrics.HTTP_DURATION.observe(time.perf_counter() - started, method=request.method, route=path)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Expose pipeline metrics in the Prometheus text format.
+
+    Includes per-stage latency histograms (YouTube search and lookups,
+    transcript fetch, LLM generation, DB reads and writes), retry and
+    placeholder-failure counters, cache hit/miss counters and HTTP status
+    code counts.
+    """
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def _job_deadline(seconds: Optional[float]) -> Deadline:
+    """
+    Deadline for a scrape job: the request's own budget, else
+    SCRAPE_JOB_DEADLINE_SECONDS, else none.
+    """
+    if seconds is None:
+        configured = os.getenv("SCRAPE_JOB_DEADLINE_SECONDS")
+        seconds = float(configured) if configured else None
+    return Deadline(seconds)
+
+
+def _scheduling_key(authorization: Optional[str], client: Optional[Any]) -> str:
+    """
+    Who a request counts against for per-user scheduling: a digest of its
+    bearer token, else its client address.
+    """
+    if authorization and authorization.startswith("Bearer "):
+        return "token:" + hashlib.sha256(authorization[len("Bearer "):].encode()).hexdigest()[:16]
+    return "client:" + (client.host if client is not None else "unknown")
+
+
+def _work_slot(user: str, lane: str, deadline: Optional[Deadline] = None) -> Any:
+    """
+    Context manager holding a scheduler slot for one video's work (no-op without a scheduler).
+
+    Raises:
+        DeadlineExceeded: If the deadline passes while waiting
+    """
+    if scheduler is None:
+        return nullcontext()
+    return scheduler.slot(user, lane, deadline=deadline)
+
+
+# How often a request's client connection is checked while its job runs
+DISCONNECT_POLL_SECONDS = 1.0
+
+
+@asynccontextmanager
+async def _cancel_on_disconnect(http_request: fastapi.Request, deadline: Deadline) -> AsyncIterator[None]:
+    """
+    Cancel `deadline` if the client disconnects before the block finishes.
+
+    Work running in threads under the deadline then stops at its next
+    check: no new transcript fetch, LLM call or scheduler wait starts, and
+    streamed completions are closed.
+    """
+    async def watch() -> None:
+        while not await http_request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+        logger.info("Client disconnected from %s, cancelling its job", http_request.url.path)
+        metrics.CANCELLED_JOBS.inc(route=http_request.url.path)
+        deadline.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+async def _cancel_when_abandoned(lines: Iterator[str], deadline: Deadline, route: str) -> AsyncIterator[str]:
+    """
+    Stream `lines` from the threadpool, cancelling `deadline` if the
+    response stops early (the server cancels it when the client disconnects).
+    """
+    finished = False
+    try:
+        async for line in iterate_in_threadpool(lines):
+            yield line
+        finished = True
+    finally:
+        if not finished:
+            logger.info("Client disconnected from %s, cancelling its job", route)
+            metrics.CANCELLED_JOBS.inc(route=route)
+            deadline.cancel()
+
+
+def _linked_recipe(video: Dict[str, Any]) -> Tuple[Optional[Signature], Optional[Dict[str, Any]]]:
+    """
+    Look up an already generated recipe for a near-duplicate of this video.
+
+    Returns the transcript's signature (None when dedupe is off) and, if a
+    duplicate was found, its recipe relabelled for this video with
+    duplicate_of and similarity fields. The link itself is recorded by
+    _record_link once the recipe is stored.
+    """
+    if duplicate_index is None:
+        return None, None
+    signature = duplicate_index.signature(video["snippets"])
+    match = duplicate_index.find(signature, exclude=video["video_id"])
+    if match is None:
+        return signature, None
+    metrics.DUPLICATES_LINKED.inc()
+    tracing.set_attributes(duplicate_of=match["video_id"], similarity=round(match["similarity"], 3))
+    return signature, {
+        **match["recipe"],
+        "video_id": video["video_id"],
+        "duplicate_of": match["video_id"],
+        "similarity": match["similarity"],
+    }
+
+
+def _record_link(recipe_data: Dict[str, Any]) -> None:
+    """
+    Record that a stored near-duplicate's video resolves to the original recipe.
+
+    Called only after the recipe was persisted, so a failed store never
+    leaves a link to a recipe that does not exist.
+    """
+    if duplicate_index is not None and recipe_data.get("duplicate_of"):
+        duplicate_index.link(recipe_data["video_id"], recipe_data["duplicate_of"], recipe_data["similarity"])
+
+
+def _index_recipe(video_id: str, signature: Optional[Signature], recipe_data: Dict[str, Any]) -> None:
+    """Make a generated recipe findable by later near-duplicates."""
+    if duplicate_index is not None and signature is not None:
+        duplicate_index.add(video_id, signature, recipe_data)
+
+
+def _iter_recipes(
+    scraper: YouTubeScraper,
+    videos: Iterable[Tuple[str, str]],
+    deadline: Optional[Deadline] = None,
+    processed: Optional[List[str]] = None,
+    user: str = "system",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch transcripts and generate recipes one video at a time, yielding each recipe.
+
+    `videos` is consumed lazily (e.g. YouTubeScraper.iter_listed_videos), so
+    only the transcripts in flight are held in memory, never the whole
+    listing's. Each video runs in its own trace span so slow or failing
+    videos can be told apart. Videos without a transcript are skipped
+    rather than sent to the LLM with an empty prompt. Each video's work
+    holds a bulk-lane scheduler slot for `user`, so interactive requests
+    and other users' imports are served in between. Once the deadline
+    passes or is cancelled (also while waiting for a slot) no new video or
+    LLM request is started, and fetched videos are dropped on cancellation.
+
+    With TRANSCRIPT_SCORE_CUTOFF set, transcripts that score too low on
+    recipe keywords are skipped before the LLM call. Near-duplicates of an
+    already generated recipe reuse it instead of calling the LLM. With
+    PACKED_GENERATION_TOKEN_BUDGET set, transcripts are buffered until a
+    pack's worth is fetched, and short ones share generation requests.
+
+    When `processed` is given, the IDs of videos that are done for good
+    (recipe generated or linked, transcript permanently unavailable, or
+    skipped as not a recipe) are appended to it.
+    """
+    recipe_gen = _recipe_generator()
+    fetched: List[Dict[str, Any]] = []
+    fetched_tokens = 0
+    signatures: Dict[str, Optional[Signature]] = {}
+
+    def generate_fetched() -> Iterator[Dict[str, Any]]:
+        try:
+            with _work_slot(user, BULK, deadline):
+                generated, errors = recipe_gen.generate_recipes_packed(
+                    [str(video) for video in fetched], pack_token_budget, deadline
+                )
+        except DeadlineExceeded:
+            logger.warning("Job deadline reached waiting for a worker slot, dropping %d fetched videos", len(fetched))
+            tracing.set_attributes(deadline_reached=True)
+            fetched.clear()
+            return
+        for video in fetched:
+            recipe = generated.get(video["video_id"])
+            if recipe is None:
+                continue
+            recipe_data = recipe.model_dump()
+            _index_recipe(video["video_id"], signatures.pop(video["video_id"]), recipe_data)
+            if processed is not None:
+                processed.append(video["video_id"])
+            yield recipe_data
+        for video_id, error in errors.items():
+            logger.warning("Error generating recipe for video %s: %s", video_id, error)
+        fetched.clear()
+
+    for video_id, title in videos:
+        if deadline is not None and deadline.expired():
+            logger.warning("Job deadline reached, skipping remaining videos")
+            tracing.set_attributes(deadline_reached=True)
+            break
+        recipe_data: Optional[Dict[str, Any]] = None
+        try:
+            slot = _work_slot(user, BULK, deadline)
+            with slot, tracing.start_span("video", video_id=video_id, title=title) as span:
+                video = scraper.process_video(video_id, title, deadline)
+                if video.get("error"):
+                    span.set_attribute("skipped", video["error"])
+                    if processed is not None and video.get("kind") == "permanent":
+                        processed.append(video_id)
+                    continue
+                if transcript_score_cutoff is not None:
+                    score = score_transcript(video["snippets"])
+                    span.set_attribute("transcript_score", round(score, 3))
+                    if score < transcript_score_cutoff:
+                        span.set_attribute("skipped", "Low transcript recipe score")
+                        metrics.PREFILTER_SKIPPED.inc(stage="transcript")
+                        if processed is not None:
+                            processed.append(video_id)
+                        continue
+                signature, linked = _linked_recipe(video)
+                if linked is not None:
+                    span.set_attribute("skipped", "Near-duplicate of a generated recipe")
+                    recipe_data = linked
+                    if processed is not None:
+                        processed.append(video_id)
+                elif pack_token_budget is not None:
+                    signatures[video_id] = signature
+                    fetched.append(video)
+                    fetched_tokens += estimate_tokens(video["snippets"])
+                else:
+                    try:
+                        recipe_data = recipe_gen.generate_recipe(str(video), deadline).model_dump()
+                        _index_recipe(video_id, signature, recipe_data)
+                        if processed is not None:
+                            processed.append(video_id)
+                    except Exception as e:
+                        span.record_exception(e)
+                        logger.warning("Error generating recipe for video %s: %s", video_id, e)
+        except DeadlineExceeded:
+            logger.warning("Job deadline reached waiting for a worker slot, skipping remaining videos")
+            tracing.set_attributes(deadline_reached=True)
+            break
+        if recipe_data is not None:
+            yield recipe_data
+        if fetched and (fetched_tokens >= pack_token_budget or len(fetched) >= MAX_PACK_SIZE):
+            yield from generate_fetched()
+            fetched_tokens = 0
+
+    if fetched and not (deadline is not None and deadline.cancelled):
+        yield from generate_fetched()
+
+
+def _generate_recipes(
+    scraper: YouTubeScraper,
+    videos: Iterable[Tuple[str, str]],
+    deadline: Optional[Deadline] = None,
+    processed: Optional[List[str]] = None,
+    user: str = "system",
+) -> List[Dict[str, Any]]:
+    """Collect _iter_recipes into a list, for responses that return every recipe at once."""
+    return list(_iter_recipes(scraper, videos, deadline, processed, user))
+
+
+def _started(videos: Iterator[Tuple[str, str]]) -> Optional[Iterator[Tuple[str, str]]]:
+    """
+    Pull the first listed video so listing errors surface before generation starts.
+
+    Returns:
+        An iterator over the same videos, or None if there are none
+    """
+    first = next(videos, None)
+    return None if first is None else itertools.chain([first], videos)
+
+
+def _sync_channel(
+    scraper: YouTubeScraper,
+    channel_id: str,
+    deadline: Optional[Deadline] = None,
+    store: Optional[Callable[[Dict[str, Any]], None]] = None,
+    user: str = "system",
+) -> List[Dict[str, Any]]:
+    """
+    Generate recipes only for uploads that are new since `user` last synced the channel.
+
+    Lists the uploads playlist down to the stored watermark, skips videos
+    already processed, and records the outcome so the next run picks up
+    where this one stopped (including videos cut off by the deadline).
+    Sync state is kept per `user`, so each caller sees every new upload
+    once, independently of the others and of the background sync.
+    When `store` is given, each recipe is passed to it as soon as it is
+    generated. Work is scheduled in the bulk lane for `user`.
+    """
+    if sync_store is None:
+        raise RuntimeError("Channel sync store is not initialized")
+    state = sync_store.get_state(user, channel_id)
+    uploads = scraper.fetch_uploads(
+        channel_id,
+        since=state["last_published_at"] if state else None,
+        known_ids=sync_store.processed_ids(user, channel_id),
+    )
+    tracing.set_attributes(channel_id=channel_id, new_uploads=len(uploads))
+
+    listed = [(video_id, title) for video_id, title, _ in uploads]
+    videos = scraper.prefilter(listed)
+    # Videos the prefilter rejected are done: they never need listing again
+    kept = {video_id for video_id, _ in videos}
+    processed = [video_id for video_id, _ in listed if video_id not in kept]
+    recipes = []
+    for recipe_data in _iter_recipes(scraper, videos, deadline, processed, user=user):
+        if store is not None:
+            store(recipe_data)
+        recipes.append(recipe_data)
+    sync_store.record_sync(user, channel_id, uploads, processed)
+    return recipes
+
+
+# Scheduling key of the background channel sync
+CHANNEL_SYNC_USER = "channel-sync"
+
+
+def _sync_followed_channel(handle: str) -> int:
+    """
+    Sync one followed channel and store its new recipes; returns how many were stored.
+
+    Recipes are stored for LOCAL_USER_ID in SQLite mode, or for
+    SYNC_USER_ID through the service client in Supabase mode, as each
+    one is generated.
+    """
+    if db_backend != "sqlite" and not os.getenv("SYNC_USER_ID"):
+        # Syncing would mark the uploads processed without storing them anywhere
+        logger.warning("SYNC_USER_ID not set, skipping sync of %s", handle)
+        return 0
+    with tracing.start_span("channel_sync", handle=handle):
+        scraper = _make_scraper(os.getenv("CHANNEL_SYNC_LANGUAGE", "en"))
+        channel_id = scraper.get_channel_id_by_handle(handle)
+
+        def store(recipe_data: Dict[str, Any]) -> None:
+            if db_backend == "sqlite":
+                _save_recipe_sqlite(os.getenv("LOCAL_USER_ID", "local-user"), recipe_data)
+            else:
+                _store_recipe_supabase(supabase, os.getenv("SYNC_USER_ID"), recipe_data)
+            _record_link(recipe_data)
+
+        return len(_sync_channel(scraper, channel_id, _job_deadline(None), store, CHANNEL_SYNC_USER))
+
+
+async def _channel_sync_loop(handles: List[str], interval: float) -> None:
+    """
+    Keep followed channels up to date, one channel at a time, every `interval` seconds.
+
+    Syncs run in a worker thread so they don't block request handling. All
+    handles are resolved once up front to warm the channel ID cache.
+    """
+    await asyncio.to_thread(_make_scraper("en").warm_channel_ids, handles)
+    while True:
+        for handle in handles:
+            try:
+                stored = await asyncio.to_thread(_sync_followed_channel, handle)
+                logger.info("Synced %s: %d new recipes", handle, stored)
+            except Exception as e:
+                logger.warning("Channel sync failed for %s: %s", handle, e)
+        await asyncio.sleep(interval)
+
+
+REGENERATION_USER = "regenerate"
+
+
+@tracing.traced("regenerate_recipes")
+def _regenerate_stale_sqlite(
+    language: str, limit: Optional[int], concurrency: int, deadline: Deadline, dry_run: bool
+) -> Dict[str, Any]:
+    """
+    Re-generate the stored recipes made with another prompt or model than the current ones.
+
+    Transcripts come from the transcript cache when they are still in it.
+    Every video also holds a bulk-lane scheduler slot, so the job never
+    runs more than PER_USER_SLOTS videos at once, whatever `concurrency`.
+    """
+    if sqlite_conn is None:
+        raise RuntimeError("SQLite connection is not initialized")
+    recipe_gen = _recipe_generator()
+    version = {"prompt_hash": recipe_gen.prompt_hash, "model": recipe_gen.model}
+    if dry_run:
+        stale = regenerate.stale_recipes(sqlite_conn, recipe_gen.prompt_hash, recipe_gen.model, limit)
+        return {**version, "stale": len(stale)}
+    scraper = _make_scraper(language)
+
+    def generate(video_id: str, title: Optional[str]) -> Dict[str, Any]:
+        with _work_slot(REGENERATION_USER, BULK, deadline), tracing.start_span("video", video_id=video_id):
+            video = scraper.process_video(video_id, title or "", deadline)
+            if video.get("error"):
+                raise RuntimeError(f"{video['error']}: {video['reason']}")
+            recipe_data = recipe_gen.generate_recipe(str(video), deadline).model_dump()
+        if duplicate_index is not None:
+            _index_recipe(video_id, duplicate_index.signature(video["snippets"]), recipe_data)
+        return recipe_data
+
+    def reindex(recipe_id: int) -> None:
+        if neighbor_index is not None:
+            try:
+                neighbor_index.add(recipe_id)
+            except sqlite3.Error as e:
+                logger.warning("Could not index recipe %s for similar recipes: %s", recipe_id, e)
+
+    counts = regenerate.regenerate_stale(
+        sqlite_conn, generate, recipe_gen.prompt_hash, recipe_gen.model,
+        concurrency, limit, deadline, on_replaced=reindex, lock=sqlite_write_lock,
+    )
+    if counts["regenerated"]:
+        _load_catalog()
+    tracing.set_attributes(**counts)
+    return {**version, **counts}
+
+
 @app.post("/scrape_channel")
-async def scrape_channel(request: ScrapeRequest) -> List[Dict[str, Any]]:
+async def scrape_channel(
+    request: ScrapeRequest, http_request: fastapi.Request, authorization: str = Header(None)
+) -> List[Dict[str, Any]]:
     """
     Scrape recipes from a YouTube channel.
     
@@ -379,42 +1467,43 @@ async def scrape_channel(request: ScrapeRequest) -> List[Dict[str, Any]]:
             - handle: YouTube channel handle (e.g. '@yooxicman')
             - language: Language code (default: 'en')
             - quantity: Number of videos to scrape (default: 200)
+            - incremental: Only process uploads new since the last sync
             
     Returns:
-        List[Dict[str, Any]]: List of recipe dictionaries
-    """
-    try:
-        scraper = YouTubeScraper(yt_api_key, request.language, request.quantity)
-        channel_id = scraper.get_channel_id_by_handle(request.handle)
-        result = scraper.process_videos(type="channel_id", arg=channel_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+        List[Dict[str, Any]]: List of recipe dictionaries (in incremental
+        mode, only those for new uploads, possibly none)
 
-    try:
-        recipes = []
-        recipe_gen = RecipeGenerator(openai_api_key) 
-        
-        # Process videos in batches to avoid timeouts
-        batch_size = 1  # Process one video at a time to ensure reliability
-        for i in range(0, len(result), batch_size):
-            batch = result[i:i + batch_size]
-            for video in batch:
-                try:
-                    recipe = recipe_gen.generate_recipe(str(video))
-                    recipes.append(recipe.model_dump())
-                except Exception as e:
-                    print(f"Error processing video {i}: {str(e)}")
-                    continue
-                
-        if not recipes:
-            raise HTTPException(status_code=404, detail="No recipes could be generated from the videos")
-            
-        return recipes
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing recipes: {str(e)}")
+    Videos are processed in worker threads through the scheduler's bulk
+    lane; the job is cancelled if the client disconnects.
+    """
+    user = _scheduling_key(authorization, http_request.client)
+    deadline = _job_deadline(request.deadline_seconds)
+    with tracing.start_span("scrape_channel", handle=request.handle, quantity=request.quantity):
+        async with _cancel_on_disconnect(http_request, deadline):
+            try:
+                scraper = _make_scraper(request.language, request.quantity)
+                channel_id = await asyncio.to_thread(scraper.get_channel_id_by_handle, request.handle)
+                if request.incremental:
+                    return await asyncio.to_thread(_sync_channel, scraper, channel_id, deadline, None, user)
+                listed = scraper.iter_listed_videos(type="channel_id", arg=channel_id)
+                videos = await asyncio.to_thread(_started, listed) or iter(())
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+
+            try:
+                recipes = await asyncio.to_thread(_generate_recipes, scraper, videos, deadline, None, user)
+                if not recipes:
+                    raise HTTPException(status_code=404, detail="No recipes could be generated from the videos")
+                return recipes
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error processing recipes: {str(e)}")
 
 @app.post("/scrape_query")
-async def scrape_query(request: QueryRequest) -> List[Dict[str, Any]]:
+async def scrape_query(
+    request: QueryRequest, http_request: fastapi.Request, authorization: str = Header(None)
+) -> List[Dict[str, Any]]:
     """
     Search and scrape recipes based on a query.
     
@@ -426,166 +1515,413 @@ async def scrape_query(request: QueryRequest) -> List[Dict[str, Any]]:
             
     Returns:
         List[Dict[str, Any]]: List of recipe dictionaries
+
+    Videos are processed in worker threads through the scheduler's bulk
+    lane; the job is cancelled if the client disconnects.
     """
-    try:
-        scraper = YouTubeScraper(yt_api_key, request.language, request.quantity)
-        result = scraper.process_videos(type="query", arg=request.query)
-        if not result:
-            raise HTTPException(status_code=404, detail="No videos found for query")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+    user = _scheduling_key(authorization, http_request.client)
+    deadline = _job_deadline(request.deadline_seconds)
+    with tracing.start_span("scrape_query", query=request.query, quantity=request.quantity):
+        async with _cancel_on_disconnect(http_request, deadline):
+            try:
+                scraper = _make_scraper(request.language, request.quantity)
+                videos = await asyncio.to_thread(_started, scraper.iter_listed_videos(type="query", arg=request.query))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+            if videos is None:
+                raise HTTPException(status_code=404, detail="No videos found for query")
+
+            try:
+                recipes = await asyncio.to_thread(_generate_recipes, scraper, videos, deadline, None, user)
+                if not recipes:
+                    raise HTTPException(status_code=404, detail="No recipes could be generated from the videos")
+                return recipes
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error processing recipes: {str(e)}")
+
+def _authorized_user_id(authorization: Optional[str]) -> Optional[str]:
+    """
+    Check the Authorization header before any work is done.
 
-    try:
-        recipes = []
-        recipe_gen = RecipeGenerator(openai_api_key)
-        
-        # Process videos in batches to avoid timeouts
-        batch_size = 1  # Process one video at a time to ensure reliability
-        for i in range(0, len(result), batch_size):
-            batch = result[i:i + batch_size]
-            for video in batch:
-                try:
-                    recipe = recipe_gen.generate_recipe(str(video))
-                    recipes.append(recipe.model_dump())
-                except Exception as e:
-                    print(f"Error processing video {i}: {str(e)}")
-                    continue
-                
-        if not recipes:
-            raise HTTPException(status_code=404, detail="No recipes could be generated from the videos")
-            
-        return recipes
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing recipes: {str(e)}")
+    Returns the local user id when SQLite mode runs without a bearer
+    token, or None when the user is derived from the token at store time.
 
-@app.post("/scrape_video_id")
-async def scrape_video_id(request: VideoRequest, authorization: str = Header(None)) -> Dict[str, Any]:
+    Raises:
+        HTTPException: 401 if Supabase mode has no bearer token
+    """
     if not authorization or not authorization.startswith("Bearer "):
         # For local SQLite mode we don't strictly need auth, but keep this for compatibility
         if db_backend == "sqlite":
             # Use a fixed local user id to keep logic simple
-            user_id = os.getenv(
+            return os.getenv(
                 "LOCAL_USER_ID",
                 "local-user",
             )
-        else:
-            raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
+    return None  # will be set when storing
+
+
+def _persist_recipe(authorization: Optional[str], user_id: Optional[str], recipe_data: Dict[str, Any]) -> None:
+    """
+    Store a generated recipe for the requesting user in the configured backend.
+
+    A recipe linked to a near-duplicate whose recipe is already stored in
+    SQLite is not stored again, only its generation is logged; lookups
+    resolve through the link, recorded once the store succeeded.
+    """
+    if db_backend == "sqlite":
+        if user_id is None:
+            # If we reached here with a bearer token in SQLite mode, still derive a stable user id
+            token = authorization.split(" ")[1] if authorization else ""
+            user_id = os.getenv("LOCAL_USER_ID", token or "local-user")
+        _save_recipe_sqlite(user_id, recipe_data)
     else:
-        user_id = None  # will be set below when needed
+        if supabase is None or create_client is None:
+            raise RuntimeError("Supabase client is not initialized")
 
-    try:
-        scraper = YouTubeScraper(yt_api_key, request.language)
-        results = scraper.process_videos(type="id", arg=request.id)
+        token = authorization.split(" ")[1]  # type: ignore[union-attr]
+        user = supabase.auth.get_user(token)
+        user_id = user.user.id
 
-        if not results:
-            raise HTTPException(status_code=404, detail="Video not found or no transcript available")
+        user_supabase = create_client(
+            os.getenv("SUPABASE_URL"),
+            os.getenv("SUPABASE_KEY"),
+        )
+        user_supabase.auth.set_session(token, "")
 
-        # 🔹 Generate recipe
-        recipe_gen = RecipeGenerator(openai_api_key)
-        recipe = recipe_gen.generate_recipe(str(results[0]))
-        recipe_data = recipe.model_dump()
+        _store_recipe_supabase(user_supabase, user_id, recipe_data)
 
-        # 🔹 Persist to the configured backend
-        if db_backend == "sqlite":
-            if user_id is None:
-                # If we reached here with a bearer token in SQLite mode, still derive a stable user id
-                token = authorization.split(" ")[1] if authorization else ""
-                user_id = os.getenv("LOCAL_USER_ID", token or "local-user")
-            _store_recipe_sqlite(user_id, recipe_data)
-        else:
-            if supabase is None or create_client is None:
-                raise RuntimeError("Supabase client is not initialized")
+    _record_link(recipe_data)
 
-            token = authorization.split(" ")[1]
-            user = supabase.auth.get_user(token)
-            user_id = user.user.id
 
-            user_supabase = create_client(
-                os.getenv("SUPABASE_URL"),
-                os.getenv("SUPABASE_KEY"),
-            )
-            user_supabase.auth.set_session(token, "")
-
-            # 🔹 Insert into recipes table
-            recipe_insert_data = {
-                "title": recipe_data["title"],
-                "video_id": recipe_data["video_id"],
-                "servings": recipe_data.get("servings"),
-                "prep_time": recipe_data.get("prep_time"),
-                "cook_time": recipe_data.get("cook_time"),
-                "calories": recipe_data["nutritional_info"].get("calories"),
-                "protein": recipe_data["nutritional_info"].get("protein"),
-                "carbs": recipe_data["nutritional_info"].get("carbs"),
-                "fat": recipe_data["nutritional_info"].get("fat"),
-            }
-            recipe_response = user_supabase.table("recipes").insert(recipe_insert_data).execute()
-            recipe_id = recipe_response.data[0]["id"]
-
-            # 🔹 Insert ingredients
-            ingredients_data = [
-                {
-                    "recipe_id": recipe_id,
-                    "name": ing["name"],
-                    "quantity": ing["quantity"],
-                }
-                for ing in recipe_data["ingredients"]
-            ]
-            user_supabase.table("ingredients").insert(ingredients_data).execute()
-
-            # 🔹 Insert steps
-            steps_data = [
-                {
-                    "recipe_id": recipe_id,
-                    "step_number": step["step_number"],
-                    "description": step["description"],
-                }
-                for step in recipe_data["steps"]
-            ]
-            user_supabase.table("steps").insert(steps_data).execute()
-
-            # 🔹 Log generation last
-            user_supabase.table("recipe_generations").insert(
-                {
-                    "user_id": user_id,
-                }
-            ).execute()
+def _fetch_single_video(request: VideoRequest, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Look up one video and fetch its transcript.
+
+    Raises:
+        HTTPException: 404 if the video does not exist or has no transcript
+    """
+    scraper = _make_scraper(request.language)
+    videos = scraper.list_videos(type="id", arg=request.id)
+    deadline = deadline or _job_deadline(request.deadline_seconds)
+    video = scraper.process_video(*videos[0], deadline=deadline) if videos else None
+
+    if video is None or video.get("error"):
+        raise HTTPException(status_code=404, detail="Video not found or no transcript available")
+    return video
+
+
+def _video_error(e: Exception) -> HTTPException:
+    if isinstance(e, Cancelled):
+        # nginx's "client closed request"; nobody reads it, but logs and metrics do
+        return HTTPException(status_code=499, detail=str(e))
+    if isinstance(e, DeadlineExceeded):
+        return HTTPException(status_code=504, detail=str(e))
+    if 'Invalid JWT' in str(e):
+        return HTTPException(status_code=401, detail="Invalid authentication token")
+    return HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
+
+
+def _scrape_single_video(
+    request: VideoRequest, authorization: Optional[str], user_id: Optional[str], user: str, deadline: Deadline
+) -> Dict[str, Any]:
+    """
+    Fetch, generate and store one video's recipe, holding an interactive-lane slot for the work.
+    """
+    with _work_slot(user, INTERACTIVE, deadline):
+        video = _fetch_single_video(request, deadline)
+
+        # 🔹 Generate recipe, unless a near-duplicate already has one
+        signature, recipe_data = _linked_recipe(video)
+        if recipe_data is None:
+            recipe_gen = _recipe_generator()
+            recipe = recipe_gen.generate_recipe(str(video), deadline)
+            recipe_data = recipe.model_dump()
+            _index_recipe(request.id, signature, recipe_data)
+
+    # A recipe nobody will receive is not stored either
+    deadline.check()
+
+    # 🔹 Persist to the configured backend
+    _persist_recipe(authorization, user_id, recipe_data)
+
+    return recipe_data
 
-        return recipe_data
 
+@app.post("/scrape_video_id")
+async def scrape_video_id(
+    request: VideoRequest, http_request: fastapi.Request, authorization: str = Header(None)
+) -> Dict[str, Any]:
+    user_id = _authorized_user_id(authorization)
+    user = _scheduling_key(authorization, http_request.client)
+    deadline = _job_deadline(request.deadline_seconds)
+
+    with tracing.start_span("video", video_id=request.id):
+        try:
+            # In a worker thread, so waiting for a slot never blocks the event loop
+            async with _cancel_on_disconnect(http_request, deadline):
+                return await asyncio.to_thread(_scrape_single_video, request, authorization, user_id, user, deadline)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise _video_error(e)
+
+
+@app.post("/scrape_video_id/stream")
+async def scrape_video_id_stream(
+    request: VideoRequest, http_request: fastapi.Request, authorization: str = Header(None)
+) -> StreamingResponse:
+    """
+    Like /scrape_video_id, but streams the recipe as it is generated.
+
+    The response is NDJSON, one event per line: {"event": "field", "name",
+    "value"} for the title and other top-level fields, {"event":
+    "ingredient"} and {"event": "step"} as each one completes, then
+    {"event": "recipe", "value": ...} with the validated, stored recipe, or
+    {"event": "error", "detail": ...} if generation failed midway. Lookup
+    and transcript errors are returned as HTTP errors before streaming starts.
+    The fetch and the generation each hold an interactive-lane slot, and
+    a client disconnect cancels whichever is running.
+    """
+    user_id = _authorized_user_id(authorization)
+    user = _scheduling_key(authorization, http_request.client)
+    deadline = _job_deadline(request.deadline_seconds)
+
+    def fetch() -> Dict[str, Any]:
+        with _work_slot(user, INTERACTIVE, deadline):
+            return _fetch_single_video(request, deadline)
+
+    try:
+        async with _cancel_on_disconnect(http_request, deadline):
+            video = await asyncio.to_thread(fetch)
     except HTTPException:
         raise
     except Exception as e:
-        if 'Invalid JWT' in str(e):
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
+        raise _video_error(e)
+
+    def events() -> Iterator[str]:
+        with tracing.start_span("video", video_id=request.id, streamed=True) as span:
+            try:
+                signature, linked = _linked_recipe(video)
+                if linked is not None:
+                    _persist_recipe(authorization, user_id, linked)
+                    yield json.dumps({"event": "recipe", "value": linked}) + "\n"
+                    return
+                with _work_slot(user, INTERACTIVE, deadline):
+                    for event in _recipe_generator().stream_recipe(str(video), deadline):
+                        if event["event"] == "recipe":
+                            _index_recipe(request.id, signature, event["value"])
+                            _persist_recipe(authorization, user_id, event["value"])
+                        yield json.dumps(event) + "\n"
+            except Exception as e:
+                span.record_exception(e)
+                yield json.dumps({"event": "error", "detail": f"Error processing video: {str(e)}"}) + "\n"
+
+    # The sync iterator is run in the threadpool, so generation never blocks the event loop
+    return StreamingResponse(
+        _cancel_when_abandoned(tracing.bind_context(events()), deadline, http_request.url.path),
+        media_type="application/x-ndjson"
+    )
+
+
+def _range_filters(
+    min_total_minutes: Optional[int] = Query(None, ge=0),
+    max_total_minutes: Optional[int] = Query(None, ge=0),
+    min_calories: Optional[float] = None,
+    max_calories: Optional[float] = None,
+    min_protein: Optional[float] = None,
+    max_protein: Optional[float] = None,
+    min_carbs: Optional[float] = None,
+    max_carbs: Optional[float] = None,
+    min_fat: Optional[float] = None,
+    max_fat: Optional[float] = None,
+) -> Dict[str, Range]:
+    """Range filter query parameters of the recipe listings, as (min, max) by column."""
+    bounds = {
+        "total_minutes": (min_total_minutes, max_total_minutes),
+        "calories": (min_calories, max_calories),
+        "protein": (min_protein, max_protein),
+        "carbs": (min_carbs, max_carbs),
+        "fat": (min_fat, max_fat),
+    }
+    return {field: bounds[field] for field in RANGE_FIELDS if bounds[field] != (None, None)}
 
 
 @app.get("/recipes")
-async def list_recipes() -> List[Dict[str, Any]]:
+async def list_recipes(ranges: Dict[str, Range] = Depends(_range_filters)) -> List[Dict[str, Any]]:
     """
     List all recipes stored in the backend.
 
+    Optional min_/max_ bounds on total_minutes, calories, protein, carbs
+    and fat narrow the list in the database; recipes missing a bounded
+    value are left out.
     Currently implemented for SQLite only.
     """
     try:
         if db_backend != "sqlite":
             raise HTTPException(status_code=501, detail="Recipe listing not implemented for this backend")
-        return _fetch_all_recipes_sqlite()
+        return _fetch_all_recipes_sqlite(ranges)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching recipes: {str(e)}")
 
 
+@app.get("/recipes/summary")
+async def list_recipe_summaries(
+    q: Optional[str] = None,
+    ranges: Dict[str, Range] = Depends(_range_filters),
+    limit: int = Query(50, gt=0, le=500),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """
+    List recipe summaries (no ingredients or steps), newest first.
+
+    Filters by title substring and the same ranges as /recipes. Answered
+    from the in-memory catalog; falls back to SQLite if it is over its
+    memory budget.
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite":
+            raise HTTPException(status_code=501, detail="Recipe listing not implemented for this backend")
+        if catalog is not None and catalog.complete:
+            total, recipes = catalog.query(q, ranges, offset, limit)
+        else:
+            total, recipes = _query_recipe_summaries_sqlite(q, ranges, offset, limit)
+        return {"total": total, "recipes": recipes}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching recipes: {str(e)}")
+
+
+@app.get("/recipes/changes")
+async def list_recipe_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, gt=0, le=5000),
+) -> Dict[str, Any]:
+    """
+    Recipes changed or deleted since change sequence `since`, for
+    incremental client sync.
+
+    Clients start from 0 (every recipe), then pass back `next_since`,
+    repeating while `has_more` is set. A client already up to date gets
+    an empty page. Each changed recipe appears once, in its current
+    state, and deleted ones are listed as ids; with `reset` set the
+    client must drop its copy and start over from 0.
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite":
+            raise HTTPException(status_code=501, detail="Recipe changes not implemented for this backend")
+        return _fetch_recipe_changes_sqlite(since, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching recipe changes: {str(e)}")
+
+
+@app.get("/recipes/export")
+async def export_recipes(
+    format: str = Query("jsonl", pattern="^(jsonl|parquet)$"),
+    after_id: int = Query(0, ge=0),
+) -> StreamingResponse:
+    """
+    Stream the recipe corpus with ingredients and steps, in id order.
+
+    Recipes are read and encoded one batch at a time, so memory stays flat
+    however large the corpus is. An interrupted JSONL download can be
+    resumed with `after_id` set to the last id received. Parquet needs
+    the optional pyarrow package.
+    """
+    try:
+        if db_backend == "sqlite":
+            records = corpus.iter_recipes_sqlite(sqlite_conn, after_id)
+        elif supabase is not None:
+            records = corpus.iter_recipes_supabase(supabase, after_id)
+        else:
+            raise HTTPException(status_code=503, detail="No database configured")
+        if format == "parquet":
+            corpus.load_pyarrow()
+            return StreamingResponse(
+                tracing.bind_context(corpus.iter_parquet_chunks(records)),
+                media_type="application/vnd.apache.parquet",
+                headers={"Content-Disposition": 'attachment; filename="recipes.parquet"'},
+            )
+        return StreamingResponse(tracing.bind_context(corpus.iter_jsonl_lines(records)), media_type="application/x-ndjson")
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting recipes: {str(e)}")
+
+
+@app.post("/recipes/nutrition/recompute")
+async def recompute_nutrition() -> Dict[str, Any]:
+    """
+    Recompute nutritional info for all stored recipes from their ingredients.
+
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite":
+            raise HTTPException(status_code=501, detail="Nutrition recompute not implemented for this backend")
+        return {"updated": _recompute_nutrition_sqlite()}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recomputing nutrition: {str(e)}")
+
+
+@app.post("/recipes/regenerate")
+async def regenerate_recipes(
+    limit: Optional[int] = Query(None, gt=0),
+    concurrency: int = Query(regenerate.DEFAULT_CONCURRENCY, gt=0, le=32),
+    language: str = "en",
+    deadline_seconds: Optional[float] = Query(None, gt=0),
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Re-generate only the recipes whose prompt hash or model differ from the current ones.
+
+    Each new recipe replaces the old one atomically and keeps its id;
+    videos that fail keep their old recipe and are retried by the next
+    run. With dry_run, only counts the stale recipes.
+
+    Returns:
+        The current prompt_hash and model, and the job's counts
+        ("stale", "regenerated", "failed", "skipped")
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite":
+            raise HTTPException(status_code=501, detail="Recipe regeneration not implemented for this backend")
+        deadline = _job_deadline(deadline_seconds)
+        return await asyncio.to_thread(_regenerate_stale_sqlite, language, limit, concurrency, deadline, dry_run)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error regenerating recipes: {str(e)}")
+
+
 @app.get("/recipes/video/{video_id}")
 async def get_recipe_by_video(video_id: str) -> Dict[str, Any]:
     """
     Get a single recipe by its YouTube video_id.
+
+    A video linked to a near-duplicate resolves to that video's recipe.
     """
     try:
         if db_backend != "sqlite":
             raise HTTPException(status_code=501, detail="Recipe lookup not implemented for this backend")
         recipe = _fetch_recipe_by_video_sqlite(video_id)
+        canonical = duplicate_index.canonical(video_id) if recipe is None and duplicate_index is not None else None
+        if canonical is not None:
+            recipe = _fetch_recipe_by_video_sqlite(canonical)
         if recipe is None:
             raise HTTPException(status_code=404, detail="Recipe not found")
         return recipe
@@ -595,6 +1931,58 @@ async def get_recipe_by_video(video_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error fetching recipe: {str(e)}")
 
 
+@app.get("/recipes/{recipe_id}/scale")
+async def scale_recipe(recipe_id: int, servings: float = Query(..., gt=0)) -> Dict[str, Any]:
+    """
+    Get a recipe's ingredients scaled to a different number of servings.
+    """
+    try:
+        if db_backend != "sqlite":
+            raise HTTPException(status_code=501, detail="Recipe scaling not implemented for this backend")
+        recipe = _scale_recipe_sqlite(recipe_id, servings)
+        if recipe is None:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        return recipe
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error scaling recipe: {str(e)}")
+
+
+@app.get("/recipes/{recipe_id}/similar")
+async def get_similar_recipes(recipe_id: int, limit: int = Query(DEFAULT_NEIGHBORS, gt=0)) -> List[Dict[str, Any]]:
+    """
+    Get the recipes most similar to a recipe, from the precomputed neighbor table.
+
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite" or neighbor_index is None:
+            raise HTTPException(status_code=501, detail="Similar recipes not implemented for this backend")
+        return neighbor_index.similar(recipe_id, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching similar recipes: {str(e)}")
+
+
+@app.post("/recipes/similar/rebuild")
+async def rebuild_similar_recipes() -> Dict[str, Any]:
+    """
+    Recompute similar-recipe neighbors for all stored recipes in one batch.
+
+    Currently implemented for SQLite only.
+    """
+    try:
+        if db_backend != "sqlite" or neighbor_index is None:
+            raise HTTPException(status_code=501, detail="Similar recipes not implemented for this backend")
+        return {"indexed": neighbor_index.rebuild()}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding similar recipes: {str(e)}")
+
+
 @app.get("/status")
 async def get_status() -> Dict[str, Any]:
     """
@@ -605,6 +1993,8 @@ async def get_status() -> Dict[str, Any]:
             - service: Overall service status
             - youtube_api: YouTube API key status
             - openai_api: OpenAI API key status
+            - startup_ms: Time from import until the app was ready to serve
+            - scheduler: Running and waiting work per lane
     """
     try:
         # Basic validation of API keys
@@ -615,7 +2005,9 @@ async def get_status() -> Dict[str, Any]:
             "service": "healthy",
             "youtube_api": yt_status,
             "openai_api": openai_status,
-            "version": app.version
+            "version": app.version,
+            "startup_ms": round(startup_seconds * 1000, 1) if startup_seconds is not None else None,
+            "scheduler": scheduler.snapshot() if scheduler else None,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking status: {str(e)}")
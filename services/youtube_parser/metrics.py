@@ -0,0 +1,247 @@
+"""
+Prometheus-style metrics for the pipeline, rendered in the text exposition format.
+
+Only counters and histograms are needed, so they are implemented here
+rather than pulling in prometheus_client.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds in seconds; spans fast DB calls through slow LLM generations
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class _Timer:
+    """Context manager / decorator that observes elapsed seconds into a histogram."""
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self._started, **self.labels)
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            with _Timer(self.histogram, self.labels):
+                return fn(*args, **kwargs)
+        return timed
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram, per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def time(self, **labels: Any) -> _Timer:
+        """Time a block (`with`) or a function (decorator)."""
+        self._key(labels)
+        return _Timer(self, labels)
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(names, key + (_format_value(bound),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and renders them for the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Optional[Tuple[float, ...]] = None,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = Registry()
+
+# Pipeline stages: youtube_search, youtube_channel_lookup, youtube_video_lookup,
+# transcript_fetch, llm_generation, db_write, db_read
+STAGE_DURATION = REGISTRY.histogram(
+    "chefpanda_stage_duration_seconds",
+    "Latency of each pipeline stage.",
+    ["stage"],
+)
+RETRIES = REGISTRY.counter(
+    "chefpanda_retries_total",
+    "Retried upstream attempts, by stage.",
+    ["stage"],
+)
+PLACEHOLDER_FAILURES = REGISTRY.counter(
+    "chefpanda_placeholder_failures_total",
+    "Videos returned as error placeholders instead of transcripts.",
+)
+PREFILTER_SKIPPED = REGISTRY.counter(
+    "chefpanda_prefilter_skipped_total",
+    "Videos skipped as unlikely recipes, by stage (metadata or transcript).",
+    ["stage"],
+)
+DUPLICATES_LINKED = REGISTRY.counter(
+    "chefpanda_duplicates_linked_total",
+    "Videos linked to the recipe of a near-duplicate transcript instead of generated.",
+)
+SCHEDULER_WAIT = REGISTRY.histogram(
+    "chefpanda_scheduler_wait_seconds",
+    "Time spent waiting for a worker slot, by lane (interactive or bulk).",
+    ["lane"],
+)
+CANCELLED_JOBS = REGISTRY.counter(
+    "chefpanda_cancelled_jobs_total",
+    "Scrape jobs cancelled because the client disconnected, by route.",
+    ["route"],
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "chefpanda_cache_lookups_total",
+    "Cache lookups, by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "chefpanda_http_requests_total",
+    "HTTP requests served, by method, route and status code.",
+    ["method", "route", "status"],
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "chefpanda_http_request_duration_seconds",
+    "HTTP request latency, by method and route.",
+    ["method", "route"],
+)
+
+
+def time_stage(stage: str) -> _Timer:
+    """Shortcut for STAGE_DURATION.time(stage=...)."""
+    return STAGE_DURATION.time(stage=stage)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
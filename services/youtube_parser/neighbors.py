@@ -0,0 +1,233 @@
+"""
+Precomputed "similar recipes" neighbors from TF-IDF vectors.
+
+Each recipe becomes a sparse vector over its normalized ingredient names
+(matched to the nutrient table's canonical names where possible) and its
+title words. Cosine similarities are computed through an inverted index
+(term -> recipes), which is the row-by-row form of multiplying the sparse
+term matrix by its transpose: only recipes sharing a term are ever
+touched. The top-k neighbors of every recipe are stored, so serving them
+is a single indexed read.
+"""
+
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .nutrition import default_engine
+
+DEFAULT_K = 10
+# Title words count for less than ingredients
+TITLE_WEIGHT = 0.5
+
+_WORD = re.compile(r"[a-z가-힣]+")
+_TITLE_STOPWORDS = frozenset(
+    "the and with for how make easy best recipe recipes homemade quick simple style from you your my".split()
+)
+
+
+def recipe_terms(title: Optional[str], ingredient_names: Iterable[Optional[str]]) -> Dict[str, float]:
+    """
+    Term frequencies for one recipe: "i:" ingredient terms and "t:" title words.
+    """
+    engine = default_engine()
+    terms: Counter = Counter()
+    for name in ingredient_names:
+        food = engine.match(name or "")
+        term = engine.names[food] if food is not None else " ".join(_WORD.findall((name or "").lower()))
+        if term:
+            terms["i:" + term] += 1
+    for word in _WORD.findall((title or "").lower()):
+        if len(word) > 2 and word not in _TITLE_STOPWORDS:
+            terms["t:" + word] += TITLE_WEIGHT
+    return dict(terms)
+
+
+def _idf(document_count: int, frequency: int) -> float:
+    return math.log((1 + document_count) / (1 + frequency)) + 1
+
+
+class NeighborIndex:
+    """
+    Top-k similar recipes, stored next to the recipes in SQLite.
+
+    `rebuild` recomputes everything in one batch; `add` folds a newly
+    stored recipe in using the current document frequencies, which is
+    exact for the new recipe and close for the rest until the next rebuild.
+
+    Args:
+        conn: Connection to the recipes database
+        k: Neighbors kept per recipe
+        lock: Held while updating the index; pass the lock of the other
+            writers sharing `conn`, so none commits another's pending writes
+    """
+
+    def __init__(self, conn: sqlite3.Connection, k: int = DEFAULT_K, lock: Optional[threading.Lock] = None):
+        self.conn = conn
+        self.k = k
+        self._lock = lock if lock is not None else threading.Lock()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS recipe_terms (
+                recipe_id INTEGER NOT NULL,
+                term TEXT NOT NULL,
+                count REAL NOT NULL,
+                PRIMARY KEY (recipe_id, term)
+            );
+            CREATE INDEX IF NOT EXISTS idx_recipe_terms_term ON recipe_terms (term);
+
+            CREATE TABLE IF NOT EXISTS recipe_norms (
+                recipe_id INTEGER PRIMARY KEY,
+                norm REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS recipe_neighbors (
+                recipe_id INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
+                neighbor_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (recipe_id, rank)
+            );
+            """
+        )
+        conn.commit()
+
+    def _load_terms(self, recipe_ids: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, float]]:
+        """Terms of the given stored recipes (all recipes when None)."""
+        recipes_sql = "SELECT id, title FROM recipes"
+        ingredients_sql = "SELECT recipe_id, name FROM ingredients"
+        params: Tuple[Any, ...] = ()
+        if recipe_ids is not None:
+            placeholders = ", ".join("?" * len(recipe_ids))
+            recipes_sql += f" WHERE id IN ({placeholders})"
+            ingredients_sql += f" WHERE recipe_id IN ({placeholders})"
+            params = tuple(recipe_ids)
+        names: Dict[int, List[str]] = defaultdict(list)
+        for recipe_id, name in self.conn.execute(ingredients_sql + " ORDER BY id", params):
+            names[recipe_id].append(name)
+        return {
+            recipe_id: recipe_terms(title, names.get(recipe_id, []))
+            for recipe_id, title in self.conn.execute(recipes_sql, params)
+        }
+
+    def _top(self, scores: Dict[int, float]) -> List[Tuple[int, float]]:
+        return heapq.nlargest(self.k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def _write_neighbors(self, recipe_id: int, neighbors: List[Tuple[int, float]]) -> None:
+        self.conn.execute("DELETE FROM recipe_neighbors WHERE recipe_id = ?", (recipe_id,))
+        self.conn.executemany(
+            "INSERT INTO recipe_neighbors (recipe_id, rank, neighbor_id, score) VALUES (?, ?, ?, ?)",
+            [(recipe_id, rank, neighbor, round(score, 6)) for rank, (neighbor, score) in enumerate(neighbors)],
+        )
+
+    def rebuild(self) -> int:
+        """
+        Recompute vectors and top-k neighbors for the whole corpus.
+
+        Returns:
+            Number of recipes indexed
+        """
+        with self._lock, self.conn:
+            documents = self._load_terms()
+            frequencies = Counter(term for terms in documents.values() for term in terms)
+            idf = {term: _idf(len(documents), frequency) for term, frequency in frequencies.items()}
+
+            vectors: Dict[int, Dict[str, float]] = {}
+            postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+            for recipe_id, terms in documents.items():
+                weights = {term: count * idf[term] for term, count in terms.items()}
+                norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+                vectors[recipe_id] = {term: weight / norm for term, weight in weights.items()}
+                for term, weight in vectors[recipe_id].items():
+                    postings[term].append((recipe_id, weight))
+
+            self.conn.execute("DELETE FROM recipe_terms")
+            self.conn.execute("DELETE FROM recipe_norms")
+            self.conn.execute("DELETE FROM recipe_neighbors")
+            for recipe_id, vector in vectors.items():
+                scores: Dict[int, float] = defaultdict(float)
+                for term, weight in vector.items():
+                    for other, other_weight in postings[term]:
+                        if other != recipe_id:
+                            scores[other] += weight * other_weight
+                self._write_neighbors(recipe_id, self._top(scores))
+            self.conn.executemany(
+                "INSERT INTO recipe_terms (recipe_id, term, count) VALUES (?, ?, ?)",
+                [(recipe_id, term, count) for recipe_id, terms in documents.items() for term, count in terms.items()],
+            )
+            self.conn.executemany(
+                "INSERT INTO recipe_norms (recipe_id, norm) VALUES (?, ?)",
+                [
+                    (recipe_id, math.sqrt(sum((count * idf[term]) ** 2 for term, count in terms.items())) or 1.0)
+                    for recipe_id, terms in documents.items()
+                ],
+            )
+        return len(documents)
+
+    def add(self, recipe_id: int) -> None:
+        """
+        Index one newly stored recipe.
+
+        Its neighbors are computed against the recipes sharing a term with
+        it, and it is merged into those recipes' neighbor lists where it
+        ranks in their top k.
+        """
+        with self._lock, self.conn:
+            terms = self._load_terms([recipe_id]).get(recipe_id)
+            if terms is None:
+                return
+            document_count = self.conn.execute("SELECT COUNT(*) FROM recipe_norms").fetchone()[0] + 1
+            placeholders = ", ".join("?" * len(terms))
+            shared = self.conn.execute(
+                f"""
+                SELECT t.recipe_id, t.term, t.count, n.norm
+                FROM recipe_terms t JOIN recipe_norms n ON n.recipe_id = t.recipe_id
+                WHERE t.term IN ({placeholders}) AND t.recipe_id != ?
+                """,
+                (*terms, recipe_id),
+            ).fetchall() if terms else []
+
+            frequencies = Counter(term for _, term, _, _ in shared)
+            idf = {term: _idf(document_count, frequencies[term] + 1) for term in terms}
+            weights = {term: count * idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+
+            scores: Dict[int, float] = defaultdict(float)
+            for other, term, count, other_norm in shared:
+                scores[other] += weights[term] / norm * count * idf[term] / other_norm
+
+            self.conn.execute("DELETE FROM recipe_terms WHERE recipe_id = ?", (recipe_id,))
+            self.conn.executemany(
+                "INSERT INTO recipe_terms (recipe_id, term, count) VALUES (?, ?, ?)",
+                [(recipe_id, term, count) for term, count in terms.items()],
+            )
+            self.conn.execute("INSERT OR REPLACE INTO recipe_norms (recipe_id, norm) VALUES (?, ?)", (recipe_id, norm))
+            self._write_neighbors(recipe_id, self._top(scores))
+
+            for other, score in scores.items():
+                current = self.conn.execute(
+                    "SELECT neighbor_id, score FROM recipe_neighbors WHERE recipe_id = ? ORDER BY rank", (other,)
+                ).fetchall()
+                if len(current) >= self.k and score <= current[-1][1]:
+                    continue
+                merged = {neighbor: neighbor_score for neighbor, neighbor_score in current}
+                merged[recipe_id] = score
+                self._write_neighbors(other, self._top(merged))
+
+    def similar(self, recipe_id: int, limit: int = DEFAULT_K) -> List[Dict[str, Any]]:
+        """Stored neighbors of a recipe, most similar first."""
+        rows = self.conn.execute(
+            """
+            SELECT n.neighbor_id, n.score, r.title, r.video_id
+            FROM recipe_neighbors n JOIN recipes r ON r.id = n.neighbor_id
+            WHERE n.recipe_id = ?
+            ORDER BY n.rank
+            LIMIT ?
+            """,
+            (recipe_id, limit),
+        ).fetchall()
+        return [{"id": row[0], "score": row[1], "title": row[2], "video_id": row[3]} for row in rows]
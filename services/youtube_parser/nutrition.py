@@ -0,0 +1,157 @@
+"""
+Deterministic nutrition estimates computed from a recipe's ingredients.
+
+A bundled table (data/nutrients.csv) holds calories, protein, carbs and fat
+per 100 g for common ingredients, plus densities for volume units and
+weights for counted items ("4 cloves", "2 eggs"). Ingredient names are
+matched against the table and quantities converted to grams; totals are
+then column sums over all matched ingredients, divided by servings.
+"""
+
+import csv
+import re
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .quantity import MASS, UNITS, VOLUME, parse_quantity, parse_servings
+
+DATA_DIR = Path(__file__).parent / "data"
+NUTRIENTS = ("calories", "protein", "carbs", "fat")
+
+_WORD = re.compile(r"[a-z가-힣]+")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+# Longest ingredient name (in words) looked up in the table
+_MAX_NAME_WORDS = 3
+
+
+def _singular(word: str) -> str:
+    if word.endswith("es") and len(word) > 4:
+        return word[:-2]
+    if word.endswith("s") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+class NutritionEngine:
+    """
+    Ingredient matcher and nutrition calculator over a nutrient table.
+
+    Args:
+        rows: Table rows with name, aliases ("|"-separated), the NUTRIENTS
+            per 100 g, grams_per_ml and grams_per_piece (both optional)
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, str]]):
+        self.names: List[str] = []
+        self._columns = {nutrient: array("d") for nutrient in NUTRIENTS}
+        self._density = array("d")
+        self._piece = array("d")
+        self._index: Dict[str, int] = {}
+        for row in rows:
+            food = len(self.names)
+            self.names.append(row["name"])
+            for nutrient in NUTRIENTS:
+                self._columns[nutrient].append(float(row[nutrient]))
+            self._density.append(float(row.get("grams_per_ml") or 0))
+            self._piece.append(float(row.get("grams_per_piece") or 0))
+            for alias in [row["name"], *(row.get("aliases") or "").split("|")]:
+                key = " ".join(_WORD.findall(alias.lower()))
+                if key:
+                    self._index.setdefault(key, food)
+
+    def match(self, name: str) -> Optional[int]:
+        """
+        Find the table row for an ingredient name.
+
+        Tries the longest word sequences first and, among equally long
+        ones, the rightmost (the head noun in "garlic cloves" style names
+        comes first, but in "minced garlic" last). Plural forms are tried
+        as singulars too.
+
+        Returns:
+            Row index, or None if nothing matches
+        """
+        words = _WORD.findall(_PARENTHESES.sub(" ", name.lower()))
+        for size in range(min(len(words), _MAX_NAME_WORDS), 0, -1):
+            for start in range(len(words) - size, -1, -1):
+                phrase = words[start:start + size]
+                for key in (" ".join(phrase), " ".join(phrase[:-1] + [_singular(phrase[-1])])):
+                    if key in self._index:
+                        return self._index[key]
+        return None
+
+    def grams(self, food: int, quantity: Optional[str]) -> Optional[float]:
+        """
+        Convert a quantity of the given row to grams.
+
+        Returns None when the quantity has no number or its unit cannot be
+        converted for this ingredient (e.g. "2 cups" without a density).
+        """
+        parsed = parse_quantity(quantity)
+        if parsed.amount is None:
+            return None
+        amount = parsed.amount if parsed.amount_max is None else (parsed.amount + parsed.amount_max) / 2
+        dimension, size = UNITS.get(parsed.unit or "", (None, 1.0))
+        if dimension == MASS:
+            return amount * size
+        if dimension == VOLUME:
+            density = self._density[food]
+            return amount * size * density if density else None
+        # Anything else counts pieces: "4 cloves", "3 large eggs", "1개"
+        piece = self._piece[food]
+        return amount * piece if piece else None
+
+    def compute(self, ingredients: Sequence[Tuple[str, str]], servings: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Nutrition per serving for one recipe.
+
+        Args:
+            ingredients: (name, quantity) pairs
+            servings: The recipe's servings text
+
+        Returns:
+            Dict of NUTRIENTS, or None if no ingredient could be measured
+        """
+        return self.compute_many([(None, ingredients, servings)])[None]
+
+    def compute_many(
+        self,
+        recipes: Iterable[Tuple[Hashable, Sequence[Tuple[str, str]], Optional[str]]],
+    ) -> Dict[Hashable, Optional[Dict[str, float]]]:
+        """
+        Nutrition per serving for many recipes.
+
+        A plain loop over every recipe's ingredients; the gain over calling
+        compute per recipe is in the callers, which read and write the
+        whole corpus in bulk around this one call.
+
+        Args:
+            recipes: (key, ingredients, servings) for each recipe
+
+        Returns:
+            Nutrition (or None) by recipe key
+        """
+        results: Dict[Hashable, Optional[Dict[str, float]]] = {}
+        for key, ingredients, servings in recipes:
+            totals: Optional[Dict[str, float]] = None
+            for name, quantity in ingredients:
+                food = self.match(name or "")
+                grams = self.grams(food, quantity) if food is not None else None
+                if grams:
+                    totals = totals or dict.fromkeys(NUTRIENTS, 0.0)
+                    for nutrient in NUTRIENTS:
+                        totals[nutrient] += self._columns[nutrient][food] * grams
+            divisor = parse_servings(servings) * 100
+            results[key] = (
+                {nutrient: round(total / divisor, 1) for nutrient, total in totals.items()} if totals else None
+            )
+        return results
+
+
+@lru_cache(maxsize=None)
+def default_engine() -> NutritionEngine:
+    """The engine over the bundled table, loaded once per process."""
+    with open(DATA_DIR / "nutrients.csv", newline="", encoding="utf-8") as f:
+        return NutritionEngine(csv.DictReader(f))
@@ -0,0 +1,115 @@
+"""
+Cheap recipe-likelihood scoring used to skip non-recipe videos (vlogs,
+Q&As, food tours, livestreams) before any transcript fetch or LLM call.
+
+Scores are in [0, 1]. An unknown video starts at NEUTRAL_SCORE and only
+clear signals move it, so titles without keywords (common on Korean
+cooking channels) are kept.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+NEUTRAL_SCORE = 0.5
+DEFAULT_CUTOFF = 0.35
+
+# Title/description words that point at a recipe
+RECIPE_KEYWORDS = (
+    "recipe", "how to make", "how to cook", "homemade", "ingredients", "bake", "baking",
+    "레시피", "만들기", "만드는", "요리", "끓이기", "볶음", "담그기", "굽기",
+)
+# Title words that point at something else
+OTHER_KEYWORDS = (
+    "vlog", "q&a", "qna", "livestream", "live stream", "mukbang", "review", "taste test",
+    "unboxing", "haul", "podcast", "restaurant tour", "food tour",
+    "브이로그", "질문", "라이브", "생방송", "먹방", "탐방", "맛집", "리뷰",
+)
+# Ingredient list markers: units and "ingredients" headings
+MEASURE_PATTERN = re.compile(
+    r"\b(\d+\s?(g|kg|ml|l|oz|lb|lbs)|tbsp|tsp|tablespoons?|teaspoons?|cups?|ingredients)\b"
+    r"|재료|큰술|작은술|스푼|컵|\d+\s?(g|ml)",
+    re.IGNORECASE,
+)
+COOKING_VERBS = re.compile(
+    r"\b(add|chop|slice|dice|mix|stir|boil|simmer|fry|bake|roast|season|whisk|knead|marinate|preheat)\w*",
+    re.IGNORECASE,
+)
+
+HOWTO_CATEGORY = "26"  # Howto & Style
+OFF_TOPIC_CATEGORIES = {"10", "20", "25"}  # Music, Gaming, News & Politics
+
+_DURATION = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
+
+def parse_duration(value: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO 8601 duration (e.g. "PT1H2M3S") to seconds.
+
+    Returns None for a missing or unparsable value.
+    """
+    match = _DURATION.fullmatch(value or "")
+    if not value or not match:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def _has_any(text: str, keywords: tuple) -> bool:
+    return any(keyword in text for keyword in keywords)
+
+
+def score_video(details: Dict[str, Any]) -> float:
+    """
+    Score how likely a video is a recipe from its metadata.
+
+    Args:
+        details: Dict with optional keys title, description, duration_seconds,
+            category_id and live (as returned by YouTubeScraper.fetch_video_details)
+    Returns:
+        Score between 0 and 1
+    """
+    title = details.get("title", "").lower()
+    description = details.get("description", "").lower()
+    duration = details.get("duration_seconds")
+    score = NEUTRAL_SCORE
+
+    if _has_any(title, RECIPE_KEYWORDS):
+        score += 0.25
+    if _has_any(title, OTHER_KEYWORDS):
+        score -= 0.3
+    if len(MEASURE_PATTERN.findall(description)) >= 2 or _has_any(description, RECIPE_KEYWORDS):
+        score += 0.15
+
+    if duration is not None:
+        if duration > 90 * 60:
+            score -= 0.3  # livestream recordings and compilations
+        elif duration <= 60:
+            score -= 0.05  # shorts are often recipes, but thin ones
+        elif 3 * 60 <= duration <= 40 * 60:
+            score += 0.1
+
+    category = details.get("category_id")
+    if category == HOWTO_CATEGORY:
+        score += 0.1
+    elif category in OFF_TOPIC_CATEGORIES:
+        score -= 0.2
+
+    if details.get("live"):
+        score -= 0.5
+
+    return max(0.0, min(1.0, score))
+
+
+def score_transcript(text: str) -> float:
+    """
+    Score how recipe-like a transcript is from its density of measurements
+    and cooking verbs (hits per 100 words, saturating at 3).
+
+    Returns:
+        Score between 0 and 1; 0 for an empty transcript
+    """
+    words = len(text.split())
+    if not words:
+        return 0.0
+    hits = len(MEASURE_PATTERN.findall(text)) + len(COOKING_VERBS.findall(text))
+    return min(1.0, hits * 100 / words / 3)
@@ -0,0 +1,254 @@
+"""
+Parsing, conversion and scaling of free-form ingredient quantities.
+
+A quantity such as "1 1/2 cups, packed" is split into an amount (with an
+upper bound for ranges like "2-3"), a canonical unit and a note holding
+whatever else the text said. Units belong to a dimension (mass, volume or
+count) with a factor to the dimension's base unit (g, ml, piece), so
+amounts can be converted between units of the same dimension.
+
+Prep and cook times ("1 hr 15 mins") are parsed the same way into minutes.
+"""
+
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# Canonical unit -> (dimension, size in the dimension's base unit: g, ml or piece)
+UNITS: Dict[str, Tuple[str, float]] = {
+    "mg": (MASS, 0.001),
+    "g": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "oz": (MASS, 28.35),
+    "lb": (MASS, 453.6),
+    "ml": (VOLUME, 1.0),
+    "l": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 4.93),
+    "tbsp": (VOLUME, 14.79),
+    "fl oz": (VOLUME, 29.57),
+    "cup": (VOLUME, 240.0),
+    "pinch": (VOLUME, 0.3),
+    "dash": (VOLUME, 0.6),
+    "작은술": (VOLUME, 5.0),
+    "큰술": (VOLUME, 15.0),
+    "컵": (VOLUME, 200.0),
+    "piece": (COUNT, 1.0),
+    "clove": (COUNT, 1.0),
+    "slice": (COUNT, 1.0),
+    "stalk": (COUNT, 1.0),
+    "bunch": (COUNT, 1.0),
+    "can": (COUNT, 1.0),
+    "pack": (COUNT, 1.0),
+    "sheet": (COUNT, 1.0),
+    "개": (COUNT, 1.0),
+    "쪽": (COUNT, 1.0),
+    "장": (COUNT, 1.0),
+    "봉지": (COUNT, 1.0),
+}
+
+UNIT_ALIASES: Dict[str, str] = {
+    "gram": "g", "grams": "g", "gr": "g", "그램": "g",
+    "kilogram": "kg", "kilograms": "kg",
+    "milligram": "mg", "milligrams": "mg",
+    "ounce": "oz", "ounces": "oz",
+    "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp", "티스푼": "작은술",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp", "스푼": "큰술", "숟가락": "큰술",
+    "fluid ounce": "fl oz", "fluid ounces": "fl oz",
+    "cups": "cup",
+    "pinches": "pinch", "dashes": "dash",
+    "pieces": "piece", "pc": "piece", "pcs": "piece",
+    "cloves": "clove", "slices": "slice", "stalks": "stalk", "bunches": "bunch",
+    "cans": "can", "packs": "pack", "packets": "pack", "packet": "pack", "sheets": "sheet",
+}
+
+_FRACTIONS = {"½": 0.5, "¼": 0.25, "¾": 0.75, "⅓": 1 / 3, "⅔": 2 / 3, "⅛": 0.125}
+_AMOUNT = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?|[½¼¾⅓⅔⅛]|\ban?\b"
+_QUANTITY = re.compile(
+    rf"(?P<low>{_AMOUNT})(?:\s*(?:-|~|to)\s*(?P<high>{_AMOUNT}))?\s*"
+    r"(?P<unit>fl\.?\s?oz\b|fluid ounces?\b|[a-zA-Z가-힣]+\.?)?",
+    re.IGNORECASE,
+)
+# Minutes per time unit, for prep and cook times ("1 hr 15 mins", "30분")
+_TIME_UNITS: Dict[str, float] = {
+    "d": 1440, "day": 1440, "days": 1440, "일": 1440,
+    "h": 60, "hr": 60, "hrs": 60, "hour": 60, "hours": 60, "시간": 60,
+    "m": 1, "min": 1, "mins": 1, "minute": 1, "minutes": 1, "분": 1,
+    "s": 1 / 60, "sec": 1 / 60, "secs": 1 / 60, "second": 1 / 60, "seconds": 1 / 60, "초": 1 / 60,
+}
+_TIME = re.compile(
+    rf"(?P<low>{_AMOUNT})(?:\s*(?:-|~|to)\s*(?P<high>{_AMOUNT}))?\s*(?P<unit>[a-zA-Z가-힣]+)?",
+    re.IGNORECASE,
+)
+# English count and cup units are pluralized for display ("2 cups")
+_PLURALS = {"cup": "cups", "piece": "pieces", "clove": "cloves", "slice": "slices", "stalk": "stalks",
+            "bunch": "bunches", "can": "cans", "pack": "packs", "sheet": "sheets", "pinch": "pinches", "dash": "dashes"}
+# Fractions shown when formatting scaled amounts
+_DISPLAY_FRACTIONS = (
+    (0.125, "1/8"), (0.25, "1/4"), (1 / 3, "1/3"), (0.375, "3/8"), (0.5, "1/2"),
+    (0.625, "5/8"), (2 / 3, "2/3"), (0.75, "3/4"), (0.875, "7/8"),
+)
+
+
+class Quantity(NamedTuple):
+    amount: Optional[float]
+    amount_max: Optional[float]
+    unit: Optional[str]
+    note: Optional[str]
+
+
+def _amount(text: str) -> float:
+    if text.lower() in ("a", "an"):
+        return 1.0
+    if text in _FRACTIONS:
+        return _FRACTIONS[text]
+    whole, _, fraction = text.rpartition(" ")
+    if "/" in fraction:
+        numerator, denominator = fraction.split("/")
+        value = float(numerator) / float(denominator) if float(denominator) else 0.0
+        return value + (float(whole) if whole else 0.0)
+    return float(text)
+
+
+def normalize_unit(text: Optional[str]) -> Optional[str]:
+    """Canonical unit for a unit word ("Tablespoons" -> "tbsp"), or None if unknown."""
+    if not text:
+        return None
+    key = " ".join(text.lower().replace(".", " ").split())
+    if key.replace(" ", "") == "floz":
+        return "fl oz"
+    key = UNIT_ALIASES.get(key, key)
+    return key if key in UNITS else None
+
+
+def parse_quantity(text: Optional[str]) -> Quantity:
+    """
+    Split a quantity such as "1 1/2 cups", "200g", "2-3 cloves, minced" or
+    "a pinch" into a Quantity.
+
+    A word after the amount that is not a known unit ("3 large eggs") is
+    left in the note and the unit is None. Text without an amount ("to
+    taste") is kept entirely as the note.
+    """
+    text = (text or "").strip()
+    match = _QUANTITY.search(text)
+    # "a"/"an" only count as an amount when a unit follows ("a pinch", not "a handful")
+    if match and (match.group("low").lower() not in ("a", "an") or normalize_unit(match.group("unit"))):
+        unit = normalize_unit(match.group("unit"))
+        end = match.end() if unit else match.end("high") if match.group("high") else match.end("low")
+        low = _amount(match.group("low"))
+        high = _amount(match.group("high")) if match.group("high") else None
+        note = (text[:match.start()] + " " + text[end:]).strip(" ,;") or None
+        return Quantity(low, high, unit, note)
+    return Quantity(None, None, None, text or None)
+
+
+def parse_servings(text: Optional[str]) -> float:
+    """Number of servings from text like "2-3" or "serves 4"; 1 when unknown."""
+    quantity = parse_quantity(text)
+    if quantity.amount is None or quantity.amount <= 0:
+        return 1.0
+    if quantity.amount_max is not None:
+        return (quantity.amount + quantity.amount_max) / 2
+    return quantity.amount
+
+
+def parse_minutes(text: Optional[str]) -> Optional[int]:
+    """
+    Whole minutes from a time such as "15 minutes", "1 hr 30 min", "1.5 hours" or "1시간 20분".
+
+    Ranges count as their upper bound ("10-15 minutes" -> 15), so a
+    "under N minutes" filter never includes a recipe that may take longer.
+    A bare number is taken as minutes, and seconds round up.
+
+    Returns:
+        Minutes, or None if the text has no recognizable time
+    """
+    minutes = None
+    for match in _TIME.finditer(text or ""):
+        unit = match.group("unit")
+        size = _TIME_UNITS.get(unit.lower()) if unit else 1
+        if size is None or (match.group("low").lower() in ("a", "an") and not unit):
+            continue
+        amount = _amount(match.group("high") or match.group("low"))
+        minutes = (minutes or 0) + amount * size
+    return None if minutes is None else math.ceil(round(minutes, 6))
+
+
+def recipe_minutes(prep_time: Optional[str], cook_time: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """(prep, cook, total) minutes; the total counts whichever parts are known."""
+    prep, cook = parse_minutes(prep_time), parse_minutes(cook_time)
+    known = [minutes for minutes in (prep, cook) if minutes is not None]
+    return prep, cook, sum(known) if known else None
+
+
+def convert(amount: float, unit: str, to_unit: str) -> float:
+    """
+    Convert an amount between two units of the same dimension.
+
+    Raises:
+        ValueError: If either unit is unknown or the dimensions differ
+    """
+    try:
+        dimension, size = UNITS[unit]
+        to_dimension, to_size = UNITS[to_unit]
+    except KeyError as e:
+        raise ValueError(f"Unknown unit: {e.args[0]}")
+    if dimension != to_dimension:
+        raise ValueError(f"Cannot convert {unit} ({dimension}) to {to_unit} ({to_dimension})")
+    return amount * size / to_size
+
+
+def format_amount(value: float, unit: Optional[str] = None) -> str:
+    """
+    Render an amount for display: metric weights and volumes as whole
+    numbers, everything else with a common fraction when one is close.
+    """
+    if unit in ("g", "ml", "mg") and value >= 10:
+        return str(round(value))
+    whole = int(value)
+    rest = value - whole
+    fraction, text = min(_DISPLAY_FRACTIONS, key=lambda item: abs(rest - item[0]))
+    if abs(rest - fraction) < 0.02:
+        return f"{whole} {text}" if whole else text
+    if (rest < 0.02 and whole) or rest > 0.98:
+        return str(round(value))
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def format_quantity(amount: Optional[float], amount_max: Optional[float], unit: Optional[str], note: Optional[str]) -> str:
+    """Render parsed quantity columns back into text."""
+    parts = []
+    if amount is not None:
+        parts.append(format_amount(amount, unit))
+        if amount_max is not None:
+            parts[-1] += "-" + format_amount(amount_max, unit)
+    if unit:
+        largest = amount_max if amount_max is not None else amount
+        parts.append(_PLURALS.get(unit, unit) if largest is not None and largest > 1 else unit)
+    if note:
+        parts.append(note)
+    return " ".join(parts)
+
+
+def scale_amounts(
+    amounts: Sequence[Optional[float]],
+    amount_maxes: Sequence[Optional[float]],
+    factor: float,
+) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+    """
+    Multiply a column of amounts and their range maxima by `factor`.
+
+    Missing amounts stay None. A plain pass over each column: recipes
+    have a few dozen ingredients at most, too few for vectorizing to pay.
+    """
+    return (
+        [None if value is None else value * factor for value in amounts],
+        [None if value is None else value * factor for value in amount_maxes],
+    )
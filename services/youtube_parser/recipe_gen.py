@@ -3,41 +3,141 @@ Recipe generation and parsing functionality.
 """
 
 from .type import Ingredient, InstructionStep, Recipe
-import openai # type: ignore
-from typing import List, Optional, Dict
+from .metrics import STAGE_DURATION, time_stage
+from .nutrition import default_engine
+from .retry import Deadline, DeadlineExceeded
+from .stream_json import IncrementalRecipeParser
+from . import tracing
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
+import hashlib
 import json
+import logging
+import time
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+DEFAULT_MODEL = "gpt-5-nano"
+
+logger = logging.getLogger(__name__)
+
+# Packed generation: transcripts up to SHORT_TRANSCRIPT_TOKENS are grouped
+# into one request, up to DEFAULT_PACK_TOKEN_BUDGET transcript tokens each
+SHORT_TRANSCRIPT_TOKENS = 800
+DEFAULT_PACK_TOKEN_BUDGET = 4000
+MAX_PACK_SIZE = 10
+
+
+def _timed_stream(open_stream: Callable[[], Any], stage: str) -> Iterator[Any]:
+    """
+    Iterate a streamed response, timing only the waits on upstream.
+
+    The stage is timed while the stream opens and while each chunk is
+    awaited, not while the caller holds a chunk (e.g. suspended at a yield
+    until a slow HTTP client reads). Closing this iterator early closes
+    the stream.
+    """
+    elapsed, started = 0.0, time.perf_counter()
+    stream, exhausted = None, False
+    try:
+        stream = open_stream()
+        for chunk in stream:
+            elapsed += time.perf_counter() - started
+            started = None
+            yield chunk
+            started = time.perf_counter()
+        exhausted = True
+    finally:
+        if started is not None:
+            elapsed += time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        if stream is not None and not exhausted:
+            stream.close()
+
+
+def _request_options(deadline: Optional[Deadline]) -> Dict[str, Any]:
+    """
+    Per-request OpenAI options bounding the call by the job deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline already passed or was cancelled
+    """
+    timeout = deadline.timeout() if deadline is not None else None
+    return {} if timeout is None else {"timeout": timeout}
+
+
+def _check_deadline(deadline: Optional[Deadline]) -> None:
+    """
+    Re-raise a failed request as the deadline's error when the deadline is
+    why it failed (the request timeout is derived from it).
+
+    Raises:
+        DeadlineExceeded: If the deadline passed or was cancelled
+    """
+    if deadline is not None:
+        deadline.check()
+
+
+def prompt_hash(*templates: str) -> str:
+    """Short, stable digest of prompt templates, recorded with each recipe they produce."""
+    digest = hashlib.sha256("\0".join(templates).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token), good enough for packing."""
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Read a prompt template from the prompts directory.
+
+    Templates are cached for the lifetime of the process, so every
+    RecipeGenerator shares a single copy instead of rereading the file.
+    """
+    with open(PROMPTS_DIR / name, "r") as f:
+        return f.read().strip()
+
 
 class RecipeGenerator:  
-    def __init__(self, api_key: str): 
+    def __init__(self, api_key: str, client: Optional[Any] = None, model: str = DEFAULT_MODEL): 
         self.api_key = api_key
-        self.openai = openai.OpenAI(api_key=self.api_key)
+        self._client = client
+        self.model = model
         self._load_prompts()
         self.recipe: Optional[Recipe] = None 
 
+    @property
+    def openai(self) -> Any:
+        """
+        OpenAI client, created on first use.
+
+        The openai package is imported lazily because it dominates the
+        import time of the service.
+        """
+        if self._client is None:
+            import openai # type: ignore
+
+            self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
     def _load_prompts(self):
-        """Load prompt templates from text files"""
-        prompts_dir = Path(__file__).parent / "prompts"
-        
-        with open(prompts_dir / "recipe_system.txt", "r") as f:
-            self.system_prompt = f.read().strip()
-            
-        with open(prompts_dir / "recipe_extraction.txt", "r") as f:
-            self.extraction_prompt_template = f.read().strip()
+        """Load prompt templates from the shared prompt cache"""
+        self.system_prompt = load_prompt("recipe_system.txt")
+        self.extraction_prompt_template = load_prompt("recipe_extraction.txt")
+        self.batch_prompt_template = load_prompt("recipe_batch_extraction.txt")
+        # Identifies the prompts a recipe came from; changes whenever a template does
+        self.prompt_hash = prompt_hash(self.system_prompt, self.extraction_prompt_template, self.batch_prompt_template)
 
-    def generate_recipe(self, transcript_data: str) -> Recipe:
+    def _parse_transcript(self, transcript_data: str) -> Tuple[str, str]:
         """
-        Generate a complete recipe from a video transcript using OpenAI.
-        
-        Args:
-            transcript_data (str): The video transcript dictionary as a string
-            
-        Returns:
-            Recipe: A Recipe object containing title, video_id, ingredients, and steps
-            
+        Parse the transcript dict string into (video_id, transcript text).
+
         Raises:
-            RuntimeError: If recipe generation fails
-            ValueError: If transcript is empty or whitespace
+            ValueError: If transcript is empty or malformed
         """
         if not transcript_data or transcript_data.isspace():
             raise ValueError("Transcript cannot be empty or whitespace")
@@ -51,57 +151,286 @@ class RecipeGenerator:
             transcript_text = transcript_dict.get('snippets', '')
         except Exception as e:
             raise ValueError(f"Invalid transcript data format: {str(e)}")
-            
+        return video_id, transcript_text
+
+    def _messages(self, transcript_text: str) -> List[Dict[str, str]]:
         prompt = self.extraction_prompt_template.format(transcript=transcript_text)
-        
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_recipe(self, content: Optional[str], video_id: str) -> Recipe:
+        """
+        Validate the model's JSON output and build the Recipe.
+
+        Raises:
+            RuntimeError: If the content is empty, not JSON or not a valid recipe
+        """
+        if not content:
+            raise RuntimeError("Empty response from OpenAI")
+            
+        # Validate JSON structure before parsing
         try:
-            response = self.openai.chat.completions.create(
-                model="gpt-5-nano",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
+            json_data = json.loads(content)
+            # Basic structure validation
+            required_fields = ["title", "ingredients", "steps"]
+            for field in required_fields:
+                if field not in json_data:
+                    raise ValueError(f"Missing required field: {field}")
+            
+            # Add video_id to the JSON data
+            json_data['video_id'] = video_id
+            
+            # Validate steps format
+            if not isinstance(json_data["steps"], list):
+                raise ValueError("'steps' must be an array")
+            for step in json_data["steps"]:
+                if not isinstance(step, dict) or "step_number" not in step or "description" not in step:
+                    raise ValueError("Each step must be an object with 'step_number' and 'description'")
+                if not isinstance(step["step_number"], int):
+                    raise ValueError("step_number must be an integer")
+            
+            # If validation passes, parse with pydantic
+            recipe = Recipe.model_validate_json(json.dumps(json_data))
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON response from OpenAI: {str(e)}")
+        except ValueError as e:
+            raise RuntimeError(f"Invalid response structure: {str(e)}")
+
+        # Nutrition is computed locally from the ingredients, not taken from the model
+        recipe.nutritional_info = default_engine().compute(
+            [(ingredient.name, ingredient.quantity) for ingredient in recipe.ingredients],
+            recipe.servings,
+        )
+        recipe.prompt_hash = self.prompt_hash
+        recipe.model = self.model
+        self.recipe = recipe
+        return self.recipe
+
+    @staticmethod
+    def _record_usage(usage: Any) -> None:
+        if usage is not None:
+            tracing.set_attributes(
+                prompt_tokens=getattr(usage, "prompt_tokens", None),
+                completion_tokens=getattr(usage, "completion_tokens", None),
+                total_tokens=getattr(usage, "total_tokens", None),
             )
-            content = response.choices[0].message.content
-            if not content:
-                raise RuntimeError("Empty response from OpenAI")
-                
-            # Validate JSON structure before parsing
-            try:
-                json_data = json.loads(content)
-                # Basic structure validation
-                required_fields = ["title", "ingredients", "steps"]
-                for field in required_fields:
-                    if field not in json_data:
-                        raise ValueError(f"Missing required field: {field}")
-                
-                # Add video_id to the JSON data
-                json_data['video_id'] = video_id
-                
-                # Validate steps format
-                if not isinstance(json_data["steps"], list):
-                    raise ValueError("'steps' must be an array")
-                for step in json_data["steps"]:
-                    if not isinstance(step, dict) or "step_number" not in step or "description" not in step:
-                        raise ValueError("Each step must be an object with 'step_number' and 'description'")
-                    if not isinstance(step["step_number"], int):
-                        raise ValueError("step_number must be an integer")
-                
-                # If validation passes, parse with pydantic
-                self.recipe = Recipe.model_validate_json(json.dumps(json_data))
-                return self.recipe
-                
-            except json.JSONDecodeError as e:
-                raise RuntimeError(f"Invalid JSON response from OpenAI: {str(e)}")
-            except ValueError as e:
-                raise RuntimeError(f"Invalid response structure: {str(e)}")
+
+    @tracing.traced("generate_recipe")
+    def generate_recipe(self, transcript_data: str, deadline: Optional[Deadline] = None) -> Recipe:
+        """
+        Generate a complete recipe from a video transcript using OpenAI.
+        
+        Args:
+            transcript_data (str): The video transcript dictionary as a string
+            deadline: Optional job deadline; the request times out when it passes
+            
+        Returns:
+            Recipe: A Recipe object containing title, video_id, ingredients, and steps
+            
+        Raises:
+            RuntimeError: If recipe generation fails
+            ValueError: If transcript is empty or whitespace
+            DeadlineExceeded: If the deadline passed (or was cancelled) before or during the request
+        """
+        import openai # type: ignore
+
+        video_id, transcript_text = self._parse_transcript(transcript_data)
+        tracing.set_attributes(video_id=video_id, transcript_chars=len(transcript_text))
+        options = _request_options(deadline)
+        
+        try:
+            with time_stage("llm_generation"):
+                response = self.openai.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(transcript_text),
+                    response_format={"type": "json_object"},
+                    **options,
+                )
+            self._record_usage(getattr(response, "usage", None))
+            return self._parse_recipe(response.choices[0].message.content, video_id)
                 
+        except DeadlineExceeded:
+            raise
         except openai.APIError as e:
+            _check_deadline(deadline)
             raise RuntimeError(f"OpenAI API error: {str(e)}")
         except Exception as e:
             raise RuntimeError(f"Failed to generate recipe: {str(e)}")
 
+    def generate_recipes_packed(
+        self,
+        transcripts: List[str],
+        token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[Dict[str, Recipe], Dict[str, Exception]]:
+        """
+        Generate recipes for many transcripts, packing short ones together.
+
+        Transcripts of at most SHORT_TRANSCRIPT_TOKENS are grouped, up to
+        `token_budget` transcript tokens and MAX_PACK_SIZE videos per group,
+        into one request that returns an array of recipes keyed by
+        video_id. Each recipe is validated on its own; videos missing from
+        the answer or failing validation, and long transcripts, go through
+        generate_recipe one by one.
+
+        Args:
+            transcripts: Video transcript dictionaries as strings
+            token_budget: Maximum estimated transcript tokens per packed request
+            deadline: Optional job deadline; bounds every request, and no
+                request starts once it has passed
+
+        Returns:
+            (recipes, errors): recipes by video_id, and the error for every
+            video that could not be generated
+
+        Raises:
+            ValueError: If a transcript is empty or malformed
+        """
+        recipes: Dict[str, Recipe] = {}
+        errors: Dict[str, Exception] = {}
+        singles: List[Tuple[str, str]] = []
+        packs: List[List[Tuple[str, str, str]]] = []
+        pack_tokens = 0
+
+        for transcript_data in transcripts:
+            video_id, transcript_text = self._parse_transcript(transcript_data)
+            tokens = estimate_tokens(transcript_text)
+            if tokens > SHORT_TRANSCRIPT_TOKENS:
+                singles.append((video_id, transcript_data))
+                continue
+            if not packs or pack_tokens + tokens > token_budget or len(packs[-1]) >= MAX_PACK_SIZE:
+                packs.append([])
+                pack_tokens = 0
+            packs[-1].append((video_id, transcript_text, transcript_data))
+            pack_tokens += tokens
+
+        for pack in packs:
+            if len(pack) == 1:
+                singles.append((pack[0][0], pack[0][2]))
+                continue
+            packed = self._generate_pack([(video_id, text) for video_id, text, _ in pack], deadline)
+            recipes.update(packed)
+            singles.extend((video_id, data) for video_id, _, data in pack if video_id not in packed)
+
+        for video_id, transcript_data in singles:
+            try:
+                recipes[video_id] = self.generate_recipe(transcript_data, deadline)
+            except Exception as e:
+                errors[video_id] = e
+        return recipes, errors
+
+    @tracing.traced("generate_recipe_pack")
+    def _generate_pack(self, videos: List[Tuple[str, str]], deadline: Optional[Deadline] = None) -> Dict[str, Recipe]:
+        """
+        One request for several transcripts; returns the recipes that validated.
+
+        Never raises: a failed request or unusable answer just yields no
+        recipes, leaving every video to the per-video fallback.
+        """
+        tracing.set_attributes(videos=len(videos), video_ids=[video_id for video_id, _ in videos])
+        transcripts = "\n\n".join(f"Video {video_id}:\n{text}" for video_id, text in videos)
+        prompt = self.batch_prompt_template.format(transcripts=transcripts)
+        try:
+            options = _request_options(deadline)
+            with time_stage("llm_generation"):
+                response = self.openai.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    **options,
+                )
+            self._record_usage(getattr(response, "usage", None))
+            entries = json.loads(response.choices[0].message.content or "")["recipes"]
+        except Exception as e:
+            logger.warning("Packed generation for %d videos failed: %s", len(videos), e)
+            tracing.set_attributes(**{"error.type": type(e).__name__})
+            return {}
+
+        by_id = {entry.get("video_id"): entry for entry in entries if isinstance(entry, dict)}
+        recipes: Dict[str, Recipe] = {}
+        for video_id, _ in videos:
+            entry = by_id.get(video_id)
+            if entry is None:
+                continue
+            try:
+                recipes[video_id] = self._parse_recipe(json.dumps(entry), video_id)
+            except RuntimeError as e:
+                logger.warning("Packed recipe for video %s failed validation: %s", video_id, e)
+        tracing.set_attributes(recipes=len(recipes))
+        return recipes
+
+    def stream_recipe(self, transcript_data: str, deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generate a recipe with a streamed completion, yielding parts early.
+
+        Tokens are fed to an IncrementalRecipeParser, so the title, each
+        ingredient and each step are yielded as soon as they are complete.
+        The full output is validated like generate_recipe's, and the last
+        event carries the validated recipe. When the deadline passes or is
+        cancelled mid-stream the connection is closed, so the model stops
+        generating tokens nobody will read.
+
+        Args:
+            transcript_data (str): The video transcript dictionary as a string
+            deadline: Optional job deadline
+
+        Yields:
+            Event dicts: {"event": "field" | "ingredient" | "step", ...}
+            and finally {"event": "recipe", "value": recipe_dict}
+
+        Raises:
+            RuntimeError: If recipe generation fails
+            ValueError: If transcript is empty or whitespace
+            DeadlineExceeded: If the deadline passed (or was cancelled) before or during the request
+        """
+        import openai # type: ignore
+
+        video_id, transcript_text = self._parse_transcript(transcript_data)
+        options = _request_options(deadline)
+        with tracing.start_span("generate_recipe", video_id=video_id, transcript_chars=len(transcript_text), streamed=True):
+            parser = IncrementalRecipeParser()
+            try:
+                open_stream = lambda: self.openai.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(transcript_text),
+                    response_format={"type": "json_object"},
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **options,
+                )
+                with closing(_timed_stream(open_stream, "llm_generation")) as chunks:
+                    first_token = True
+                    for chunk in chunks:
+                        if deadline is not None and deadline.expired():
+                            chunks.close()
+                            tracing.add_event("aborted", cancelled=deadline.cancelled)
+                            deadline.check()
+                        self._record_usage(getattr(chunk, "usage", None))
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        if first_token:
+                            tracing.add_event("first_token")
+                            first_token = False
+                        yield from parser.feed(delta)
+            except DeadlineExceeded:
+                raise
+            except openai.APIError as e:
+                _check_deadline(deadline)
+                raise RuntimeError(f"OpenAI API error: {str(e)}")
+            except Exception as e:
+                raise RuntimeError(f"Failed to generate recipe: {str(e)}")
+
+            recipe = self._parse_recipe(parser.buffer, video_id)
+            yield {"event": "recipe", "value": recipe.model_dump()}
+
     def receive_ingredients(self) -> List[Ingredient]:
         """
         Extract just the ingredients list from a transcript.
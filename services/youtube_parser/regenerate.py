@@ -0,0 +1,179 @@
+"""
+Targeted re-generation of recipes made with an older prompt or model.
+
+Every stored recipe records the hash of the prompt templates and the
+model it was generated with. After a prompt or model change, only the
+recipes whose (prompt_hash, model) differ from the current ones are
+stale; regenerate_stale runs those through the pipeline again with a
+bounded number of workers and swaps each new recipe in place of the old
+one in a single transaction, so readers see either version but never a
+mix, and the recipe keeps its id.
+"""
+
+import contextvars
+import logging
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .quantity import parse_quantity, recipe_minutes
+from .retry import Deadline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+# (recipe id, video id, title)
+StaleRecipe = Tuple[int, str, Optional[str]]
+
+
+def stale_recipes(
+    conn: sqlite3.Connection, prompt_hash: str, model: str, limit: Optional[int] = None
+) -> List[StaleRecipe]:
+    """
+    Recipes not generated with `prompt_hash` and `model`, oldest first.
+
+    Recipes stored before versions were recorded (NULLs) are stale too.
+    """
+    return conn.execute(
+        """
+        SELECT id, video_id, title FROM recipes
+        WHERE prompt_hash IS NOT ? OR model IS NOT ?
+        ORDER BY id ASC LIMIT ?;
+        """,
+        (prompt_hash, model, -1 if limit is None else limit),
+    ).fetchall()
+
+
+def replace_recipe(
+    conn: sqlite3.Connection,
+    recipe_id: int,
+    recipe_data: Dict[str, Any],
+    lock: Optional[threading.Lock] = None,
+) -> bool:
+    """
+    Replace a stored recipe, its ingredients and steps in one transaction.
+
+    `lock` is held for the transaction; pass the one shared by the other
+    writers of `conn`, whose pending writes it would otherwise commit.
+
+    Returns:
+        False if the recipe was deleted in the meantime
+    """
+    nutrition = recipe_data.get("nutritional_info") or {}
+    with lock if lock is not None else nullcontext(), conn:
+        updated = conn.execute(
+            """
+            UPDATE recipes SET
+                title = ?, servings = ?, prep_time = ?, cook_time = ?,
+                calories = ?, protein = ?, carbs = ?, fat = ?,
+                prep_minutes = ?, cook_minutes = ?, total_minutes = ?,
+                prompt_hash = ?, model = ?
+            WHERE id = ?;
+            """,
+            (
+                recipe_data["title"],
+                recipe_data.get("servings"),
+                recipe_data.get("prep_time"),
+                recipe_data.get("cook_time"),
+                nutrition.get("calories"),
+                nutrition.get("protein"),
+                nutrition.get("carbs"),
+                nutrition.get("fat"),
+                *recipe_minutes(recipe_data.get("prep_time"), recipe_data.get("cook_time")),
+                recipe_data.get("prompt_hash"),
+                recipe_data.get("model"),
+                recipe_id,
+            ),
+        ).rowcount
+        if not updated:
+            return False
+        conn.execute("DELETE FROM ingredients WHERE recipe_id = ?;", (recipe_id,))
+        conn.execute("DELETE FROM steps WHERE recipe_id = ?;", (recipe_id,))
+        conn.executemany(
+            """
+            INSERT INTO ingredients (recipe_id, name, quantity, amount, amount_max, unit, note)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (recipe_id, ing["name"], ing["quantity"], *parse_quantity(ing["quantity"]))
+                for ing in recipe_data["ingredients"]
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO steps (recipe_id, step_number, description) VALUES (?, ?, ?);",
+            [(recipe_id, step["step_number"], step["description"]) for step in recipe_data["steps"]],
+        )
+    return True
+
+
+def regenerate_stale(
+    conn: sqlite3.Connection,
+    generate: Callable[[str, Optional[str]], Dict[str, Any]],
+    prompt_hash: str,
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limit: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+    on_replaced: Optional[Callable[[int], Any]] = None,
+    lock: Optional[threading.Lock] = None,
+) -> Dict[str, int]:
+    """
+    Re-generate stale recipes with at most `concurrency` in flight.
+
+    `generate(video_id, title)` runs in worker threads and returns the new
+    recipe dict; results are written from the calling thread as they
+    complete, each replacing its recipe atomically. A failed video keeps
+    its old recipe and stays stale for the next run. Once the deadline
+    passes no further video is started.
+
+    Args:
+        conn: Connection to the recipes database
+        generate: Produces the new recipe for a (video_id, title)
+        prompt_hash: Current prompt hash; recipes with another one are stale
+        model: Current model name
+        concurrency: Videos generated at once
+        limit: Most recipes to regenerate in this run
+        deadline: Optional deadline for the whole job
+        on_replaced: Called with each replaced recipe's id
+        lock: Write lock shared with the other writers of `conn`
+
+    Returns:
+        Counts: "stale" (selected), "regenerated", "failed" and "skipped"
+        (not started before the deadline)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    stale = stale_recipes(conn, prompt_hash, model, limit)
+    counts = {"stale": len(stale), "regenerated": 0, "failed": 0, "skipped": 0}
+
+    def collect(done: Set[Future]) -> None:
+        for future in done:
+            recipe_id, video_id = futures.pop(future)
+            try:
+                recipe_data = future.result()
+            except Exception as e:
+                logger.warning("Could not regenerate recipe %s (video %s): %s", recipe_id, video_id, e)
+                counts["failed"] += 1
+                continue
+            if replace_recipe(conn, recipe_id, recipe_data, lock):
+                counts["regenerated"] += 1
+                if on_replaced is not None:
+                    on_replaced(recipe_id)
+
+    futures: Dict[Future, Tuple[int, str]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="regenerate") as pool:
+        for position, (recipe_id, video_id, title) in enumerate(stale):
+            if deadline is not None and deadline.expired():
+                counts["skipped"] = len(stale) - position
+                break
+            if len(futures) >= concurrency:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                collect(done)
+            # Copied per task so spans opened by `generate` nest under the caller's
+            future = pool.submit(contextvars.copy_context().run, generate, video_id, title)
+            futures[future] = (recipe_id, video_id)
+        collect(wait(futures).done)
+    return counts
@@ -0,0 +1,204 @@
+"""
+Retry policy for upstream calls: error classification, exponential backoff
+with jitter, and per-job deadlines that can also be cancelled.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar
+from xml.etree.ElementTree import ParseError
+
+import requests  # type: ignore
+from youtube_transcript_api import (  # type: ignore
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    NotTranslatable,
+    PoTokenRequired,
+    TranscriptsDisabled,
+    TranslationLanguageNotAvailable,
+    VideoUnavailable,
+    VideoUnplayable,
+)
+
+T = TypeVar("T")
+
+PERMANENT = "permanent"
+TRANSIENT = "transient"
+
+# Failures that will not go away by asking again: the video or its
+# transcript simply is not available to us.
+PERMANENT_ERRORS = (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    NotTranslatable,
+    PoTokenRequired,
+    TranscriptsDisabled,
+    TranslationLanguageNotAvailable,
+    VideoUnavailable,
+    VideoUnplayable,
+)
+
+# Failures worth retrying: truncated/garbled responses and network trouble
+TRANSIENT_ERRORS = (
+    ParseError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a job runs out of time before or between attempts."""
+
+
+class Cancelled(DeadlineExceeded):
+    """Raised when a job was cancelled, e.g. because its client disconnected."""
+
+
+class Deadline:
+    """
+    An absolute point in (monotonic) time by which a job must finish.
+
+    A Deadline created with seconds=None never expires on its own. Any
+    Deadline can be cancelled from another thread; it then counts as
+    expired with no time remaining, so every check, backoff and upstream
+    timeout derived from it ends the job early.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Expire the deadline now; safe to call from any thread."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None for no deadline."""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancelled or (self.expires_at is not None and time.monotonic() >= self.expires_at)
+
+    def check(self) -> None:
+        """Raise Cancelled or DeadlineExceeded if the job must stop."""
+        if self.cancelled:
+            raise Cancelled("Job cancelled")
+        if self.expired():
+            raise DeadlineExceeded("Job deadline exceeded")
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """
+        Timeout for one upstream call: `default`, capped by the time left.
+
+        Raises:
+            Cancelled, DeadlineExceeded: If no time is left to start the call
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return remaining if default is None else min(default, remaining)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to `seconds`, waking early if the job is cancelled."""
+        self._cancelled.wait(seconds)
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Classify an exception as PERMANENT or TRANSIENT.
+
+    HTTP errors are permanent for 4xx other than 408/429. Unknown errors are
+    treated as transient so they keep the historical retry behaviour.
+    """
+    if isinstance(exc, PERMANENT_ERRORS):
+        return PERMANENT
+    if isinstance(exc, TRANSIENT_ERRORS):
+        return TRANSIENT
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        if 400 <= status < 500 and status not in (408, 429):
+            return PERMANENT
+    return TRANSIENT
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter.
+
+    Args:
+        max_attempts: Total attempts, including the first one
+        base_delay: Backoff before the first retry, before jitter
+        max_delay: Upper bound for a single backoff
+        multiplier: Backoff growth per attempt
+        sleep: Sleep function (injectable for tests); by default backoff
+            sleeps through the deadline, so cancelling it cuts them short
+        rng: Random source for jitter
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        multiplier: float = 2.0,
+        sleep: Optional[Callable[[float], None]] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Delay after failed attempt number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return self.rng.uniform(0, cap)
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        deadline: Optional[Deadline] = None,
+        on_retry: Optional[Callable[[int, BaseException, float], Any]] = None,
+    ) -> T:
+        """
+        Call fn until it succeeds, fails permanently or attempts run out.
+
+        Raises:
+            The last exception from fn, or DeadlineExceeded when the deadline
+            passes before an attempt could be made.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            if deadline is not None:
+                deadline.check()
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_attempts or classify_error(e) == PERMANENT:
+                    raise
+                delay = self.backoff(attempt)
+                remaining = deadline.remaining() if deadline is not None else None
+                if remaining is not None and delay >= remaining:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                if self.sleep is not None:
+                    self.sleep(delay)
+                elif deadline is not None:
+                    deadline.sleep(delay)
+                else:
+                    time.sleep(delay)
+        raise RuntimeError("unreachable")  # pragma: no cover
@@ -0,0 +1,189 @@
+"""
+Fair scheduling of per-video work across users.
+
+Every unit of pipeline work (one video: transcript fetch and recipe
+generation) takes a slot from a fixed pool first. Requests wait in one of
+two lanes: interactive (single-video requests, served first) and bulk
+(channel and query imports, which can never occupy the slots reserved
+for interactive work). Each user is capped at `per_user` running slots
+per lane, and within a lane users take turns by start-time fair queuing:
+a request is tagged with a virtual finish time `start + cost / weight`
+and the smallest tag runs next, so a user with 200 queued videos and one
+with a single video alternate instead of running in arrival order.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import SCHEDULER_WAIT
+from .retry import Cancelled, Deadline, DeadlineExceeded
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+DEFAULT_SLOTS = 8
+DEFAULT_PER_USER = 2
+DEFAULT_RESERVED = 2
+# How often a waiting request rechecks its deadline for cancellation
+CANCEL_POLL_SECONDS = 0.5
+
+
+class _Ticket:
+    __slots__ = ("user", "lane", "start", "finish", "order", "granted")
+
+    def __init__(self, user: str, lane: str, start: float, finish: float, order: int):
+        self.user = user
+        self.lane = lane
+        self.start = start
+        self.finish = finish
+        self.order = order
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Slot pool with an interactive and a bulk lane, per-user caps and fair queuing.
+
+    Thread-safe; callers block in `slot` until their work may run.
+
+    Args:
+        slots: Units of work running at once
+        per_user: Running slots per user and lane
+        reserved: Slots bulk work can never take, kept for interactive requests
+        weights: Fair-queuing weight by user (default 1); a user with weight
+            2 gets twice the share of a contended lane
+    """
+
+    def __init__(
+        self,
+        slots: int = DEFAULT_SLOTS,
+        per_user: int = DEFAULT_PER_USER,
+        reserved: int = DEFAULT_RESERVED,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        if slots < 1 or per_user < 1:
+            raise ValueError("slots and per_user must be at least 1")
+        if not 0 <= reserved < slots:
+            raise ValueError("reserved must leave at least one slot for bulk work")
+        self.slots = slots
+        self.per_user = per_user
+        self.reserved = reserved
+        self.weights = dict(weights or {})
+        self._condition = threading.Condition()
+        self._order = itertools.count()
+        self._waiting: Dict[str, List[_Ticket]] = {lane: [] for lane in LANES}
+        self._running: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._running_by_user: Dict[Tuple[str, str], int] = {}
+        self._virtual_time: Dict[str, float] = {lane: 0.0 for lane in LANES}
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+
+    def _lane_has_room(self, lane: str) -> bool:
+        running = sum(self._running.values())
+        if running >= self.slots:
+            return False
+        return lane == INTERACTIVE or self._running[BULK] < self.slots - self.reserved
+
+    def _next(self, lane: str) -> Optional[_Ticket]:
+        """The waiting ticket with the smallest finish tag whose user is under the cap."""
+        eligible = [
+            ticket for ticket in self._waiting[lane]
+            if self._running_by_user.get((lane, ticket.user), 0) < self.per_user
+        ]
+        return min(eligible, key=lambda ticket: (ticket.finish, ticket.order), default=None)
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting tickets, interactive lane first. Caller holds the lock."""
+        granted = False
+        for lane in LANES:
+            while self._lane_has_room(lane):
+                ticket = self._next(lane)
+                if ticket is None:
+                    break
+                self._waiting[lane].remove(ticket)
+                self._virtual_time[lane] = ticket.start
+                self._running[lane] += 1
+                key = (lane, ticket.user)
+                self._running_by_user[key] = self._running_by_user.get(key, 0) + 1
+                ticket.granted = True
+                granted = True
+        if granted:
+            self._condition.notify_all()
+
+    def _release(self, ticket: _Ticket) -> None:
+        with self._condition:
+            key = (ticket.lane, ticket.user)
+            self._running[ticket.lane] -= 1
+            self._running_by_user[key] -= 1
+            if not self._running_by_user[key]:
+                del self._running_by_user[key]
+                # An idle user starts over from the lane's virtual time
+                if not any(waiting.user == ticket.user for waiting in self._waiting[ticket.lane]):
+                    self._last_finish.pop(key, None)
+            self._dispatch()
+
+    @contextmanager
+    def slot(
+        self,
+        user: str,
+        lane: str = BULK,
+        cost: float = 1.0,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Args:
+            user: Key the per-user cap and fair share apply to
+            lane: INTERACTIVE or BULK
+            cost: Relative size of the work, for fair queuing
+            deadline: Give up waiting when it expires
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while waiting
+            Cancelled: If the deadline is cancelled while waiting
+            ValueError: If the lane is unknown
+        """
+        if lane not in LANES:
+            raise ValueError(f"Invalid lane: {lane}")
+        queued = time.monotonic()
+        with self._condition:
+            key = (lane, user)
+            start = max(self._virtual_time[lane], self._last_finish.get(key, 0.0))
+            finish = start + cost / self.weights.get(user, 1.0)
+            self._last_finish[key] = finish
+            ticket = _Ticket(user, lane, start, finish, next(self._order))
+            self._waiting[lane].append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+                if deadline.expired():
+                    self._waiting[lane].remove(ticket)
+                    if deadline.cancelled:
+                        raise Cancelled("Job cancelled while waiting for a worker slot")
+                    raise DeadlineExceeded("Job deadline exceeded while waiting for a worker slot")
+                remaining = deadline.remaining()
+                self._condition.wait(CANCEL_POLL_SECONDS if remaining is None else min(remaining, CANCEL_POLL_SECONDS))
+        SCHEDULER_WAIT.observe(time.monotonic() - queued, lane=lane)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Running and waiting work per lane, for /status."""
+        with self._condition:
+            return {
+                "slots": self.slots,
+                "per_user": self.per_user,
+                "reserved": self.reserved,
+                "lanes": {
+                    lane: {"running": self._running[lane], "waiting": len(self._waiting[lane])}
+                    for lane in LANES
+                },
+            }
@@ -0,0 +1,104 @@
+"""
+Incremental parser for a recipe JSON object arriving in streamed chunks.
+
+The parser scans each chunk once, tracking string/escape state and the
+stack of open objects and arrays, and reports parts of the recipe as soon
+as their closing character arrives: top-level strings such as the title,
+each element of "ingredients" and "steps", and nutritional_info. Nothing
+is re-parsed from the start of the buffer.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+# Top-level fields reported as soon as their value is complete
+SCALAR_FIELDS = ("title", "servings", "prep_time", "cook_time")
+OBJECT_FIELDS = ("nutritional_info",)
+# Top-level arrays whose elements are reported one by one, with the event name
+ARRAY_FIELDS = {"ingredients": "ingredient", "steps": "step"}
+
+
+class _Frame:
+    __slots__ = ("is_object", "start", "key", "expect_key")
+
+    def __init__(self, is_object: bool, start: int):
+        self.is_object = is_object
+        self.start = start
+        self.key: Optional[str] = None
+        self.expect_key = is_object
+
+
+class IncrementalRecipeParser:
+    """
+    Feed streamed text with `feed`; each call returns the events completed by it.
+
+    Events are dicts: {"event": "field", "name": ..., "value": ...} for
+    top-level scalars and nutritional_info, {"event": "ingredient", "value": {...}}
+    and {"event": "step", "value": {...}} for array elements. Malformed
+    pieces are skipped; the caller validates the full text at the end.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.buffer += chunk
+        events: List[Dict[str, Any]] = []
+        buf = self.buffer
+        for i in range(self._pos, len(buf)):
+            char = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(buf[self._string_start:i + 1], events)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                self._stack.append(_Frame(char == "{", i))
+            elif char in "}]":
+                if self._stack:
+                    self._end_container(self._stack.pop(), i, events)
+            elif char == ":" and self._stack and self._stack[-1].is_object:
+                self._stack[-1].expect_key = False
+            elif char == "," and self._stack and self._stack[-1].is_object:
+                self._stack[-1].expect_key = True
+        self._pos = len(buf)
+        return events
+
+    def _end_string(self, text: str, events: List[Dict[str, Any]]) -> None:
+        if not self._stack or not self._stack[-1].is_object:
+            return
+        frame = self._stack[-1]
+        value = _loads(text)
+        if frame.expect_key:
+            frame.key = value
+        elif len(self._stack) == 1 and frame.key in SCALAR_FIELDS and value is not None:
+            events.append({"event": "field", "name": frame.key, "value": value})
+
+    def _end_container(self, frame: _Frame, end: int, events: List[Dict[str, Any]]) -> None:
+        depth = len(self._stack)
+        if depth == 1 and self._stack[0].key in OBJECT_FIELDS:
+            value = _loads(self.buffer[frame.start:end + 1])
+            if value is not None:
+                events.append({"event": "field", "name": self._stack[0].key, "value": value})
+        elif depth == 2 and frame.is_object and not self._stack[1].is_object and self._stack[0].key in ARRAY_FIELDS:
+            value = _loads(self.buffer[frame.start:end + 1])
+            if value is not None:
+                events.append({"event": ARRAY_FIELDS[self._stack[0].key], "value": value})
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
@@ -0,0 +1,247 @@
+"""
+Lightweight structured tracing for the scrape -> generate -> store pipeline.
+
+Spans nest through a context variable, so a span opened inside another
+becomes its child. Finished spans go to the configured exporter:
+
+- TRACE_EXPORT_PATH: append one JSON object per span to this file (JSONL)
+- TRACE_COLLECTOR_URL: POST batches of spans as {"spans": [...]} to a collector
+
+With neither set, spans are still timed but dropped on finish.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import requests  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed unit of work with attributes, events and an outcome."""
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.events: List[Dict[str, Any]] = []
+        self.status = "ok"
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self._token: Optional[contextvars.Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append({"name": name, "time": time.time(), "attributes": attributes})
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span failed and keep the error class and message."""
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)[:500]
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        if exc is not None:
+            self.record_exception(exc)
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self.end()
+
+    def end(self) -> None:
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+            self.tracer.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class JsonlFileExporter:
+    """Appends finished spans to a JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def shutdown(self) -> None:
+        pass
+
+
+class HttpCollectorExporter:
+    """
+    Sends spans to a collector in batches from a background thread, so
+    exporting never blocks the request path.
+    """
+
+    def __init__(self, url: str, batch_size: int = 100, flush_interval: float = 2.0):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            logger.warning("Trace queue full, dropping span %s", span.name)
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            requests.post(self.url, data=json.dumps({"spans": batch}, default=str),
+                          headers={"Content-Type": "application/json"}, timeout=5)
+        except requests.RequestException as e:
+            logger.warning("Failed to export %d spans: %s", len(batch), e)
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = {}
+            if item is None:
+                if batch:
+                    self._send(batch)
+                return
+            if item:
+                batch.append(item)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._send(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporters."""
+
+    def __init__(self) -> None:
+        self.exporters: List[Any] = []
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """Open a child of the current span (or a new trace); use with `with`."""
+        return Span(self, name, _current_span.get(), attributes)
+
+    def export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:  # tracing must never break the pipeline
+                logger.warning("Span export failed: %s", e)
+
+    def configure(self, export_path: Optional[str] = None, collector_url: Optional[str] = None) -> None:
+        self.shutdown()
+        if export_path:
+            self.exporters.append(JsonlFileExporter(export_path))
+        if collector_url:
+            self.exporters.append(HttpCollectorExporter(collector_url))
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+        self.exporters = []
+
+
+tracer = Tracer()
+
+
+def start_span(name: str, **attributes: Any) -> Span:
+    """Open a span on the global tracer."""
+    return tracer.start_span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Set attributes on the current span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(**attributes)
+
+
+def add_event(name: str, **attributes: Any) -> None:
+    """Add an event to the current span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.add_event(name, **attributes)
+
+
+def bind_context(iterator: Iterator[T]) -> Iterator[T]:
+    """
+    Run every step of `iterator` in one copied context.
+
+    Servers may resume a sync generator on a different thread and context
+    at each step; binding keeps spans opened inside the generator valid
+    across its yields.
+    """
+    context = contextvars.copy_context()
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator that runs the function inside a span called `name`."""
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.start_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def configure_from_env() -> None:
+    """Configure the global tracer from TRACE_EXPORT_PATH / TRACE_COLLECTOR_URL."""
+    tracer.configure(os.getenv("TRACE_EXPORT_PATH"), os.getenv("TRACE_COLLECTOR_URL"))
@@ -29,4 +29,7 @@ class Recipe(BaseModel):
     prep_time: str | None = None
     cook_time: str | None = None
     nutritional_info: Dict[str, float] | None = None
+    # Prompt templates and model the recipe was generated with
+    prompt_hash: str | None = None
+    model: str | None = None
 
@@ -3,20 +3,26 @@ Type definitions for YouTube parser service.
 """
 
 from pydantic import BaseModel # type: ignore
+from typing import Optional
 
 class ScrapeRequest(BaseModel):
     """Request model for scraping a YouTube channel."""
     handle: str
     language: str = "en"
     quantity: int = 200
+    deadline_seconds: Optional[float] = None
+    # Only process uploads newer than the channel's last sync
+    incremental: bool = False
 
 class QueryRequest(BaseModel):
     """Request model for searching and scraping YouTube videos."""
     query: str
     language: str = "en"
     quantity: int = 50
+    deadline_seconds: Optional[float] = None
 
 class VideoRequest(BaseModel):
     """Request model for scraping a specific YouTube video."""
     id: str
-    language: str = "en" 
\ No newline at end of file
+    language: str = "en"
+    deadline_seconds: Optional[float] = None
@@ -0,0 +1,59 @@
+"""
+Shared HTTP session for upstream APIs, with optional base-URL overrides.
+
+UPSTREAM_OVERRIDES lets the service talk to stand-in servers (load tests,
+local development) without touching the scraping code. It is a
+comma-separated list of `<upstream prefix>=<replacement>` pairs, e.g.
+
+    UPSTREAM_OVERRIDES="https://www.googleapis.com=http://127.0.0.1:9001,https://www.youtube.com=http://127.0.0.1:9002"
+
+OpenAI needs no override here: the openai client reads OPENAI_BASE_URL.
+"""
+
+from typing import Any, Dict, Optional
+
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+
+
+class RewriteAdapter(HTTPAdapter):
+    """Transport adapter that sends requests for `prefix` to `target` instead."""
+
+    def __init__(self, prefix: str, target: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.prefix = prefix.rstrip("/")
+        self.target = target.rstrip("/")
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if request.url and request.url.startswith(self.prefix):
+            request.url = self.target + request.url[len(self.prefix):]
+        return super().send(request, **kwargs)
+
+
+def parse_overrides(value: Optional[str]) -> Dict[str, str]:
+    """
+    Parse an UPSTREAM_OVERRIDES string into a {prefix: target} mapping.
+
+    Raises:
+        ValueError: If a pair is not of the form `prefix=target`
+    """
+    overrides: Dict[str, str] = {}
+    for pair in (value or "").split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        prefix, sep, target = pair.partition("=")
+        if not sep or not prefix.strip() or not target.strip():
+            raise ValueError(f"Invalid upstream override: {pair}")
+        overrides[prefix.strip()] = target.strip()
+    return overrides
+
+
+def create_session(overrides: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create the app-scoped HTTP session, mounting a RewriteAdapter per override.
+    """
+    session = requests.Session()
+    for prefix, target in (overrides or {}).items():
+        session.mount(prefix, RewriteAdapter(prefix, target))
+    return session
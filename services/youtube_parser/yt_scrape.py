@@ -4,50 +4,170 @@ YouTube video scraping and transcript processing functionality.
 
 import requests # type: ignore
 from .type import FetchedTranscript
-from youtube_transcript_api import YouTubeTranscriptApi # type: ignore
-from typing import List, Tuple, Dict, Any, Optional
-import time
-from xml.etree.ElementTree import ParseError
+from .metrics import PLACEHOLDER_FAILURES, PREFILTER_SKIPPED, RETRIES, time_stage
+from .prefilter import parse_duration, score_video
+from . import tracing
+from .retry import PERMANENT, Deadline, DeadlineExceeded, RetryPolicy, classify_error
+from .cache import TTLCache
+from youtube_transcript_api import NoTranscriptFound, YouTubeTranscriptApi # type: ignore
+from typing import List, Tuple, Dict, Any, Iterable, Iterator, Optional, Sequence, Set
+import logging
 
+logger = logging.getLogger(__name__)
+
+# Cache namespace for videos whose transcript failed permanently, keyed by "video_id:language"
+TRANSCRIPT_FAILURES = "transcript_failure"
+DEFAULT_NEGATIVE_TTL = 7 * 24 * 3600
+# Cache namespace for handle -> channel ID, keyed by the lowercased handle without "@"
+CHANNEL_HANDLES = "channel_handle"
+DEFAULT_HANDLE_TTL = 30 * 24 * 3600
+# Cache namespace for the transcript track chosen per video, keyed by "video_id:language"
+TRANSCRIPT_TRACKS = "transcript_track"
+DEFAULT_TRACK_TTL = 7 * 24 * 3600
+# Cache namespace for fetched transcripts, keyed by "video_id:language"
+TRANSCRIPTS = "transcript"
+DEFAULT_TRANSCRIPT_TTL = 30 * 24 * 3600
+# Most results the YouTube Data API returns per page
+MAX_PAGE_SIZE = 50
+
+
+def select_track(tracks: Iterable[Any], language: str, fallback_languages: Sequence[str] = ()) -> Tuple[Any, Optional[str]]:
+    """
+    Pick the best transcript track from a video's track listing.
+
+    Preference: a manual track in `language`, then an auto-generated one,
+    then the same for each fallback language in order, then any track that
+    can be translated into `language` (manual before generated).
+
+    Args:
+        tracks: Transcript tracks, e.g. a youtube_transcript_api TranscriptList
+        language: Wanted language code
+        fallback_languages: Language codes to accept as-is when `language` is missing
+    Returns:
+        (track, translate_to) where translate_to is `language` when the
+        track must be translated, else None
+    Raises:
+        LookupError: If no track qualifies
+    """
+    tracks = list(tracks)
+    for code in [language, *fallback_languages]:
+        for generated in (False, True):
+            for track in tracks:
+                if track.language_code == code and track.is_generated == generated:
+                    return track, None
+    for generated in (False, True):
+        for track in tracks:
+            if track.is_generated == generated and track.is_translatable and any(
+                target.language_code == language for target in track.translation_languages
+            ):
+                return track, language
+    raise LookupError(f"No transcript track for {language}")
 
 
 class YouTubeScraper:
-    def __init__(self, api_key:str, language:str = "en", max_results:int=50): 
+    def __init__(
+        self,
+        api_key: str,
+        language: str = "en",
+        max_results: int = 50,
+        session: Optional[requests.Session] = None,
+        transcript_api: Optional[YouTubeTranscriptApi] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[TTLCache] = None,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        handle_ttl: float = DEFAULT_HANDLE_TTL,
+        transcript_ttl: Optional[float] = None,
+        fallback_languages: Optional[List[str]] = None,
+        score_cutoff: Optional[float] = None,
+    ):
         self.api_key = api_key
         self.language = language
         self.max_results = max_results
+        # Minimum prefilter score for listed videos; None keeps everything
+        self.score_cutoff = score_cutoff
+        # Languages to accept untranslated when `language` has no track
+        self.fallback_languages = [code for code in fallback_languages or [] if code != language]
+        # Shared, app-scoped clients; fall back to per-scraper ones when not given
+        self.session = session
+        self.transcript_api = transcript_api
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Remembers videos without a usable transcript so rescans skip them,
+        # and resolved channel handles
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+        self.handle_ttl = handle_ttl
+        # Fetched transcripts are kept this long, so regenerating a recipe
+        # needs no YouTube call; None keeps none
+        self.transcript_ttl = transcript_ttl
 
-    def get_transcript(self, video_id: str, max_retries: int = 3, delay: float = 0.5) -> FetchedTranscript:
+    def _get(self, url: str, params: Dict[str, Any], **kwargs: Any) -> requests.Response:
+        """Issue a GET through the shared session when one was provided."""
+        http = self.session if self.session is not None else requests
+        return http.get(url, params=params, **kwargs)
+
+    def _transcript_client(self) -> YouTubeTranscriptApi:
+        """Return the transcript client, creating it on first use."""
+        if self.transcript_api is None:
+            self.transcript_api = YouTubeTranscriptApi()
+        return self.transcript_api
+
+    def _transcript_cache_key(self, video_id: str) -> str:
+        """Cache key of a video's transcript under these language preferences, fallbacks included."""
+        return f"{video_id}:{','.join([self.language, *self.fallback_languages])}"
+
+    def get_transcript(self, video_id: str, deadline: Optional[Deadline] = None) -> FetchedTranscript:
         """
-        Fetch transcript for a given video ID with retry mechanism.
-        
+        Fetch transcript for a given video ID (a single attempt).
+
+        Lists the video's tracks once and picks one with select_track, so a
+        missing language is one decision instead of a series of failed
+        fetches. The choice is cached per video and language preferences
+        (fallbacks included) when a cache is configured. Retrying is left
+        to the caller's RetryPolicy.
+
         Args:
             video_id: YouTube video ID
-            max_retries: Maximum number of retry attempts
-            delay: Delay between retries in seconds
+            deadline: Optional job deadline; checked again between listing
+                the tracks and fetching one
 
         Returns:
             FetchedTranscript object
-            
         Raises:
-            Exception: If transcript cannot be fetched after all retries
+            NoTranscriptFound: If no track matches the language preferences
+            DeadlineExceeded: If the deadline passes (or is cancelled) after listing
         """
-        ytt_api = YouTubeTranscriptApi()
-        last_exception = None
-        
-        for attempt in range(max_retries):
+        ytt_api = self._transcript_client()
+        cache_key = self._transcript_cache_key(video_id)
+        choice = self.cache.get(TRANSCRIPT_TRACKS, cache_key) if self.cache is not None else None
+
+        with time_stage("transcript_fetch"):
+            if choice is not None and choice["translate_to"] is None:
+                # A known untranslated track needs no selection step
+                return ytt_api.fetch(video_id, languages=[choice["language_code"]])
+
+            tracks = ytt_api.list(video_id)
             try:
-                ytt_transcript = ytt_api.fetch(video_id, languages=[self.language])
-                return ytt_transcript
-            except ParseError as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    time.sleep(delay)
-                continue
-            except Exception as e:
-                raise e
-                
-        raise last_exception or Exception(f"Failed to fetch transcript for video {video_id}")
+                track, translate_to = select_track(tracks, self.language, self.fallback_languages)
+            except LookupError:
+                raise NoTranscriptFound(video_id, [self.language, *self.fallback_languages], tracks)
+
+            tracing.set_attributes(
+                track_language=track.language_code,
+                track_generated=track.is_generated,
+                translated=translate_to is not None,
+            )
+            if self.cache is not None and choice is None:
+                self.cache.set(
+                    TRANSCRIPT_TRACKS,
+                    cache_key,
+                    {"language_code": track.language_code, "is_generated": track.is_generated, "translate_to": translate_to},
+                    ttl=DEFAULT_TRACK_TTL,
+                )
+            if translate_to is not None:
+                track = track.translate(translate_to)
+            if deadline is not None:
+                deadline.check()
+            return track.fetch()
 
     def transcript_to_dict(self, transcript: FetchedTranscript, title: str) -> Dict[str, Any]:
         """
@@ -74,6 +194,54 @@ class YouTubeScraper:
 
         return transcript_dict
 
+    def _search_pages(self, params: Dict[str, Any], label: str, **kwargs: Any) -> Iterator[List[Tuple[str, str]]]:
+        """
+        Page through search.list until `max_results` videos were listed.
+
+        Each page is requested only when the previous one has been consumed.
+
+        Args:
+            params: Search parameters besides maxResults, pageToken and key
+            label: Name used in API error messages
+            kwargs: Passed on to the HTTP request
+        Returns:
+            Iterator of pages of (video_id, title) tuples
+        """
+        url = 'https://www.googleapis.com/youtube/v3/search'
+        remaining = self.max_results
+        page_token: Optional[str] = None
+        while remaining > 0:
+            page_params: Dict[str, Any] = {**params, 'maxResults': min(remaining, MAX_PAGE_SIZE), 'key': self.api_key}
+            if page_token:
+                page_params['pageToken'] = page_token
+            with time_stage("youtube_search"):
+                response = self._get(url, page_params, **kwargs)
+            data = response.json()
+
+            # Surface YouTube API errors explicitly so the caller sees what's wrong
+            if "error" in data:
+                message = data["error"].get("message", "Unknown YouTube API error")
+                raise RuntimeError(f"YouTube API error ({label}): {message}")
+
+            page = [
+                (item['id']['videoId'], item['snippet']['title'])
+                for item in data.get('items', [])
+            ][:remaining]
+            if page:
+                yield page
+            remaining -= len(page)
+            page_token = data.get('nextPageToken')
+            if not page or not page_token:
+                return
+
+    def _query_pages(self, query: str) -> Iterator[List[Tuple[str, str]]]:
+        params = {'part': 'snippet', 'q': query, 'type': 'video'}
+        return self._search_pages(params, "search", timeout=(10, 60))  # (connect timeout, read timeout)
+
+    def _channel_pages(self, channel_id: str) -> Iterator[List[Tuple[str, str]]]:
+        params = {'part': 'snippet', 'channelId': channel_id, 'type': 'video', 'order': 'date'}
+        return self._search_pages(params, "channel videos")
+
     def fetch_videos_by_query(self, query: str) -> List[Tuple[str, str]]:
         """
         Fetch video IDs and titles from YouTube search.
@@ -84,26 +252,7 @@ class YouTubeScraper:
         Returns:
             List of tuples containing (video_id, title)
         """
-        url = 'https://www.googleapis.com/youtube/v3/search'
-        params: Dict[str, Any] = {
-            'part': 'snippet',
-            'q': query,
-            'type': 'video',
-            'maxResults': self.max_results,
-            'key': self.api_key
-        }
-        response = requests.get(url, params=params, timeout=(10, 60))  # (connect timeout, read timeout)
-        data = response.json()
-
-        # Surface YouTube API errors explicitly so the caller sees what's wrong
-        if "error" in data:
-            message = data["error"].get("message", "Unknown YouTube API error")
-            raise RuntimeError(f"YouTube API error (search): {message}")
-
-        return [
-            (item['id']['videoId'], item['snippet']['title'])
-            for item in data.get('items', [])
-        ]
+        return [video for page in self._query_pages(query) for video in page]
 
     def fetch_channel_videos_by_id(self, channel_id: str) -> List[Tuple[str, str]]:
         """
@@ -115,51 +264,127 @@ class YouTubeScraper:
         Returns:
             List of tuples containing (video_id, title)
         """
-        url = 'https://www.googleapis.com/youtube/v3/search'
-        params: Dict[str, Any] = {
-            'part': 'snippet',
-            'channelId': channel_id,
-            'type': 'video',
-            'order': 'date',
-            'maxResults': self.max_results,
-            'key': self.api_key
-        }
-        response = requests.get(url, params=params)
-        data = response.json()
+        return [video for page in self._channel_pages(channel_id) for video in page]
 
-        if "error" in data:
-            message = data["error"].get("message", "Unknown YouTube API error")
-            raise RuntimeError(f"YouTube API error (channel videos): {message}")
+    def fetch_uploads(
+        self,
+        channel_id: str,
+        since: Optional[str] = None,
+        known_ids: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, str, str]]:
+        """
+        List a channel's uploads, newest first, via its uploads playlist.
+
+        Pages through playlistItems until `max_results` new videos are found
+        or an upload older than `since` is reached. Uploads in `known_ids`
+        are skipped.
+
+        Args:
+            channel_id: YouTube channel ID ("UC...")
+            since: Only list uploads published at or after this ISO 8601 time
+            known_ids: Video IDs that were already processed
+        Returns:
+            List of tuples containing (video_id, title, published_at)
+        """
+        # Every channel's uploads playlist is its channel ID with UC -> UU
+        playlist_id = "UU" + channel_id[2:] if channel_id.startswith("UC") else channel_id
+        url = 'https://www.googleapis.com/youtube/v3/playlistItems'
+        known_ids = known_ids or set()
+        uploads: List[Tuple[str, str, str]] = []
+        page_token: Optional[str] = None
+
+        while len(uploads) < self.max_results:
+            params: Dict[str, Any] = {
+                'part': 'snippet,contentDetails',
+                'playlistId': playlist_id,
+                'maxResults': 50,
+                'key': self.api_key
+            }
+            if page_token:
+                params['pageToken'] = page_token
+            with time_stage("youtube_search"):
+                response = self._get(url, params)
+            data = response.json()
+
+            if "error" in data:
+                message = data["error"].get("message", "Unknown YouTube API error")
+                raise RuntimeError(f"YouTube API error (uploads): {message}")
+
+            for item in data.get('items', []):
+                details = item.get('contentDetails', {})
+                video_id = details.get('videoId') or item['snippet']['resourceId']['videoId']
+                published_at = details.get('videoPublishedAt') or item['snippet'].get('publishedAt', '')
+                if since is not None and published_at < since:
+                    return uploads
+                if video_id in known_ids:
+                    continue
+                uploads.append((video_id, item['snippet']['title'], published_at))
+                if len(uploads) >= self.max_results:
+                    break
 
-        return [
-            (item['id']['videoId'], item['snippet']['title'])
-            for item in data.get('items', [])
-        ]
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+
+        return uploads
 
     def get_channel_id_by_handle(self, handle: str) -> str:
         """
         Resolve a YouTube handle (e.g. '@TryToEat') to a channel ID.
 
+        A handle's channel ID practically never changes, so resolved IDs
+        are cached for `handle_ttl` seconds when a cache is configured and
+        the API is only called on a miss.
+
         Args:
             handle: YouTube handle (e.g. '@TryToEat')
         
         Returns:
             Channel ID
         """
+        cache_key = handle.lstrip('@').lower()
+        if self.cache is not None:
+            channel_id = self.cache.get(CHANNEL_HANDLES, cache_key)
+            if channel_id is not None:
+                return channel_id
+
         url = 'https://www.googleapis.com/youtube/v3/channels'
         params: Dict[str, Any] = {
             'part': 'id',
             'forHandle': handle.lstrip('@'),
             'key': self.api_key
         }
-        response = requests.get(url, params=params)
+        with time_stage("youtube_channel_lookup"):
+            response = self._get(url, params)
         data = response.json()
 
         items = data.get('items', [])
         if not items:
             raise ValueError(f"Channel not found for handle: {handle}")
-        
-        return items[0]['id']
+
+        channel_id = items[0]['id']
+        if self.cache is not None:
+            self.cache.set(CHANNEL_HANDLES, cache_key, channel_id, ttl=self.handle_ttl)
+        return channel_id
+
+    def warm_channel_ids(self, handles: List[str]) -> Dict[str, str]:
+        """
+        Resolve a list of handles up front so later lookups hit the cache.
+
+        Handles that cannot be resolved are logged and left out.
+
+        Args:
+            handles: YouTube handles (e.g. ['@TryToEat', '@1mincook'])
+        Returns:
+            Dict mapping each resolved handle to its channel ID
+        """
+        resolved: Dict[str, str] = {}
+        for handle in handles:
+            try:
+                resolved[handle] = self.get_channel_id_by_handle(handle)
+            except Exception as e:
+                logger.warning("Could not resolve channel handle %s: %s", handle, e)
+        return resolved
 
     def fetch_video_by_id(self, video_id: str) -> List[Tuple[str, str]]:
         """
@@ -171,7 +396,8 @@ class YouTubeScraper:
             'id': video_id,
             'key': self.api_key
         }
-        response = requests.get(url, params=params)
+        with time_stage("youtube_video_lookup"):
+            response = self._get(url, params)
         data = response.json()
 
         if "error" in data:
@@ -181,55 +407,262 @@ class YouTubeScraper:
         items = data.get('items', [])
         return [(item['id'], item['snippet']['title']) for item in items]
 
-    def process_videos(self, type: str = "id", arg: Optional[str] = None) -> List[Dict[str, Any]]:
+    def fetch_video_details(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Process videos by fetching them and their transcripts.
-        Retries 3 times if there is an error per video. 
+        Fetch metadata for many videos, 50 IDs per videos.list call.
 
         Args:
-            type: Type of search to perform
+            video_ids: YouTube video IDs
+        Returns:
+            Dict mapping video ID to title, description, duration_seconds,
+            category_id and live (True for live or upcoming broadcasts)
+        """
+        url = 'https://www.googleapis.com/youtube/v3/videos'
+        details: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(video_ids), 50):
+            params: Dict[str, Any] = {
+                'part': 'snippet,contentDetails',
+                'id': ','.join(video_ids[start:start + 50]),
+                'maxResults': 50,
+                'key': self.api_key
+            }
+            with time_stage("youtube_video_lookup"):
+                response = self._get(url, params)
+            data = response.json()
+
+            if "error" in data:
+                message = data["error"].get("message", "Unknown YouTube API error")
+                raise RuntimeError(f"YouTube API error (video details): {message}")
+
+            for item in data.get('items', []):
+                snippet = item.get('snippet', {})
+                details[item['id']] = {
+                    "title": snippet.get('title', ''),
+                    "description": snippet.get('description', ''),
+                    "duration_seconds": parse_duration(item.get('contentDetails', {}).get('duration')),
+                    "category_id": snippet.get('categoryId'),
+                    "live": snippet.get('liveBroadcastContent', 'none') != 'none',
+                }
+        return details
+
+    def prefilter(self, videos: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Drop videos that are unlikely to be recipes, before any transcript
+        fetch or LLM call.
+
+        Scores each video's metadata (title, description, duration,
+        category) with prefilter.score_video and keeps those at or above
+        `score_cutoff`. Does nothing when no cutoff is set, and keeps every
+        video if the metadata lookup fails.
+
+        Args:
+            videos: List of (video_id, title) tuples
+        Returns:
+            The videos worth processing, in their original order
+        """
+        if self.score_cutoff is None or not videos:
+            return videos
+        try:
+            details = self.fetch_video_details([video_id for video_id, _ in videos])
+        except Exception as e:
+            logger.warning("Prefilter metadata lookup failed, keeping all videos: %s", e)
+            return videos
+
+        kept = []
+        for video_id, title in videos:
+            score = score_video(details.get(video_id, {"title": title}))
+            if score >= self.score_cutoff:
+                kept.append((video_id, title))
+            else:
+                logger.info("Skipping video %s (%s): recipe score %.2f", video_id, title, score)
+                PREFILTER_SKIPPED.inc(stage="metadata")
+        tracing.set_attributes(prefilter_skipped=len(videos) - len(kept))
+        return kept
+
+    def iter_video_pages(self, type: str = "id", arg: Optional[str] = None) -> Iterator[List[Tuple[str, str]]]:
+        """
+        List the videos to process for a search, one API page at a time.
+
+        Args:
+            type: Type of search to perform ("id", "query" or "channel_id")
             arg: Argument for the search
         Returns:
-            List of dicts containing video and transcript data
+            Iterator of lists of (video_id, title) tuples
         """
         if arg is None:
             raise ValueError("arg parameter cannot be None")
 
         if type == "id":
-            videos = self.fetch_video_by_id(arg)
-        elif type == "query": 
-            videos = self.fetch_videos_by_query(arg)
-        elif type == 'channel_id': 
-            videos = self.fetch_channel_videos_by_id(arg)
+            yield self.fetch_video_by_id(arg)
+        elif type == "query":
+            yield from self._query_pages(arg)
+        elif type == 'channel_id':
+            yield from self._channel_pages(arg)
         else:
             raise ValueError(f"Invalid type: {type}")
-        
-        results = []
-        for video_id, title in videos:
-            success = False
-            for attempt in range(4):
-                try:
-                    transcript = self.get_transcript(video_id)
-                    video_dict = self.transcript_to_dict(transcript, title)
-                    results.append(video_dict)
-                    success = True
-                    break 
-                except Exception as e:
-                    if attempt < 3:
-                        print(f"Error processing video {video_id} (attempt {attempt+1}): {str(e)}. Retrying...")
-                    else:
-                        print(f"Failed to process video {video_id} after 4 attempts: {str(e)}")
-            
-            if not success:
-                # If all attempts failed, add a placeholder dict with error information
-                results.append({
-                    "title": title,
-                    "video_id": video_id,
-                    "error": "Failed to fetch transcript",
-                    "snippets": ""
-                })
-                
-        return results
 
+    def list_videos(self, type: str = "id", arg: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        List the videos to process for a search.
+
+        Args:
+            type: Type of search to perform ("id", "query" or "channel_id")
+            arg: Argument for the search
+        Returns:
+            List of tuples containing (video_id, title)
+        """
+        return [video for page in self.iter_video_pages(type, arg) for video in page]
+
+    def iter_listed_videos(self, type: str = "id", arg: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily list the videos to process, prefiltering searches page by page.
 
+        The next page is only requested once the consumer has taken every
+        video of the current one.
 
+        Args:
+            type: Type of search to perform ("id", "query" or "channel_id")
+            arg: Argument for the search
+        Returns:
+            Iterator of (video_id, title) tuples
+        """
+        for page in self.iter_video_pages(type, arg):
+            yield from (page if type == "id" else self.prefilter(page))
+
+    def process_video(self, video_id: str, title: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Fetch the transcript for a single video.
+
+        Transient errors are retried with backoff under the scraper's
+        RetryPolicy; permanent ones (e.g. transcripts disabled) fail on the
+        first attempt and, when a cache is configured, are remembered for
+        `negative_ttl` seconds so later runs skip the video without calling
+        YouTube. With `transcript_ttl` set, fetched transcripts are cached
+        the same way and returned without calling YouTube. Each attempt is
+        traced.
+
+        Args:
+            video_id: YouTube video ID
+            title: Video title
+            deadline: Optional job deadline; no attempt starts after it
+        Returns:
+            Dict containing video and transcript data, or a placeholder
+            dict with "error", "reason", "kind" and "cached" keys if fetching failed
+        """
+        cache_key = self._transcript_cache_key(video_id)
+        if self.cache is not None:
+            known = self.cache.get(TRANSCRIPT_FAILURES, cache_key)
+            if known is not None:
+                tracing.set_attributes(cached_failure=known["reason"])
+                PLACEHOLDER_FAILURES.inc()
+                return self._failure_placeholder(video_id, title, known["reason"], PERMANENT, cached=True)
+            if self.transcript_ttl is not None:
+                cached = self.cache.get(TRANSCRIPTS, cache_key)
+                if cached is not None:
+                    tracing.set_attributes(cached_transcript=True)
+                    return cached
+
+        attempts = 0
+
+        def fetch() -> FetchedTranscript:
+            nonlocal attempts
+            attempts += 1
+            tracing.set_attributes(attempts=attempts)
+            with tracing.start_span("get_transcript", video_id=video_id, attempt=attempts):
+                return self.get_transcript(video_id, deadline=deadline)
+
+        def on_retry(attempt: int, exc: BaseException, delay: float) -> None:
+            RETRIES.inc(stage="transcript")
+            tracing.add_event("retry", attempt=attempt, error=type(exc).__name__, delay=round(delay, 3))
+
+        try:
+            transcript = self.retry_policy.call(fetch, deadline=deadline, on_retry=on_retry)
+            video = self.transcript_to_dict(transcript, title)
+            if self.cache is not None and self.transcript_ttl is not None:
+                self.cache.set(TRANSCRIPTS, cache_key, video, ttl=self.transcript_ttl)
+            return video
+        except Exception as e:
+            kind = "deadline" if isinstance(e, DeadlineExceeded) else classify_error(e)
+            logger.warning("Failed to process video %s after %d attempts (%s): %s", video_id, attempts, kind, e)
+            tracing.set_attributes(**{"error.type": type(e).__name__, "error.kind": kind})
+
+            if kind == PERMANENT and self.cache is not None:
+                self.cache.set(TRANSCRIPT_FAILURES, cache_key, {"reason": type(e).__name__}, ttl=self.negative_ttl)
+
+            PLACEHOLDER_FAILURES.inc()
+            return self._failure_placeholder(video_id, title, type(e).__name__, kind)
+
+    @staticmethod
+    def _failure_placeholder(video_id: str, title: str, reason: str, kind: str, cached: bool = False) -> Dict[str, Any]:
+        """
+        Placeholder returned in place of a transcript that could not be fetched.
+
+        `kind` is "permanent", "transient" or "deadline", so callers can tell
+        videos worth retrying later from ones that never will work.
+        """
+        return {
+            "title": title,
+            "video_id": video_id,
+            "error": "Failed to fetch transcript",
+            "reason": reason,
+            "kind": kind,
+            "cached": cached,
+            "snippets": ""
+        }
+
+    def iter_videos(
+        self,
+        type: str = "id",
+        arg: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily fetch videos and their transcripts, one at a time.
+
+        Listing pages and transcripts are fetched on demand as the consumer
+        pulls records, so memory holds one page of IDs and the transcript
+        being handed over rather than the whole channel or search. A
+        cancelled deadline ends the iteration: nobody is waiting for the
+        remaining videos, so not even placeholders are produced.
+        Searches and channel listings go through the recipe prefilter first.
+        Transient failures are retried per video with backoff; videos in
+        the negative cache are reported as cached failures right away.
+
+        Args:
+            type: Type of search to perform
+            arg: Argument for the search
+            deadline: Optional overall deadline for the job; videos not
+                started before it are returned as placeholders
+        Returns:
+            Iterator of dicts containing video and transcript data
+        """
+        for video_id, title in self.iter_listed_videos(type, arg):
+            if deadline is not None and deadline.cancelled:
+                return
+            with tracing.start_span("video", video_id=video_id, title=title):
+                video = self.process_video(video_id, title, deadline)
+            yield video
+
+    def process_videos(
+        self,
+        type: str = "id",
+        arg: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process videos by fetching them and their transcripts.
+
+        Collects iter_videos into a list; prefer iter_videos for large
+        channels and searches.
+
+        Args:
+            type: Type of search to perform
+            arg: Argument for the search
+            deadline: Optional overall deadline for the job
+        Returns:
+            List of dicts containing video and transcript data
+        """
+        with tracing.start_span("process_videos", type=type, arg=arg) as job_span:
+            results = list(self.iter_videos(type, arg, deadline))
+            job_span.set_attribute("videos", len(results))
+            return results